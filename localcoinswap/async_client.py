@@ -0,0 +1,878 @@
+'''
+Asyncio version of the LCS API client (requires ``aiohttp``).
+'''
+
+import asyncio
+import json
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from .utils import TradeParams, get_crypto_currency_id
+from .parsers import (parse_ad,
+                      parse_ads,
+                      parse_deposit_address,
+                      parse_trade,
+                      parse_trades,
+                      parse_trade_params,
+                      parse_transactions,
+                      parse_wallet)
+from .exceptions import (LocalcoinswapAPIException,
+                         LocalcoinswapInvalidParamError,
+                         LocalcoinswapResponseException)
+from .client import (Client,
+                     add_page,
+                     default_json_loads,
+                     get_columns,
+                     get_page_urls,
+                     get_parser,
+                     get_result)
+from .columnar import AdColumns, TransactionColumns
+from .records import Ad, Trade, Transaction, WalletEntry
+
+class AsyncClient:
+    """
+    Asyncio LCS API client.
+
+    Provides the same methods as ``client.Client``, but every method is a
+    coroutine. Requests are sent through one ``aiohttp`` session with a pooled
+    connector, so a single event loop can have many requests in flight.
+    Responses are parsed with the same parsers and errors are raised with
+    the same exceptions as in ``client.Client``.
+
+    Trade params can't be retrieved in ``__init__``, they are set when
+    entering the client as async context manager (or with ``set_trade_params``):
+
+    .. code-block:: python
+
+        async with AsyncClient('my_api_token') as client:
+            ads, trades = await asyncio.gather(client.get_ads(),
+                                               client.get_active_trades())
+
+    :param str token: api auth token
+    :param bool get_params: get trade data parameters when entering
+                            the client context (default True)
+    :param int connections: max number of simultaneous connections
+                            in the connection pool (default 100)
+    :param retry: retry policy for failed requests
+                  (``retry.RetryPolicy``, default None - no retries)
+    :param json_loads: function used to decode json responses from bytes
+                       (default ``orjson.loads`` if orjson is installed,
+                       otherwise ``json.loads``)
+    """
+
+    API_URL = Client.API_URL
+
+    def __init__(self, token, get_params=True, connections=100, retry=None, json_loads=None):
+        self.token = token
+        self.get_params = get_params
+        self.connections = connections
+        self.retry = retry
+        self.json_loads = json_loads or default_json_loads
+        # hardcoding locale for now
+        self.base_url = '{}/en/api'.format(self.API_URL)
+        self.trade_params = None
+        # session is created on first request (needs a running event loop)
+        self.session = None
+
+    async def __aenter__(self):
+        if self.get_params:
+            await self.set_trade_params()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def create_session(self):
+        if aiohttp is None:
+            raise ImportError('AsyncClient requires aiohttp (pip install aiohttp)')
+        return aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.connections),
+            headers={
+                'User-Agent': 'localcoinswap/python',
+                'Authorization': 'Token {}'.format(self.token)
+            })
+
+    async def close(self):
+        """
+        Close the underlying session and its connections.
+
+        :returns: None
+        """
+
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    def create_api_url(self, path):
+        return '{}/{}'.format(self.base_url, path)
+
+    # Internal function for handling requests in a session. Failed requests
+    # are retried with client retry policy (if set up and retry=True)
+    async def request(self, method, url, data={}, timeout=10, non_json_response=False, retry=True):
+        if self.session is None:
+            self.session = self.create_session()
+        policy = self.retry if retry else None
+        attempt = 1
+
+        while True:
+            try:
+                async with self.session.request(
+                        method.upper(),
+                        url,
+                        data=data or None,
+                        timeout=aiohttp.ClientTimeout(total=timeout)) as http_response:
+                    response = AsyncResponse(http_response, await http_response.read())
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if not (policy and policy.should_retry(method, attempt)):
+                    raise
+                response = None
+            else:
+                if not (policy and policy.should_retry(method, attempt, response)):
+                    return self.handle_response(response, non_json_response)
+            await asyncio.sleep(policy.get_delay(attempt, response))
+            attempt += 1
+
+    # Request paginated data from api (see ``Client.request_page``)
+    async def request_page(self, url, timeout=10, first=False):
+        response = await self.request('get', url, timeout=timeout)
+        if first:
+            return (response['results'],
+                    response['next'],
+                    response['count'],
+                    response['total_pages'])
+        return response['results'], response['next']
+
+    # Prepare url for 'get_ads' and 'iter_ads' from params (sets default limit & ordering)
+    def create_ads_url(self, params):
+        params.update({
+            'limit': params.get('limit', 20),
+            'ordering': params.get('ordering', '-popularity')
+        })
+        prepped_params = '&'.join(['{}={}'.format(param, value) for param, value in params.items()])
+        return self.create_api_url('trade/?{}'.format(prepped_params))
+
+    # Handle response (status code, json decoding, etc.)
+    def handle_response(self, response, non_json_response=False):
+        if response.status_code not in [200, 201, 204]:
+            raise LocalcoinswapAPIException(response)
+        if non_json_response:
+            return response.text
+        try:
+            return self.json_loads(response.content)
+        except ValueError:
+            raise LocalcoinswapResponseException('Response is not json: {}'.format(response.text))
+
+    # Request pages concurrently (`workers` at a time), returns
+    # a list of page results in the same order as `urls`
+    async def request_pages(self, urls, timeout=10, workers=4):
+        semaphore = asyncio.Semaphore(workers)
+
+        async def request_page(url):
+            async with semaphore:
+                return (await self.request_page(url, timeout))[0]
+
+        return await asyncio.gather(*[request_page(url) for url in urls])
+
+    # Iterate over page results starting from `url`, following api 'next' urls.
+    # Next page is requested in background while current page is consumed
+    async def iter_pages(self, url, timeout=10):
+        if not url:
+            return
+        task = asyncio.ensure_future(self.request_page(url, timeout))
+        try:
+            while task:
+                current_page, next_page_url = await task
+                task = asyncio.ensure_future(self.request_page(next_page_url, timeout)) \
+                       if next_page_url else None
+                yield current_page
+        finally:
+            if task:
+                task.cancel()
+
+    # Common generator for 'iter_transactions', 'iter_ads', 'iter_my_ads' and 'iter_trades'
+    async def iter_paginated(self, url, parser, timeout, raw):
+        async for current_page in self.iter_pages(url, timeout):
+            for result in get_result(raw, current_page, parser):
+                yield result
+
+    # Common pagination for 'get_transactions', 'get_ads', 'get_my_ads' and 'get_trades'.
+    # With get_all and workers > 1 remaining pages are requested concurrently,
+    # otherwise next page is requested in background (see 'iter_pages').
+    # Results are added to columns instead of a list if columns are passed
+    async def get_paginated(self, url, limit, parser, get_all, timeout, raw, workers=1,
+                            columns=None):
+        results = [] if columns is None else columns
+
+        current_page, next_page_url, count, total_pages = await self.request_page(url,
+                                                                                  timeout,
+                                                                                  True)
+        add_page(results, current_page, parser, raw)
+
+        if get_all:
+            page_urls = get_page_urls(next_page_url, count) if workers > 1 else None
+            if page_urls:
+                for current_page in await self.request_pages(page_urls, timeout, workers):
+                    add_page(results, current_page, parser, raw)
+            else:
+                async for current_page in self.iter_pages(next_page_url, timeout):
+                    add_page(results, current_page, parser, raw)
+            return {'count': count, 'results': results}
+
+        return {'count': count,
+                'total_pages': total_pages,
+                'limit': limit,
+                'results': results}
+
+    async def get_trade_params(self):
+        """
+        Retrieve and parse available trade parameters
+        (see ``Client.get_trade_params``).
+
+        :returns: dictionary of parsed trade params
+        :rtype: dict
+
+        :raises: LocalcoinswapAPIException, LocalcoinswapResponseException
+
+        """
+
+        return parse_trade_params(await self.request('get', self.create_api_url('new-trade/')))
+
+    async def set_trade_params(self):
+        """
+        Retrieve and set self.trade_params (see ``get_trade_params``)
+        with a lookup index (see ``utils.TradeParams``).
+
+        :returns: None
+
+        :raises: LocalcoinswapAPIException, LocalcoinswapResponseException
+
+        """
+
+        self.trade_params = TradeParams(await self.get_trade_params())
+
+    '''
+    Wallet operations (portfolio, deposit addresses, withdrawal, transactions)
+    '''
+
+    async def get_wallet(self, raw=False, records=False):
+        """
+        Retrieves wallet data (see ``Client.get_wallet``).
+
+        :param bool raw: return raw reponse from api (default False)
+        :param bool records: return ``records.WalletEntry`` records
+                             instead of dicts (default False)
+        :returns: list of dicts with address data for each currency
+        :rtype: list
+
+        :raises: LocalcoinswapAPIException, LocalcoinswapResponseException
+
+        """
+
+        return get_result(raw,
+                          await self.request(
+                            'get',
+                            self.create_api_url('wallet/AJAX/get-portfolio-data/')),
+                          WalletEntry.parse_many if records else parse_wallet)
+
+    async def get_deposit_address(self, currencies, raw=False, from_wallet=False):
+        """
+        Retrieves deposit information for selected currency/currencies
+        (see ``Client.get_deposit_address``). Currencies are requested
+        concurrently, results are in the same order as ``currencies``.
+
+        :param str/list currencies: name or list of currency names
+        :param bool raw: return raw reponse from api (default False)
+        :param bool from_wallet: use wallet portfolio data (default False)
+        :returns: list of dicts with address data for each currency
+        :rtype: list
+
+        :raises: LocalcoinswapAPIException,
+                 LocalcoinswapResponseException,
+                 LocalcoinswapInvalidParamError
+
+        """
+
+        if type(currencies) is not list:
+            currencies = [currencies]
+        ids = [get_crypto_currency_id(self.trade_params, currency) for currency in currencies]
+
+        # wallet info by currency id
+        responses = {}
+        if from_wallet:
+            portfolio = await self.request('get',
+                                           self.create_api_url('wallet/AJAX/get-portfolio-data/'))
+            responses = {entry['currency']['id']: entry for entry in portfolio}
+
+        missing = [currency_id for currency_id in dict.fromkeys(ids)
+                   if currency_id not in responses]
+        responses.update(zip(missing, await asyncio.gather(*[
+            self.request('get',
+                         self.create_api_url('wallet/AJAX/get-wallet-info/{}/'.format(currency_id)))
+            for currency_id in missing])))
+        return [get_result(raw, responses[currency_id], parse_deposit_address)
+                for currency_id in ids]
+
+    async def withdraw(self, currency, to_address, amount, otp, pid=None, raw=False):
+        """
+        Withdraw from your wallet (see ``Client.withdraw``).
+
+        :param int/str currency: currency name, symbol or id
+        :param str to_address: destination address
+        :param float amount: amount (float, e.g. 1.23 BTC)
+        :param int otp: 6-digit OTP code
+        :param int pid: payment id / destination tag (e.g. for Ripple)
+        :param bool raw: return raw reponse from api (default False)
+        :returns: dictionary/json withdraw data or error info
+        :rtype: dict
+
+        :raises: LocalcoinswapAPIException,
+                 LocalcoinswapResponseException,
+                 LocalcoinswapInvalidParamError
+
+        """
+
+        data = {
+            'currency': get_crypto_currency_id(self.trade_params, currency),
+            'to_address': to_address,
+            'amount': amount,
+            'otp': otp,
+        }
+        if pid:
+            data.update({'to_chip': pid})
+
+        # withdrawals are never retried (could be sent twice)
+        return get_result(raw,
+                          await self.request('post',
+                                             self.create_api_url('wallet/withdraw/create/'),
+                                             data,
+                                             timeout=20,
+                                             retry=False),
+                          lambda r: {'id': r['id']})
+
+    async def get_transactions(self, limit=20, get_all=False, timeout=10, raw=False, workers=1,
+                               columnar=False, records=False):
+        """
+        List transactions (see ``Client.get_transactions``).
+
+        :param int limit: number of returned transactions (default 20)
+        :param bool get_all: retrieve all transactions
+                             disregarding limit value (default False)
+        :param int timeout: request timeout value for high limit values (default 10 seconds)
+        :param bool raw: return raw reponse from api or parsed data
+        :param int workers: number of pages requested concurrently
+                            if get_all=True (default 1)
+        :param bool columnar: return results as columns (``columnar.TransactionColumns``)
+                              instead of a list, can't be used with raw
+                              or records (default False)
+        :param bool records: return ``records.Transaction`` records
+                             instead of dicts (default False)
+        :returns: dictionary/json transactions data or error info
+        :rtype: dict
+
+        :raises: LocalcoinswapAPIException, LocalcoinswapResponseException
+
+        """
+
+        return await self.get_paginated(
+            self.create_api_url('wallet/transactions/?limit={}&offset=0'.format(limit)),
+            limit, Transaction.parse_many if records else parse_transactions,
+            get_all, timeout, raw, workers, get_columns(TransactionColumns, columnar, raw, records))
+
+    def iter_transactions(self, limit=20, timeout=10, raw=False, records=False):
+        """
+        Asynchronously iterate over all transactions, page by page
+        (see ``Client.iter_transactions``).
+
+        :param int limit: number of transactions per page (default 20)
+        :param int timeout: request timeout value for each page (default 10 seconds)
+        :param bool raw: yield raw transactions from api or parsed data
+        :param bool records: yield ``records.Transaction`` records
+                             instead of dicts (default False)
+        :returns: async generator of transactions (see ``get_transactions``)
+        :rtype: async generator
+
+        :raises: LocalcoinswapAPIException, LocalcoinswapResponseException
+
+        """
+
+        return self.iter_paginated(
+            self.create_api_url('wallet/transactions/?limit={}&offset=0'.format(limit)),
+            Transaction.parse_many if records else parse_transactions, timeout, raw)
+
+    '''
+    Ad operations (list, create, update, pause, resume, delete)
+    '''
+
+    async def get_ad(self, uuid, raw=False, records=False):
+        """
+        Retrieve data on selected ad (see ``Client.get_ad``).
+
+        :param str uuid: ad uuid
+        :param bool raw: return raw reponse from api or parsed data
+        :param bool records: return ``records.Ad`` record
+                             instead of dict (default False)
+        :returns: dictionary/json data for selected ad
+        :rtype: dict
+
+        :raises: LocalcoinswapAPIException, LocalcoinswapResponseException
+
+        """
+
+        return get_result(raw,
+                          await self.request('get',
+                                             self.create_api_url('trade/{}'.format(uuid))),
+                          Ad.parse if records else parse_ad)
+
+    async def get_ads(self, params={}, get_all=False, timeout=10, raw=False, workers=1,
+                      columnar=False, records=False, fields=None):
+        """
+        List ads with optional sorting/filtering parameters
+        (see ``Client.get_ads`` for available parameters).
+
+        :param dict params: sorting and filtering parameters
+                            (default `{'limit': 20, 'ordering': '-popularity'}`)
+        :param bool get_all: retrieve all available ads with selected filters
+                             (default False)
+        :param int timeout: request timeout value for high number
+                            of results (default 10 seconds)
+        :param bool raw: return raw reponse from api or parsed data
+        :param int workers: number of pages requested concurrently
+                            if get_all=True (default 1)
+        :param bool columnar: return results as columns (``columnar.AdColumns``)
+                              instead of a list, can't be used with raw,
+                              records or fields (default False)
+        :param bool records: return ``records.Ad`` records
+                             instead of dicts (default False)
+        :param list fields: parse only selected fields (see ``parsers.AD_SPEC``,
+                            default None - all fields)
+        :returns: dictionary/json of ad data
+        :rtype: dict
+
+        :raises: LocalcoinswapAPIException, LocalcoinswapResponseException
+
+        """
+
+        params = dict(params)
+        return await self.get_paginated(self.create_ads_url(params),
+                                        params['limit'], get_parser(parse_ads, Ad, records, fields),
+                                        get_all, timeout, raw, workers,
+                                        get_columns(AdColumns, columnar, raw, records, fields))
+
+    def iter_ads(self, params={}, timeout=10, raw=False, records=False, fields=None):
+        """
+        Asynchronously iterate over all ads, page by page
+        (see ``Client.iter_ads``).
+
+        :param dict params: sorting and filtering parameters
+                            (default `{'limit': 20, 'ordering': '-popularity'}`)
+        :param int timeout: request timeout value for each page (default 10 seconds)
+        :param bool raw: yield raw ads from api or parsed data
+        :param bool records: yield ``records.Ad`` records instead of dicts (default False)
+        :param list fields: parse only selected fields (see ``parsers.AD_SPEC``,
+                            default None - all fields)
+        :returns: async generator of ads (see ``get_ad``)
+        :rtype: async generator
+
+        :raises: LocalcoinswapAPIException, LocalcoinswapResponseException
+
+        """
+
+        return self.iter_paginated(self.create_ads_url(dict(params)),
+                                   get_parser(parse_ads, Ad, records, fields), timeout, raw)
+
+    async def get_my_ads(self, ad_type='all', limit=5, get_all=False, timeout=10, raw=False,
+                         workers=1, records=False, fields=None):
+        """
+        Retrieve your ads (see ``Client.get_my_ads``).
+
+        :param str ad_type: 'active', 'inactive' or 'all' for both types (default 'all')
+        :param int limit: max number of ads in result (default 5)
+        :param bool get_all: retrieve all available ads of selected type
+                             (default False)
+        :param int timeout: request timeout value for high number
+                            of results (default 10 seconds)
+        :param bool raw: return raw reponse from api or parsed data
+        :param int workers: number of pages requested concurrently
+                            if get_all=True (default 1)
+        :param bool records: return ``records.Ad`` records
+                             instead of dicts (default False)
+        :param list fields: parse only selected fields (see ``parsers.AD_SPEC``,
+                            default None - all fields)
+        :returns: dictionary/json ad data (same as ``get_ads``)
+        :rtype: dict
+
+        :raises: LocalcoinswapAPIException, LocalcoinswapResponseException
+
+        """
+
+        return await self.get_paginated(
+            self.create_api_url('user-trade/{}/?limit={}&offset=0'.format(ad_type, limit)),
+            limit, get_parser(parse_ads, Ad, records, fields), get_all, timeout, raw, workers)
+
+    def iter_my_ads(self, ad_type='all', limit=5, timeout=10, raw=False, records=False,
+                    fields=None):
+        """
+        Asynchronously iterate over all your ads, page by page
+        (see ``Client.iter_my_ads``).
+
+        :param str ad_type: 'active', 'inactive' or 'all' for both types (default 'all')
+        :param int limit: number of ads per page (default 5)
+        :param int timeout: request timeout value for each page (default 10 seconds)
+        :param bool raw: yield raw ads from api or parsed data
+        :param bool records: yield ``records.Ad`` records instead of dicts (default False)
+        :param list fields: parse only selected fields (see ``parsers.AD_SPEC``,
+                            default None - all fields)
+        :returns: async generator of ads (see ``get_ad``)
+        :rtype: async generator
+
+        :raises: LocalcoinswapAPIException, LocalcoinswapResponseException
+
+        """
+
+        return self.iter_paginated(
+            self.create_api_url('user-trade/{}/?limit={}&offset=0'.format(ad_type, limit)),
+            get_parser(parse_ads, Ad, records, fields), timeout, raw)
+
+    # internal method for controlling ads, shouldn't be used directly
+    # used by 'pause_ad', 'resume_ad' and 'delete_ad'
+    async def control_ad(self, op, uuid, raw):
+        url = self.create_api_url('user-trade/update-delete/{}/'.format(uuid))
+
+        if op == 'delete':
+            # delete doesn't return anything, so using non_json_response
+            # to grab response.text (avoid exceptions)
+            await self.request('delete', url, non_json_response=True)
+            return {'deleted': uuid}
+
+        data = {'is_active': op == 'resume'}
+        return get_result(raw,
+                          await self.request('patch', url, data),
+                          lambda r: {'uuid': r['uuid'],
+                                     'is_active': r['is_active'],
+                                     'is_available': r['is_available']})
+
+    async def pause_ad(self, uuid, raw=False):
+        """
+        Pause selected ad (see ``Client.pause_ad``).
+
+        :param str uuid: selected ad uuid
+        :param bool raw: return raw reponse from api or parsed data
+        :returns: dictionary/json ad data
+        :rtype: dict
+
+        :raises: LocalcoinswapAPIException, LocalcoinswapResponseException
+
+        """
+
+        return await self.control_ad('pause', uuid, raw)
+
+    async def resume_ad(self, uuid, raw=False):
+        """
+        Resume selected ad (see ``Client.resume_ad``).
+
+        :param str uuid: selected ad uuid
+        :param bool raw: return raw reponse from api or parsed data
+        :returns: dictionary/json ad data
+        :rtype: dict
+
+        :raises: LocalcoinswapAPIException, LocalcoinswapResponseException
+
+        """
+
+        return await self.control_ad('resume', uuid, raw)
+
+    async def delete_ad(self, uuid):
+        """
+        Delete selected ad (see ``Client.delete_ad``).
+
+        :param str uuid: selected ad uuid
+        :returns: dictionary/json ad data
+        :rtype: dict
+
+        :raises: LocalcoinswapAPIException, LocalcoinswapResponseException
+
+        """
+
+        return await self.control_ad('delete', uuid, False)
+
+    async def bulk_control_ads(self, op, uuids, workers=8, raw=False):
+        """
+        Pause, resume or delete many ads concurrently (see ``Client.bulk_control_ads``).
+
+        :param str op: 'pause', 'resume' or 'delete'
+        :param list uuids: selected ad uuids
+        :param int workers: max number of concurrent requests (default 8)
+        :param bool raw: return raw reponses from api or parsed data
+        :returns: results and errors by ad uuid
+        :rtype: dict
+
+        :raises: LocalcoinswapInvalidParamError (unknown op)
+        """
+
+        if op not in ('pause', 'resume', 'delete'):
+            raise LocalcoinswapInvalidParamError('Unknown ad operation: {}'.format(op))
+
+        semaphore = asyncio.Semaphore(workers)
+
+        async def control(uuid):
+            async with semaphore:
+                try:
+                    return await self.control_ad(op, uuid, raw), None
+                except (LocalcoinswapAPIException,
+                        LocalcoinswapResponseException,
+                        aiohttp.ClientError,
+                        asyncio.TimeoutError) as e:
+                    return None, e
+
+        uuids = list(dict.fromkeys(uuids))
+        result = {'results': {}, 'errors': {}}
+        responses = await asyncio.gather(*[control(uuid) for uuid in uuids])
+        for uuid, (response, error) in zip(uuids, responses):
+            if error is None:
+                result['results'][uuid] = response
+            else:
+                result['errors'][uuid] = error
+        return result
+
+    '''
+    Trade (ie contract) operations (list, respond to, ...)
+    '''
+
+    async def get_trade(self, uuid, raw=False, records=False):
+        """
+        Retrieve selected trade (see ``Client.get_trade``).
+
+        :param str uuid: selected trade uuid
+        :param bool raw: return raw reponse from api or parsed data
+        :param bool records: return ``records.Trade`` record
+                             instead of dict (default False)
+        :returns: dictionary/json trade data or error info
+        :rtype: dict
+
+        :raises: LocalcoinswapAPIException, LocalcoinswapResponseException
+
+        """
+
+        return get_result(raw,
+                          await self.request('get',
+                                             self.create_api_url('contracts/{}/'.format(uuid))),
+                          Trade.parse if records else parse_trade)
+
+    # Internal function for 'get_all_trades', 'get_active_trades',
+    # 'get_inactive_trades'. No reason to use directly
+    async def get_trades(self, trade_type, limit=10, get_all=False, timeout=10, raw=False,
+                         workers=1, records=False, fields=None):
+        return await self.get_paginated(
+            self.create_api_url('contracts/{}/?limit={}&offset=0'.format(trade_type, limit)),
+            limit, get_parser(parse_trades, Trade, records, fields), get_all, timeout, raw, workers)
+
+    def iter_trades(self, trade_type='active', limit=10, timeout=10, raw=False, records=False,
+                    fields=None):
+        """
+        Asynchronously iterate over all your trades of selected type,
+        page by page (see ``Client.iter_trades``).
+
+        :param str trade_type: 'active' or 'inactive' (default 'active')
+        :param int limit: number of trades per page (default 10)
+        :param int timeout: request timeout value for each page (default 10 seconds)
+        :param bool raw: yield raw trades from api or parsed data
+        :param bool records: yield ``records.Trade`` records instead of dicts (default False)
+        :param list fields: parse only selected fields (see ``parsers.TRADE_SPEC``,
+                            default None - all fields)
+        :returns: async generator of trades (see ``get_trade``)
+        :rtype: async generator
+
+        :raises: LocalcoinswapAPIException, LocalcoinswapResponseException
+
+        """
+
+        return self.iter_paginated(
+            self.create_api_url('contracts/{}/?limit={}&offset=0'.format(trade_type, limit)),
+            get_parser(parse_trades, Trade, records, fields), timeout, raw)
+
+    async def get_active_trades(self, limit=10, get_all=False, timeout=10, raw=False, workers=1,
+                                records=False, fields=None):
+        """
+        Retrieve your active trades (see ``Client.get_active_trades``).
+
+        :param int limit: max number of trades in result or number of trades
+                          per page if get_all=True (default 10)
+        :param bool get_all: retrieve all available trades (default False)
+        :param int timeout: request timeout value for high limit values (default 10 seconds)
+        :param bool raw: return raw reponse from api or parsed data
+        :param int workers: number of pages requested concurrently
+                            if get_all=True (default 1)
+        :param bool records: return ``records.Trade`` records
+                             instead of dicts (default False)
+        :param list fields: parse only selected fields (see ``parsers.TRADE_SPEC``,
+                            default None - all fields)
+        :returns: dictionary/json trade data or error info
+        :rtype: dict
+
+        :raises: LocalcoinswapAPIException, LocalcoinswapResponseException
+
+        """
+
+        return await self.get_trades('active', limit, get_all, timeout, raw, workers, records,
+                                     fields)
+
+    async def get_inactive_trades(self, limit=10, get_all=False, timeout=10, raw=False, workers=1,
+                                  records=False, fields=None):
+        """
+        Retrieve your inactive trades (see ``Client.get_inactive_trades``).
+
+        :param int limit: max number of trades in result or number of trades per page
+                          if get_all=True (default 10)
+        :param bool get_all: retrieve all available trades (default False)
+        :param int timeout: request timeout value for high limit values (default 10 seconds)
+        :param bool raw: return raw reponse from api or parsed data
+        :param int workers: number of pages requested concurrently
+                            if get_all=True (default 1)
+        :param bool records: return ``records.Trade`` records
+                             instead of dicts (default False)
+        :param list fields: parse only selected fields (see ``parsers.TRADE_SPEC``,
+                            default None - all fields)
+        :returns: dictionary/json trade data or error info
+        :rtype: dict
+
+        :raises: LocalcoinswapAPIException, LocalcoinswapResponseException
+
+        """
+
+        return await self.get_trades('inactive', limit, get_all, timeout, raw, workers, records,
+                                     fields)
+
+    async def get_all_trades(self, limit=10, get_all=False, timeout=10, raw=False, workers=1,
+                             records=False, fields=None):
+        """
+        Retrieve combined result of active and inactive trades
+        (see ``Client.get_all_trades``). Both types are requested concurrently.
+
+        :param int limit: max number of trades (for each type) in result or number
+                          of trades per page if get_all=True (default 10)
+        :param bool get_all: retrieve all available trades (default False)
+        :param int timeout: request timeout value for high limit values (default 10 seconds)
+        :param bool raw: return raw reponse from api or parsed data
+        :param int workers: number of pages requested concurrently
+                            if get_all=True (default 1)
+        :param bool records: return ``records.Trade`` records
+                             instead of dicts (default False)
+        :param list fields: parse only selected fields (see ``parsers.TRADE_SPEC``,
+                            default None - all fields)
+        :returns: dictionary/json trade data or error info
+        :rtype: dict
+
+        :raises: LocalcoinswapAPIException, LocalcoinswapResponseException
+
+        """
+
+        active, inactive = await asyncio.gather(
+            self.get_active_trades(limit, get_all, timeout, raw, workers, records, fields),
+            self.get_inactive_trades(limit, get_all, timeout, raw, workers, records, fields))
+
+        result = {'count': active['count'] + inactive['count'],
+                  'results': active['results'] + inactive['results']}
+        if not get_all:
+            extra = {'total_pages': {'active': active['total_pages'],
+                                     'inactive': inactive['total_pages']},
+                     'limit': limit}
+            result.update(extra)
+
+        return result
+
+    # Respond to trade. Shouldn't be used directly, use 'accept_trade',
+    # 'reject_trade', 'paid_trade' or 'confirm_trade' instead.
+    async def respond_to_trade(self, uuid, trade_response, otp=None):
+        data = {'status': trade_response}
+        if otp:
+            data.update({'otp': otp})
+
+        return get_result(False,
+                          await self.request('patch',
+                                             self.create_api_url(
+                                                'contracts/status/{}/'.format(uuid)),
+                                             data),
+                          lambda r: {'uuid': uuid, 'status': r['status']})
+
+    async def reject_trade(self, uuid):
+        """
+        Reject open trade (see ``Client.reject_trade``).
+
+        :param str uuid: trade uuid
+        :returns: dictionary/json trade data or error info
+        :rtype: dict
+
+        :raises: LocalcoinswapAPIException, LocalcoinswapResponseException
+
+        """
+
+        return await self.respond_to_trade(uuid, 'REJECTED')
+
+    async def accept_trade(self, uuid):
+        """
+        Accept open trade (see ``Client.accept_trade``).
+
+        :param str uuid: trade uuid
+        :returns: dictionary/json trade data or error info
+        :rtype: dict
+
+        :raises: LocalcoinswapAPIException, LocalcoinswapResponseException
+
+        """
+
+        return await self.respond_to_trade(uuid, 'ACCEPTED')
+
+    async def paid_trade(self, uuid):
+        """
+        Respond that funds have been paid to the other party
+        (see ``Client.paid_trade``).
+
+        :param str uuid: trade uuid
+        :returns: dictionary/json trade data or error info
+        :rtype: dict
+
+        :raises: LocalcoinswapAPIException, LocalcoinswapResponseException
+
+        """
+
+        return await self.respond_to_trade(uuid, 'FUND_PAID')
+
+    async def confirm_trade(self, uuid, otp):
+        """
+        Confirm that funds were received (see ``Client.confirm_trade``).
+
+        :param str uuid: trade uuid
+        :param int otp: 6-digit OTP code
+        :returns: dictionary/json trade data or error info
+        :rtype: dict
+
+        :raises: LocalcoinswapAPIException, LocalcoinswapResponseException
+
+        """
+
+        return await self.respond_to_trade(uuid, 'FUND_RECEIVED', otp)
+
+'''
+Helper classes
+'''
+
+# Read aiohttp response with the attributes used by ``handle_response``
+# and exceptions (same as in ``requests.Response``)
+class AsyncResponse:
+    def __init__(self, response, content):
+        self.status_code = response.status
+        self.reason = response.reason
+        self.headers = response.headers
+        self.content = content
+        self.encoding = response.charset or 'utf-8'
+        self.request = getattr(response, 'request_info', None)
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding, errors='replace')
+
+    def json(self):
+        return json.loads(self.content)
@@ -0,0 +1,268 @@
+'''
+Caches for API data (trade params, responses).
+'''
+
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+class TradeParamsCache:
+    """
+    Versioned on-disk cache for parsed trade params (see
+    ``client.get_trade_params``).
+
+    Trade params rarely change, so a client created with a cache
+    (``Client(token, params_cache=TradeParamsCache())``) loads them from
+    disk instead of requesting them on startup. Expired params are still
+    used, but refreshed in background (see ``client.set_trade_params``).
+
+    Cache file is ignored if it was written by a different cache version
+    or for a different API url.
+
+    :param str path: cache file path
+                     (default ``~/.cache/localcoinswap/trade_params.json``)
+    :param int ttl: seconds after which cached params are refreshed
+                    (default 86400, one day)
+    """
+
+    VERSION = 1
+
+    def __init__(self, path=None, ttl=86400):
+        self.path = path or os.path.join(os.path.expanduser('~'),
+                                         '.cache',
+                                         'localcoinswap',
+                                         'trade_params.json')
+        self.ttl = ttl
+
+    def load(self, api_url):
+        """
+        Load cached trade params for api url.
+
+        :param str api_url: api url of the client (``Client.API_URL``)
+        :returns: tuple of trade params (None if not cached)
+                  and bool (True if params are expired or not cached)
+        :rtype: tuple
+        """
+
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+            if data['version'] != self.VERSION or data['api_url'] != api_url:
+                return None, True
+            trade_params, expired = data['trade_params'], time.time() - data['timestamp'] > self.ttl
+        # missing, invalid or differently structured cache file
+        except (OSError, ValueError, KeyError, TypeError):
+            return None, True
+
+        if not isinstance(trade_params, dict):
+            return None, True
+        return trade_params, expired
+
+    def save(self, api_url, trade_params):
+        """
+        Save trade params for api url (file is replaced atomically).
+
+        :param str api_url: api url of the client (``Client.API_URL``)
+        :param dict trade_params: parsed trade params
+        :returns: None
+        """
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # unique temporary file (also for threads of one process) in the same directory
+        fd, tmp_path = tempfile.mkstemp(dir=directory or '.',
+                                        prefix=os.path.basename(self.path) + '.',
+                                        suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump({'version': self.VERSION,
+                           'api_url': api_url,
+                           'timestamp': time.time(),
+                           'trade_params': trade_params}, f)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    def clear(self):
+        """
+        Remove cache file (if it exists).
+
+        :returns: None
+        """
+
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+class ResponseCache:
+    """
+    In-memory cache of GET responses (``Client(token, response_cache=ResponseCache())``),
+    used by ``get_ad``, ``get_trade``, ``get_wallet`` and ``get_trade_params``.
+
+    Responses are cached by url for ``ttl`` seconds (or endpoint ttl from
+    ``ttls``, by client method name). Expired responses are revalidated with
+    a conditional request (``If-None-Match``/``If-Modified-Since``) if
+    the API returned an ``ETag``/``Last-Modified`` header. Not modified (304)
+    responses reuse cached data and parsed results, without parsing again.
+
+    Least recently used responses are removed when cache has more than
+    ``max_entries`` responses. Client removes cached responses of modified
+    data (e.g. ad after ``pause_ad``, trade after ``accept_trade`` or wallet
+    after ``withdraw``).
+
+    Cached results are shared between calls, so they shouldn't be modified
+    (e.g. formatters modify printed data, so print a copy instead).
+    Don't share one cache between clients with different API tokens.
+
+    :param float ttl: seconds responses are used without revalidation (default 30)
+    :param dict ttls: ttl by client method name
+                      (e.g. ``{'get_trade_params': 3600, 'get_wallet': 5}``)
+    :param int max_entries: max number of cached responses (default 1000)
+    """
+
+    def __init__(self, ttl=30, ttls={}, max_entries=1000):
+        self.ttl = ttl
+        self.ttls = dict(ttls)
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get_ttl(self, endpoint):
+        """
+        Get ttl for endpoint.
+
+        :param str endpoint: client method name (e.g. 'get_ad')
+        :returns: ttl in seconds
+        :rtype: float
+        """
+
+        return self.ttls.get(endpoint, self.ttl)
+
+    def copy(self):
+        """
+        Create an empty cache with the same settings (e.g. for a client
+        with another API token).
+
+        :returns: new cache
+        :rtype: ResponseCache
+        """
+
+        return ResponseCache(self.ttl, self.ttls, self.max_entries)
+
+    def get(self, url):
+        """
+        Get cached response (expired or not) for url.
+
+        :param str url: request url
+        :returns: cached response or None
+        :rtype: CacheEntry
+        """
+
+        with self.lock:
+            entry = self.entries.get(url)
+            if entry is not None:
+                self.entries.move_to_end(url)
+            return entry
+
+    def set(self, url, endpoint, data, headers={}):
+        """
+        Cache response data for url (removes least recently used responses
+        if cache is full).
+
+        :param str url: request url
+        :param str endpoint: client method name (for ttl)
+        :param data: response data (json)
+        :param dict headers: response headers (for ETag & Last-Modified)
+        :returns: cached response
+        :rtype: CacheEntry
+        """
+
+        entry = CacheEntry(data,
+                           time.monotonic() + self.get_ttl(endpoint),
+                           headers.get('ETag'),
+                           headers.get('Last-Modified'))
+        with self.lock:
+            self.entries[url] = entry
+            self.entries.move_to_end(url)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return entry
+
+    def refresh(self, entry, endpoint):
+        """
+        Extend expiration of revalidated (not modified) response.
+
+        :param CacheEntry entry: cached response
+        :param str endpoint: client method name (for ttl)
+        :returns: None
+        """
+
+        entry.expires = time.monotonic() + self.get_ttl(endpoint)
+
+    def invalidate(self, prefix):
+        """
+        Remove cached responses for urls starting with prefix.
+
+        :param str prefix: url or url prefix
+        :returns: None
+        """
+
+        with self.lock:
+            for url in [url for url in self.entries if url.startswith(prefix)]:
+                del self.entries[url]
+
+    def clear(self):
+        """
+        Remove all cached responses.
+
+        :returns: None
+        """
+
+        with self.lock:
+            self.entries.clear()
+
+class CacheEntry:
+    """
+    Cached response (see ``ResponseCache``).
+
+    Attributes:
+
+    - data: response data (json)
+    - expires: expiration time (``time.monotonic``)
+    - etag: ETag response header (or None)
+    - last_modified: Last-Modified response header (or None)
+    - parsed (dict): parsed data by parser
+    """
+
+    __slots__ = ('data', 'expires', 'etag', 'last_modified', 'parsed')
+
+    def __init__(self, data, expires, etag=None, last_modified=None):
+        self.data = data
+        self.expires = expires
+        self.etag = etag
+        self.last_modified = last_modified
+        self.parsed = {}
+
+    def is_expired(self):
+        return time.monotonic() >= self.expires
+
+    # Headers for conditional request
+    def validators(self):
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+    # Data parsed with parser (parsed once)
+    def get_parsed(self, parser):
+        if parser not in self.parsed:
+            self.parsed[parser] = parser(self.data)
+        return self.parsed[parser]
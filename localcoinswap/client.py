@@ -1,6 +1,21 @@
+import json
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import islice
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
 import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-from .utils import (get_crypto_currency_id,
+from .utils import (TradeParams,
+                    get_crypto_currency_id,
                     get_fiat_currency_id,
                     get_payment_method_id,
                     get_trade_type_id)
@@ -14,7 +29,12 @@ from .parsers import (parse_ad,
                       parse_transactions,
                       parse_wallet)
 from .exceptions import (LocalcoinswapAPIException,
+                         LocalcoinswapInvalidParamError,
                          LocalcoinswapResponseException)
+from .ratelimit import PRIORITY_HIGH, PRIORITY_LOW, PRIORITY_NORMAL
+from .columnar import AdColumns, Columns, TransactionColumns
+from .records import Ad, Trade, Transaction, WalletEntry
+from .streaming import iter_results
 
 class Client:
     """
@@ -31,41 +51,134 @@ class Client:
 
     :param str token: api auth token
     :param bool get_params: get trade data parameters on startup (default True)
+    :param params_cache: on-disk trade params cache used on startup
+                         (``cache.TradeParamsCache``, default None)
+    :param retry: retry policy for failed requests
+                  (``retry.RetryPolicy``, default None - no retries)
+    :param rate_limiter: rate limiter for requests
+                         (``ratelimit.RateLimiter``, default None - no limit)
+    :param response_cache: cache for ``get_ad``, ``get_trade``, ``get_wallet``
+                           and ``get_trade_params`` responses
+                           (``cache.ResponseCache``, default None - no cache)
+    :param session: requests session shared with other clients (see
+                    ``create_session``, default None - client creates its own
+                    session with pool options below)
+    :param int pool_connections: number of cached connection pools (default 10)
+    :param int pool_maxsize: max number of connections kept in a pool, should be
+                             at least the number of concurrent requests (default 10)
+    :param bool pool_block: wait for a free connection when pool is full
+                            instead of opening a new one (default False)
+    :param bool keep_alive: reuse connections (default True)
+    :param json_loads: function used to decode json responses from bytes
+                       (default ``orjson.loads`` if orjson is installed,
+                       otherwise ``json.loads``)
+    :param int prefetch: number of pages requested in background ahead of parsing
+                         when all pages are requested one by one (get_all, iter_ads, ...),
+                         0 to request next page only after current one is parsed (default 1)
+    :param parse_pool: pool of processes parsing pages requested with get_all=True
+                       (``parallel.ParsePool``, default None - pages are parsed in client thread)
     """
 
     API_URL = 'https://api.localcoinswap.com'
 
-    def __init__(self, token, get_params=True):
+    def __init__(self, token, get_params=True, params_cache=None, retry=None,
+                 rate_limiter=None, response_cache=None, session=None,
+                 pool_connections=10, pool_maxsize=10, pool_block=False, keep_alive=True,
+                 json_loads=None, prefetch=1, parse_pool=None):
         self.token = token
+        # auth is sent with each request, so session can be shared with other clients
+        self.headers = {'Authorization': 'Token {}'.format(token)}
         # hardcoding locale for now
         self.base_url = '{}/en/api'.format(self.API_URL)
-        self.session = self.create_session()
+        self.session = session or self.create_session(pool_connections,
+                                                      pool_maxsize,
+                                                      pool_block,
+                                                      keep_alive)
+        self.params_cache = params_cache
+        self.retry = retry
+        self.rate_limiter = rate_limiter
+        self.response_cache = response_cache
+        self.json_loads = json_loads or default_json_loads
+        self.prefetch = prefetch
+        self.parse_pool = parse_pool
+        # background trade params refresh thread (see 'set_trade_params')
+        self.params_refresh = None
         if get_params:
             self.set_trade_params()
 
-    def create_session(self):
-        session = requests.session()
-        session.headers.update({
-            'User-Agent': 'localcoinswap/python',
-            'Authorization': 'Token {}'.format(self.token)
-        })
-        return session
+    # Creates client session (see ``create_session``)
+    def create_session(self, pool_connections=10, pool_maxsize=10, pool_block=False,
+                       keep_alive=True):
+        return create_session(pool_connections, pool_maxsize, pool_block, keep_alive)
 
     def create_api_url(self, path):
         return '{}/{}'.format(self.base_url, path)
 
     # Internal function for handling requests in a session
-    def request(self, method, url, data={}, timeout=10, non_json_response=False):
-        response = getattr(self.session, method)(url,
-                                                 data=data,
-                                                 timeout=timeout)
+    def request(self, method, url, data={}, timeout=10, non_json_response=False, retry=True,
+                priority=PRIORITY_NORMAL):
+        response = self.send(method, url, data, timeout, retry, priority)
 
         return self.handle_response(response, non_json_response)
 
+    # Send request in a session and return response. Failed requests are
+    # retried with client retry policy (if set up and retry=True).
+    # Every attempt waits for client rate limiter (if set up) by priority.
+    # Response body isn't read if stream=True
+    def send(self, method, url, data={}, timeout=10, retry=True, priority=PRIORITY_NORMAL,
+             headers=None, stream=False):
+        policy = self.retry if retry else None
+        headers = dict(self.headers, **headers) if headers else self.headers
+        attempt = 1
+
+        while True:
+            if self.rate_limiter:
+                self.rate_limiter.acquire(priority)
+            try:
+                response = getattr(self.session, method)(url,
+                                                         data=data,
+                                                         timeout=timeout,
+                                                         headers=headers,
+                                                         stream=stream)
+            except (requests.ConnectionError, requests.Timeout):
+                if not (policy and policy.should_retry(method, attempt)):
+                    raise
+                response = None
+            else:
+                if not (policy and policy.should_retry(method, attempt, response)):
+                    return response
+            policy.wait(attempt, response)
+            attempt += 1
+
+    # GET request with client response cache (if set up). Returns cached data
+    # (parsed with parser unless raw) if it's not expired or not modified (304)
+    def request_cached(self, url, endpoint, parser, raw=False):
+        if self.response_cache is None:
+            return get_result(raw, self.request('get', url), parser)
+
+        entry = self.response_cache.get(url)
+        if entry is None or entry.is_expired():
+            response = self.send('get', url, headers=entry.validators() if entry else None)
+            if entry is not None and response.status_code == 304:
+                self.response_cache.refresh(entry, endpoint)
+            else:
+                entry = self.response_cache.set(url,
+                                                endpoint,
+                                                self.handle_response(response),
+                                                response.headers)
+
+        return entry.data if raw else entry.get_parsed(parser)
+
+    # Remove cached responses (if client has response cache) for urls
+    # starting with api path (used after requests that modify data)
+    def invalidate_cache(self, path):
+        if self.response_cache is not None:
+            self.response_cache.invalidate(self.create_api_url(path))
+
     # Request paginated data from api (used in various get_ methods in Client).
     # returns additional data if request is for first page (count & total pages)
     def request_page(self, url, timeout=10, first=False):
-        response = self.request('get', url, timeout=timeout)
+        response = self.request('get', url, timeout=timeout, priority=PRIORITY_LOW)
         if first:
             return (response['results'],
                     response['next'],
@@ -73,6 +186,152 @@ class Client:
                     response['total_pages'])
         return response['results'], response['next']
 
+    # Request pages concurrently (`workers` at a time), returns
+    # an iterator of page results in the same order as `urls`
+    def request_pages(self, urls, timeout=10, workers=4):
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for page in executor.map(lambda url: self.request_page(url, timeout)[0], urls):
+                yield page
+
+    # Iterate over page results starting from `url`, following api 'next' urls.
+    # Pages are requested in a background thread up to `self.prefetch` pages
+    # ahead of the consumer, so requests overlap with parsing of current page
+    def iter_pages(self, url, timeout=10):
+        if not url:
+            return
+        if self.prefetch < 1:
+            while url:
+                current_page, url = self.request_page(url, timeout)
+                yield current_page
+            return
+
+        # (page results, exception), (None, None) after last page
+        pages = queue.Queue(self.prefetch)
+        stop = threading.Event()
+
+        # put page into queue, unless consumer stopped
+        def put(item):
+            while not stop.is_set():
+                try:
+                    pages.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def fetch(url):
+            try:
+                while url:
+                    current_page, url = self.request_page(url, timeout)
+                    if not put((current_page, None)):
+                        return
+            except Exception as e:
+                put((None, e))
+                return
+            put((None, None))
+
+        fetcher = threading.Thread(target=fetch, args=(url,), daemon=True)
+        fetcher.start()
+        try:
+            while True:
+                current_page, error = pages.get()
+                if error is not None:
+                    raise error
+                if current_page is None:
+                    return
+                yield current_page
+        finally:
+            stop.set()
+
+    # Request page with streamed response, returns an iterator of lists of
+    # page results (up to STREAM_BATCH results), decoded as they arrive.
+    # Other page data (count, next page url, ...) is added to `page`
+    def stream_page(self, url, page, timeout=10):
+        response = self.send('get', url, timeout=timeout, priority=PRIORITY_LOW, stream=True)
+        with response:
+            if response.status_code not in [200, 201, 204]:
+                raise LocalcoinswapAPIException(response)
+            results = iter_results(response.iter_content(STREAM_CHUNK_SIZE), page)
+            for batch in iter(lambda: list(islice(results, STREAM_BATCH)), []):
+                yield batch
+
+    # Request page (streamed if stream=True) and add its results to `results`,
+    # returns other page data (count, next page url, ...)
+    def read_page(self, results, url, parser, raw, timeout=10, stream=False):
+        if not stream:
+            page = self.request('get', url, timeout=timeout, priority=PRIORITY_LOW)
+            add_page(results, page.pop('results'), parser, raw)
+            return page
+
+        page = {}
+        for batch in self.stream_page(url, page, timeout):
+            add_page(results, batch, parser, raw)
+        return page
+
+    # Common generator for 'iter_transactions', 'iter_ads', 'iter_my_ads' and 'iter_trades'.
+    # With stream=True results are yielded while each page is being received
+    def iter_paginated(self, url, parser, timeout, raw, stream=False):
+        if not stream:
+            for current_page in self.iter_pages(url, timeout):
+                for result in get_result(raw, current_page, parser):
+                    yield result
+            return
+
+        while url:
+            page = {}
+            for batch in self.stream_page(url, page, timeout):
+                for result in get_result(raw, batch, parser):
+                    yield result
+            url = page['next']
+
+    # Common pagination for 'get_transactions', 'get_ads', 'get_my_ads' and 'get_trades'.
+    # With get_all and workers > 1 remaining pages are requested concurrently,
+    # otherwise pages are requested one by one in background, ahead of parsing
+    # (see 'iter_pages'), or streamed if stream=True. Pages are parsed in client
+    # parse pool if it's set up (not raw or columnar results).
+    # Results are added to columns instead of a list if columns are passed.
+    # Concurrent pages aren't streamed, so stream=True can't be used with workers > 1
+    def get_paginated(self, url, limit, parser, get_all, timeout, raw, workers=1, columns=None,
+                      stream=False):
+        if stream and workers > 1:
+            raise LocalcoinswapInvalidParamError('stream can\'t be used with workers > 1')
+        results = [] if columns is None else columns
+
+        page = self.read_page(results, url, parser, raw, timeout, stream)
+        next_page_url, count = page['next'], page['count']
+
+        if get_all:
+            page_urls = get_page_urls(next_page_url, count) if workers > 1 else None
+            if stream and not page_urls:
+                while next_page_url:
+                    next_page_url = self.read_page(results, next_page_url, parser, raw,
+                                                   timeout, stream)['next']
+                return {'count': count, 'results': results}
+
+            pages = self.request_pages(page_urls, timeout, workers) if page_urls \
+                    else self.iter_pages(next_page_url, timeout)
+            if self.parse_pool is not None and not raw and columns is None:
+                for parsed in self.parse_pool.map(parser, pages):
+                    results += parsed
+            else:
+                for current_page in pages:
+                    add_page(results, current_page, parser, raw)
+            return {'count': count, 'results': results}
+
+        return {'count': count,
+                'total_pages': page['total_pages'],
+                'limit': limit,
+                'results': results}
+
+    # Prepare url for 'get_ads' and 'iter_ads' from params (sets default limit & ordering)
+    def create_ads_url(self, params):
+        params.update({
+            'limit': params.get('limit', 20),
+            'ordering': params.get('ordering', '-popularity')
+        })
+        prepped_params = '&'.join(['{}={}'.format(param, value) for param, value in params.items()])
+        return self.create_api_url('trade/?{}'.format(prepped_params))
+
     # Handle response (status code, json decoding, etc.)
     def handle_response(self, response, non_json_response=False):
         if response.status_code not in [200, 201, 204]:
@@ -80,7 +339,8 @@ class Client:
         if non_json_response:
             return response.text
         try:
-            return response.json()
+            # decode bytes directly (skips decoding response text)
+            return self.json_loads(response.content)
         except ValueError:
             raise LocalcoinswapResponseException('Response is not json: {}'.format(response.text))
 
@@ -117,11 +377,19 @@ class Client:
 
         """
 
-        return parse_trade_params(self.request('get', self.create_api_url('new-trade/')))
+        return self.request_cached(self.create_api_url('new-trade/'),
+                                   'get_trade_params',
+                                   parse_trade_params)
 
     def set_trade_params(self):
         """
         Retrieve and set self.trade_parameters (see ``get_trade_params``).
+        Trade params are set with a lookup index (see ``utils.TradeParams``).
+
+        If client has a ``params_cache``, cached params are used instead.
+        Expired cached params are used as well, but refreshed in a background
+        thread (``self.params_refresh``). Params are retrieved (and cached)
+        only if there are no cached params.
 
         :returns: None
 
@@ -129,17 +397,52 @@ class Client:
 
         """
 
-        self.trade_params = self.get_trade_params()
+        if self.params_cache:
+            trade_params, expired = self.params_cache.load(self.API_URL)
+            if trade_params is not None:
+                self.trade_params = TradeParams(trade_params)
+                if expired:
+                    self.refresh_trade_params(background=True)
+                return
+
+        self.refresh_trade_params()
+
+    def refresh_trade_params(self, background=False):
+        """
+        Retrieve and set self.trade_parameters (see ``get_trade_params``)
+        and update ``params_cache`` (if client has one). Params are always
+        requested, cached response (``response_cache``) is removed first.
+
+        :param bool background: refresh in a background thread (default False)
+        :returns: refresh thread if background=True, otherwise None
+        :rtype: threading.Thread
+
+        :raises: LocalcoinswapAPIException, LocalcoinswapResponseException
+
+        """
+
+        if background:
+            self.params_refresh = threading.Thread(target=self.refresh_trade_params,
+                                                   daemon=True)
+            self.params_refresh.start()
+            return self.params_refresh
+
+        self.invalidate_cache('new-trade/')
+        self.trade_params = TradeParams(self.get_trade_params())
+        if self.params_cache:
+            self.params_cache.save(self.API_URL, self.trade_params)
 
     '''
     Wallet operations (portfolio, deposit addresses, withdrawal, transactions)
     '''
 
-    def get_wallet(self, raw=False):
+    def get_wallet(self, raw=False, records=False):
         """
         Retrieves wallet data (all addresses/currencies and their balance).
 
         :param bool raw: return raw reponse from api (default False)
+        :param bool records: return ``records.WalletEntry`` records
+                             instead of dicts (default False)
         :returns: list of dicts with address data for each currency
         :rtype: list
 
@@ -174,18 +477,25 @@ class Client:
 
         """
 
-        return get_result(raw,
-                          self.request(
-                            'get',
-                            self.create_api_url('wallet/AJAX/get-portfolio-data/')),
-                          parse_wallet)
+        return self.request_cached(self.create_api_url('wallet/AJAX/get-portfolio-data/'),
+                                   'get_wallet',
+                                   WalletEntry.parse_many if records else parse_wallet,
+                                   raw)
 
-    def get_deposit_address(self, currencies, raw=False):
+    def get_deposit_address(self, currencies, raw=False, workers=8, from_wallet=False):
         """
         Retrieves deposit information for selected currency/currencies.
 
+        Currencies are requested concurrently (at most ``workers`` requests
+        at once), results are in the same order as ``currencies``. With
+        ``from_wallet=True`` addresses are taken from one wallet portfolio
+        request (see ``get_wallet``), only currencies missing in the portfolio
+        are requested separately.
+
         :param str/list currencies: name or list of currency names
         :param bool raw: return raw reponse from api (default False)
+        :param int workers: max number of concurrent requests (default 8)
+        :param bool from_wallet: use wallet portfolio data (default False)
         :returns: list of dicts with address data for each currency
         :rtype: list
 
@@ -210,22 +520,26 @@ class Client:
 
         if type(currencies) is not list:
             currencies = [currencies]
-        result = []
-
-        for currency in currencies:
-            result.append(
-                get_result(
-                    raw,
-                    self.request(
+        ids = [get_crypto_currency_id(self.trade_params, currency) for currency in currencies]
+
+        # wallet info by currency id
+        responses = {}
+        if from_wallet:
+            portfolio = self.request('get', self.create_api_url('wallet/AJAX/get-portfolio-data/'))
+            responses = {entry['currency']['id']: entry for entry in portfolio}
+
+        missing = [currency_id for currency_id in dict.fromkeys(ids)
+                   if currency_id not in responses]
+        if missing:
+            with ThreadPoolExecutor(max_workers=min(workers, len(missing))) as executor:
+                responses.update(zip(missing, executor.map(
+                    lambda currency_id: self.request(
                         'get',
-                        self.create_api_url('wallet/AJAX/get-wallet-info/{}/'.format(
-                            get_crypto_currency_id(self.trade_params, currency))
-                        )
-                    ),
-                    parse_deposit_address
-                )
-            )
-        return result
+                        self.create_api_url('wallet/AJAX/get-wallet-info/{}/'.format(currency_id))),
+                    missing)))
+
+        return [get_result(raw, responses[currency_id], parse_deposit_address)
+                for currency_id in ids]
 
     def withdraw(self, currency, to_address, amount, otp, pid=None, raw=False):
         """
@@ -262,14 +576,21 @@ class Client:
         if pid:
             data.update({'to_chip': pid})
 
-        return get_result(raw,
-                          self.request('post',
-                                       self.create_api_url('wallet/withdraw/create/'),
-                                       data,
-                                       timeout=20),
-                          lambda r: {'id': r['id']})
-
-    def get_transactions(self, limit=20, get_all=False, timeout=10, raw=False):
+        # withdrawals are never retried (could be sent twice)
+        try:
+            response = self.request('post',
+                                    self.create_api_url('wallet/withdraw/create/'),
+                                    data,
+                                    timeout=20,
+                                    retry=False,
+                                    priority=PRIORITY_HIGH)
+        finally:
+            self.invalidate_cache('wallet/')
+
+        return get_result(raw, response, lambda r: {'id': r['id']})
+
+    def get_transactions(self, limit=20, get_all=False, timeout=10, raw=False, workers=1,
+                         columnar=False, records=False, stream=False):
         """
         List transactions.
 
@@ -278,6 +599,16 @@ class Client:
                              disregarding limit value (default False)
         :param int timeout: request timeout value for high limit values (default 10 seconds)
         :param bool raw: return raw reponse from api or parsed data
+        :param int workers: number of pages requested concurrently
+                            if get_all=True (default 1)
+        :param bool columnar: return results as columns (``columnar.TransactionColumns``)
+                              instead of a list, can't be used with raw
+                              or records (default False)
+        :param bool records: return ``records.Transaction`` records
+                             instead of dicts (default False)
+        :param bool stream: parse results while each page is being received
+                            (bounds memory for large pages), can't be used
+                            with workers > 1 (default False)
         :returns: dictionary/json transactions data or error info
         :rtype: dict
 
@@ -305,35 +636,50 @@ class Client:
 
         """
 
-        results = []
-
-        current_page, next_page_url, count, total_pages = self.request_page(
+        return self.get_paginated(
             self.create_api_url('wallet/transactions/?limit={}&offset=0'.format(limit)),
-            timeout,
-            True)
-        results += get_result(raw, current_page, parse_transactions)
+            limit, Transaction.parse_many if records else parse_transactions,
+            get_all, timeout, raw, workers, get_columns(TransactionColumns, columnar, raw, records),
+            stream)
 
-        if get_all:
-            while next_page_url:
-                current_page, next_page_url = self.request_page(next_page_url, timeout)
-                results += get_result(raw, current_page, parse_transactions)
-            return {'count': count, 'results': results}
+    def iter_transactions(self, limit=20, timeout=10, raw=False, records=False, stream=False):
+        """
+        Iterate over all transactions.
+
+        Transactions are requested page by page (`limit` transactions per page)
+        and the next page is requested while the current one is consumed,
+        so only one or two pages are held in memory.
+
+        :param int limit: number of transactions per page (default 20)
+        :param int timeout: request timeout value for each page (default 10 seconds)
+        :param bool raw: yield raw transactions from api or parsed data
+        :param bool records: yield ``records.Transaction`` records
+                             instead of dicts (default False)
+        :param bool stream: yield results while each page is being received
+                            (instead of requesting next page in background, default False)
+        :returns: generator of transactions (see ``get_transactions``)
+        :rtype: generator
 
-        return {'count': count,
-                'total_pages': total_pages,
-                'limit': limit,
-                'results': results}
+        :raises: LocalcoinswapAPIException, LocalcoinswapResponseException
+
+        """
+
+        return self.iter_paginated(
+            self.create_api_url('wallet/transactions/?limit={}&offset=0'.format(limit)),
+            Transaction.parse_many if records else parse_transactions, timeout, raw, stream)
 
     '''
     Ad operations (list, create, update, pause, resume, delete)
     '''
 
-    def get_ad(self, uuid, raw=False):
+    def get_ad(self, uuid, raw=False, records=False):
         """
         Retrieve data on selected ad.
 
         :param str uuid: ad uuid
         :param bool raw: return raw reponse from api or parsed data
+        :param bool records: return ``records.Ad`` record
+                             instead of dict (default False)
         :returns: dictionary/json data for selected ad
         :rtype: dict
 
@@ -383,12 +729,13 @@ class Client:
 
         """
 
-        return get_result(raw,
-                          self.request('get',
-                                       self.create_api_url('trade/{}'.format(uuid))),
-                          parse_ad)
+        return self.request_cached(self.create_api_url('trade/{}'.format(uuid)),
+                                   'get_ad',
+                                   Ad.parse if records else parse_ad,
+                                   raw)
 
-    def get_ads(self, params={}, get_all=False, timeout=10, raw=False):
+    def get_ads(self, params={}, get_all=False, timeout=10, raw=False, workers=1,
+                columnar=False, records=False, fields=None, stream=False):
         """
         List ads with optional sorting/filtering parameters.
 
@@ -431,6 +778,18 @@ class Client:
         :param int timeout: request timeout value for high number
                             of results (default 10 seconds)
         :param bool raw: return raw reponse from api or parsed data
+        :param int workers: number of pages requested concurrently
+                            if get_all=True (default 1)
+        :param bool columnar: return results as columns (``columnar.AdColumns``)
+                              instead of a list, can't be used with raw,
+                              records or fields (default False)
+        :param bool records: return ``records.Ad`` records
+                             instead of dicts (default False)
+        :param list fields: parse only selected fields (see ``parsers.AD_SPEC``,
+                            default None - all fields)
+        :param bool stream: parse results while each page is being received
+                            (bounds memory for large pages), can't be used
+                            with workers > 1 (default False)
         :returns: dictionary/json of ad data
         :rtype: dict
 
@@ -452,32 +811,43 @@ class Client:
 
         """
 
-        params.update({
-            'limit': params.get('limit', 20),
-            'ordering': params.get('ordering', '-popularity')
-        })
-        prepped_params = '&'.join(['{}={}'.format(param, value) for param, value in params.items()])
+        return self.get_paginated(self.create_ads_url(params),
+                                  params['limit'], get_parser(parse_ads, Ad, records, fields),
+                                  get_all, timeout, raw, workers,
+                                  get_columns(AdColumns, columnar, raw, records, fields), stream)
 
-        results = []
+    def iter_ads(self, params={}, timeout=10, raw=False, records=False, fields=None,
+                 stream=False):
+        """
+        Iterate over all ads with optional sorting/filtering parameters
+        (see ``get_ads`` for available parameters).
 
-        current_page, next_page_url, count, total_pages = self.request_page(
-            self.create_api_url('trade/?{}'.format(prepped_params)),
-            timeout,
-            True)
-        results += get_result(raw, current_page, parse_ads)
+        Ads are requested page by page (`limit` ads per page) and the next
+        page is requested while the current one is consumed, so only
+        one or two pages are held in memory.
 
-        if get_all:
-            while next_page_url:
-                current_page, next_page_url = self.request_page(next_page_url, timeout)
-                results += get_result(raw, current_page, parse_ads)
-            return {'count': count, 'results': results}
+        :param dict params: sorting and filtering parameters
+                            (default `{'limit': 20, 'ordering': '-popularity'}`)
+        :param int timeout: request timeout value for each page (default 10 seconds)
+        :param bool raw: yield raw ads from api or parsed data
+        :param bool records: yield ``records.Ad`` records instead of dicts (default False)
+        :param list fields: parse only selected fields (see ``parsers.AD_SPEC``,
+                            default None - all fields)
+        :param bool stream: yield results while each page is being received
+                            (instead of requesting next page in background, default False)
+        :returns: generator of ads (see ``get_ad``)
+        :rtype: generator
 
-        return {'count': count,
-                'total_pages': total_pages,
-                'limit': params.get('limit', 20),
-                'results': results}
+        :raises: LocalcoinswapAPIException, LocalcoinswapResponseException
+
+        """
+
+        return self.iter_paginated(self.create_ads_url(dict(params)),
+                                   get_parser(parse_ads, Ad, records, fields),
+                                   timeout, raw, stream)
 
-    def get_my_ads(self, ad_type='all', limit=5, get_all=False, timeout=10, raw=False):
+    def get_my_ads(self, ad_type='all', limit=5, get_all=False, timeout=10, raw=False, workers=1,
+                   records=False, fields=None, columnar=False, stream=False):
         """
         Retrieve your ads.
 
@@ -488,6 +858,18 @@ class Client:
         :param int timeout: request timeout value for high number
                             of results (default 10 seconds)
         :param bool raw: return raw reponse from api or parsed data
+        :param int workers: number of pages requested concurrently
+                            if get_all=True (default 1)
+        :param bool records: return ``records.Ad`` records
+                             instead of dicts (default False)
+        :param list fields: parse only selected fields (see ``parsers.AD_SPEC``,
+                            default None - all fields)
+        :param bool columnar: return results as columns (``columnar.AdColumns``)
+                              instead of a list, can't be used with raw,
+                              records or fields (default False)
+        :param bool stream: parse results while each page is being received
+                            (bounds memory for large pages), can't be used
+                            with workers > 1 (default False)
         :returns: dictionary/json ad data (same as ``get_ads``)
         :rtype: dict
 
@@ -495,24 +877,35 @@ class Client:
 
         """
 
-        results = []
-
-        current_page, next_page_url, count, total_pages = self.request_page(
+        return self.get_paginated(
             self.create_api_url('user-trade/{}/?limit={}&offset=0'.format(ad_type, limit)),
-            timeout,
-            True)
-        results += get_result(raw, current_page, parse_ads)
+            limit, get_parser(parse_ads, Ad, records, fields), get_all, timeout, raw, workers,
+            get_columns(AdColumns, columnar, raw, records, fields), stream)
 
-        if get_all:
-            while next_page_url:
-                current_page, next_page_url = self.request_page(next_page_url, timeout)
-                results += get_result(raw, current_page, parse_ads)
-            return {'count': count, 'results': results}
+    def iter_my_ads(self, ad_type='all', limit=5, timeout=10, raw=False, records=False,
+                    fields=None, stream=False):
+        """
+        Iterate over all your ads, page by page (see ``iter_ads``).
 
-        return {'count': count,
-                'total_pages': total_pages,
-                'limit': limit,
-                'results': results}
+        :param str ad_type: 'active', 'inactive' or 'all' for both types (default 'all')
+        :param int limit: number of ads per page (default 5)
+        :param int timeout: request timeout value for each page (default 10 seconds)
+        :param bool raw: yield raw ads from api or parsed data
+        :param bool records: yield ``records.Ad`` records instead of dicts (default False)
+        :param list fields: parse only selected fields (see ``parsers.AD_SPEC``,
+                            default None - all fields)
+        :param bool stream: yield results while each page is being received
+                            (instead of requesting next page in background, default False)
+        :returns: generator of ads (see ``get_ad``)
+        :rtype: generator
+
+        :raises: LocalcoinswapAPIException, LocalcoinswapResponseException
+
+        """
+
+        return self.iter_paginated(
+            self.create_api_url('user-trade/{}/?limit={}&offset=0'.format(ad_type, limit)),
+            get_parser(parse_ads, Ad, records, fields), timeout, raw, stream)
 
     # internal method for controlling ads, shouldn't be used directly
     # used by 'pause_ad', 'resume_ad' and 'delete_ad'
@@ -522,12 +915,20 @@ class Client:
         if op == 'delete':
             # delete doesn't return anything, so using non_json_response
             # to grab response.text (avoid exceptions)
-            response = self.request('delete', url, non_json_response=True)
+            try:
+                response = self.request('delete', url, non_json_response=True)
+            finally:
+                self.invalidate_cache('trade/{}'.format(uuid))
             return {'deleted': uuid}
 
         data = {'is_active': op == 'resume'}
+        try:
+            response = self.request('patch', url, data)
+        finally:
+            self.invalidate_cache('trade/{}'.format(uuid))
+
         return get_result(raw,
-                          self.request('patch', url, data),
+                          response,
                           lambda r: {'uuid': r['uuid'],
                                      'is_active': r['is_active'],
                                      'is_available': r['is_available']})
@@ -605,17 +1006,77 @@ class Client:
         """
 
         return self.control_ad('delete', uuid, False)
-        
+
+    def bulk_control_ads(self, op, uuids, workers=8, raw=False):
+        """
+        Pause, resume or delete many ads concurrently (see ``pause_ad``,
+        ``resume_ad`` and ``delete_ad``).
+
+        At most ``workers`` requests are sent at once (requests also wait
+        for client rate limiter, if set up). Failed requests don't stop
+        the others, errors are returned for each failed ad.
+
+        :param str op: 'pause', 'resume' or 'delete'
+        :param list uuids: selected ad uuids
+        :param int workers: max number of concurrent requests (default 8)
+        :param bool raw: return raw reponses from api or parsed data
+        :returns: results and errors by ad uuid
+        :rtype: dict
+
+        .. code-block:: python
+
+            # parsed response (op='pause'):
+            {
+                'results': {
+                    'dc01xxxx-xxxx-xxxx-xxxx-xxxxxxxxxxxx': {
+                        'is_active': False,
+                        'is_available': True,
+                        'uuid': 'dc01xxxx-xxxx-xxxx-xxxx-xxxxxxxxxxxx'
+                    },
+                    ...
+                },
+                'errors': {
+                    'ab12xxxx-xxxx-xxxx-xxxx-xxxxxxxxxxxx': LocalcoinswapAPIException(...),
+                    ...
+                }
+            }
+
+        :raises: LocalcoinswapInvalidParamError (unknown op)
+        """
+
+        if op not in ('pause', 'resume', 'delete'):
+            raise LocalcoinswapInvalidParamError('Unknown ad operation: {}'.format(op))
+
+        def control(uuid):
+            try:
+                return self.control_ad(op, uuid, raw), None
+            except (LocalcoinswapAPIException,
+                    LocalcoinswapResponseException,
+                    requests.RequestException) as e:
+                return None, e
+
+        uuids = list(dict.fromkeys(uuids))
+        result = {'results': {}, 'errors': {}}
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for uuid, (response, error) in zip(uuids, executor.map(control, uuids)):
+                if error is None:
+                    result['results'][uuid] = response
+                else:
+                    result['errors'][uuid] = error
+        return result
+
     '''
     Trade (ie contract) operations (list, respond to, ...)
     '''
 
-    def get_trade(self, uuid, raw=False):
+    def get_trade(self, uuid, raw=False, records=False):
         """
         Retrieve selected trade.
 
         :param str uuid: selected trade uuid
         :param bool raw: return raw reponse from api or parsed data
+        :param bool records: return ``records.Trade`` record
+                             instead of dict (default False)
         :returns: dictionary/json trade data or error info
         :rtype: dict
 
@@ -645,35 +1106,50 @@ class Client:
 
         """
 
-        return get_result(raw,
-                          self.request('get',
-                                       self.create_api_url('contracts/{}/'.format(uuid))),
-                          parse_trade)
+        return self.request_cached(self.create_api_url('contracts/{}/'.format(uuid)),
+                                   'get_trade',
+                                   Trade.parse if records else parse_trade,
+                                   raw)
 
     # Internal function for 'get_all_trades', 'get_active_trades',
-    # 'get_inactive_trades'. No reason to use directly
-    def get_trades(self, trade_type, limit=10, get_all=False, timeout=10, raw=False):
-        results = []
-
-        current_page, next_page_url, count, total_pages = self.request_page(
+    # 'get_inactive_trades'. No reason to use directly.
+    # There are no columnar results for trades: a few pages of your trades
+    # are small enough for dicts or records (see 'columnar')
+    def get_trades(self, trade_type, limit=10, get_all=False, timeout=10, raw=False, workers=1,
+                   records=False, fields=None, stream=False):
+        return self.get_paginated(
             self.create_api_url('contracts/{}/?limit={}&offset=0'.format(trade_type, limit)),
-            timeout,
-            first=True
-        )
-        results += get_result(raw, current_page, parse_trades)
+            limit, get_parser(parse_trades, Trade, records, fields), get_all, timeout, raw, workers,
+            stream=stream)
 
-        if get_all:
-            while next_page_url:
-                current_page, next_page_url = self.request_page(next_page_url, timeout)
-                results += get_result(raw, current_page, parse_trades)
-            return {'count': count, 'results': results}
+    def iter_trades(self, trade_type='active', limit=10, timeout=10, raw=False, records=False,
+                    fields=None, stream=False):
+        """
+        Iterate over all your trades of selected type, page by page
+        (see ``iter_ads``).
+
+        :param str trade_type: 'active' or 'inactive' (default 'active')
+        :param int limit: number of trades per page (default 10)
+        :param int timeout: request timeout value for each page (default 10 seconds)
+        :param bool raw: yield raw trades from api or parsed data
+        :param bool records: yield ``records.Trade`` records instead of dicts (default False)
+        :param list fields: parse only selected fields (see ``parsers.TRADE_SPEC``,
+                            default None - all fields)
+        :param bool stream: yield results while each page is being received
+                            (instead of requesting next page in background, default False)
+        :returns: generator of trades (see ``get_trade``)
+        :rtype: generator
 
-        return {'count': count,
-                'total_pages': total_pages,
-                'limit': limit,
-                'results': results}
+        :raises: LocalcoinswapAPIException, LocalcoinswapResponseException
 
-    def get_active_trades(self, limit=10, get_all=False, timeout=10, raw=False):
+        """
+
+        return self.iter_paginated(
+            self.create_api_url('contracts/{}/?limit={}&offset=0'.format(trade_type, limit)),
+            get_parser(parse_trades, Trade, records, fields), timeout, raw, stream)
+
+    def get_active_trades(self, limit=10, get_all=False, timeout=10, raw=False, workers=1,
+                          records=False, fields=None, stream=False):
         """
         Retrieve your active trades.
 
@@ -682,6 +1158,15 @@ class Client:
         :param bool get_all: retrieve all available trades (default False)
         :param int timeout: request timeout value for high limit values (default 10 seconds)
         :param bool raw: return raw reponse from api or parsed data
+        :param int workers: number of pages requested concurrently
+                            if get_all=True (default 1)
+        :param bool records: return ``records.Trade`` records
+                             instead of dicts (default False)
+        :param list fields: parse only selected fields (see ``parsers.TRADE_SPEC``,
+                            default None - all fields)
+        :param bool stream: parse results while each page is being received
+                            (bounds memory for large pages), can't be used
+                            with workers > 1 (default False)
         :returns: dictionary/json trade data or error info
         :rtype: dict
 
@@ -701,9 +1186,11 @@ class Client:
 
         """
 
-        return self.get_trades('active', limit, get_all, timeout, raw)
+        return self.get_trades('active', limit, get_all, timeout, raw, workers, records, fields,
+                               stream)
 
-    def get_inactive_trades(self, limit=10, get_all=False, timeout=10, raw=False):
+    def get_inactive_trades(self, limit=10, get_all=False, timeout=10, raw=False, workers=1,
+                            records=False, fields=None, stream=False):
         """
         Retrieve your inactive trades.
 
@@ -712,6 +1199,15 @@ class Client:
         :param bool get_all: retrieve all available trades (default False)
         :param int timeout: request timeout value for high limit values (default 10 seconds)
         :param bool raw: return raw reponse from api or parsed data
+        :param int workers: number of pages requested concurrently
+                            if get_all=True (default 1)
+        :param bool records: return ``records.Trade`` records
+                             instead of dicts (default False)
+        :param list fields: parse only selected fields (see ``parsers.TRADE_SPEC``,
+                            default None - all fields)
+        :param bool stream: parse results while each page is being received
+                            (bounds memory for large pages), can't be used
+                            with workers > 1 (default False)
         :returns: dictionary/json trade data or error info
         :rtype: dict
 
@@ -733,17 +1229,31 @@ class Client:
 
         """
 
-        return self.get_trades('inactive', limit, get_all, timeout, raw)
+        return self.get_trades('inactive', limit, get_all, timeout, raw, workers, records, fields,
+                               stream)
 
-    def get_all_trades(self, limit=10, get_all=False, timeout=10, raw=False):
+    def get_all_trades(self, limit=10, get_all=False, timeout=10, raw=False, workers=1,
+                       records=False, fields=None, stream=False):
         """
         Retrieve combined result of active and inactive trades.
 
+        Active and inactive trades are requested concurrently (with their
+        pages if get_all=True), results are active trades, then inactive trades.
+
         :param int limit: max number of trades (for each type) in result or number
                           of trades per page if get_all=True (default 10)
         :param bool get_all: retrieve all available trades (default False)
         :param int timeout: request timeout value for high limit values (default 10 seconds)
         :param bool raw: return raw reponse from api or parsed data
+        :param int workers: number of pages requested concurrently
+                            if get_all=True (default 1)
+        :param bool records: return ``records.Trade`` records
+                             instead of dicts (default False)
+        :param list fields: parse only selected fields (see ``parsers.TRADE_SPEC``,
+                            default None - all fields)
+        :param bool stream: parse results while each page is being received
+                            (bounds memory for large pages), can't be used
+                            with workers > 1 (default False)
         :returns: dictionary/json trade data or error info
         :rtype: dict
 
@@ -768,8 +1278,12 @@ class Client:
 
         """
 
-        active = self.get_active_trades(limit, get_all, timeout, raw)
-        inactive = self.get_inactive_trades(limit, get_all, timeout, raw)
+        # active and inactive trades (and their pages) are requested concurrently
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            active, inactive = executor.map(
+                lambda trade_type: self.get_trades(trade_type, limit, get_all, timeout, raw,
+                                                   workers, records, fields, stream),
+                ('active', 'inactive'))
 
         result = {'count': active['count'] + inactive['count'],
                   'results': active['results'] + inactive['results']}
@@ -788,12 +1302,15 @@ class Client:
         if otp:
             data.update({'otp': otp})
 
-        return get_result(False,
-                          self.request('patch',
-                                       self.create_api_url(
-                                            'contracts/status/{}/'.format(uuid)),
-                                       data),
-                          lambda r: {'uuid': uuid, 'status': r['status']})
+        try:
+            response = self.request('patch',
+                                    self.create_api_url('contracts/status/{}/'.format(uuid)),
+                                    data,
+                                    priority=PRIORITY_HIGH)
+        finally:
+            self.invalidate_cache('contracts/{}/'.format(uuid))
+
+        return get_result(False, response, lambda r: {'uuid': uuid, 'status': r['status']})
 
     def reject_trade(self, uuid):
         """
@@ -884,6 +1401,88 @@ class Client:
 Helper functions
 '''
 
+# adds page to results list (parsed with parser unless raw)
+# or to columnar results (from raw page)
+def add_page(results, page, parser, raw):
+    if isinstance(results, Columns):
+        results.extend(page)
+    else:
+        results += get_result(raw, page, parser)
+
+# Default json decoder for responses (orjson is faster, if installed)
+default_json_loads = orjson.loads if orjson else json.loads
+
+# Size of response chunks read from socket for streamed pages
+STREAM_CHUNK_SIZE = 65536
+# Number of streamed results parsed at once
+STREAM_BATCH = 100
+
+def create_session(pool_connections=10, pool_maxsize=10, pool_block=False, keep_alive=True):
+    """
+    Create requests session with connection pool options. Session
+    can be shared by multiple clients (and threads), so they reuse
+    the same open connections:
+
+    .. code-block:: python
+
+        session = create_session(pool_maxsize=50)
+        client1 = Client('api_token_1', session=session)
+        client2 = Client('api_token_2', session=session)
+
+    :param int pool_connections: number of cached connection pools (default 10)
+    :param int pool_maxsize: max number of connections kept in a pool, should be
+                             at least the number of concurrent requests (default 10)
+    :param bool pool_block: wait for a free connection when pool is full
+                            instead of opening a new one (default False)
+    :param bool keep_alive: reuse connections (default True)
+    :returns: session
+    :rtype: requests.Session
+    """
+
+    session = requests.session()
+    adapter = HTTPAdapter(pool_connections=pool_connections,
+                          pool_maxsize=pool_maxsize,
+                          pool_block=pool_block)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({'User-Agent': 'localcoinswap/python'})
+    if not keep_alive:
+        session.headers.update({'Connection': 'close'})
+    return session
+
 # selects result return between raw api response and parsed with parser
 def get_result(raw, result, parser):
     return result if raw else parser(result)
+
+# selects parser for a list of results: parser of records (record.parse_many)
+# if records=True, otherwise parser (e.g. 'parse_ads') of selected fields
+def get_parser(parser, record, records=False, fields=None):
+    if records:
+        if fields is not None:
+            raise LocalcoinswapInvalidParamError('fields can\'t be used with records')
+        return record.parse_many
+    return partial(parser, fields=fields) if fields is not None else parser
+
+# creates columns (e.g. 'AdColumns') for columnar results if columnar=True,
+# columnar results are built from raw pages, so other result options can't be used
+def get_columns(columns, columnar, raw=False, records=False, fields=None):
+    if not columnar:
+        return None
+    if raw or records or fields is not None:
+        raise LocalcoinswapInvalidParamError('raw, records and fields can\'t be used with columnar')
+    return columns()
+
+# Returns urls of all remaining pages, starting from `next_url` (api 'next'
+# page url with limit & offset) up to `count` results. Returns None if
+# remaining pages can't be determined from `next_url`
+def get_page_urls(next_url, count):
+    if not next_url:
+        return None
+    parts = urlsplit(next_url)
+    params = dict(parse_qsl(parts.query, keep_blank_values=True))
+    if 'limit' not in params or 'offset' not in params:
+        return None
+    limit, offset = int(params['limit']), int(params['offset'])
+
+    return [urlunsplit(parts._replace(query=urlencode(dict(params, offset=page_offset))))
+            for page_offset in range(offset, count, limit)]
@@ -0,0 +1,222 @@
+'''
+Columnar results for large ad and transaction lists (typed arrays instead of dicts).
+'''
+
+from array import array
+from operator import itemgetter
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Column types
+# float64 array
+FLOAT = 'd'
+# int64 array
+INT = 'q'
+# int8 array (0/1)
+BOOL = 'b'
+# int64 array of codes, values are in column categories
+CATEGORY = 'category'
+# list of values
+OBJECT = 'object'
+
+class Columns:
+    """
+    Base class for columnar results.
+
+    Raw api records are added with ``extend`` directly into one column per
+    field. Numeric fields are stored in typed arrays (``array.array``, e.g.
+    float64 prices), categorical fields (currencies, payment methods, etc.)
+    as int64 codes of interned values (see ``categories`` and ``decode``)
+    and other fields (e.g. uuids) as lists.
+
+    Arrays can be converted to numpy arrays (see ``to_numpy``).
+
+    .. code-block:: python
+
+        ads = client.get_ads({'limit': 100}, get_all=True, columnar=True)['results']
+        columns = ads.to_numpy()
+        usd = columns['fiat_currency_symbol'] == ads.code('fiat_currency_symbol', 'USD')
+        best_usd_price = columns['current_price'][usd].min()
+
+    Subclasses define ``FIELDS``, list of (column name, type, path of keys in raw record).
+    """
+
+    FIELDS = []
+
+    def __init__(self, data=[]):
+        self.columns = {}
+        # value -> code for each categorical column
+        self.codes = {}
+        for name, kind, path in self.FIELDS:
+            if kind == OBJECT:
+                self.columns[name] = []
+            else:
+                self.columns[name] = array(INT if kind == CATEGORY else kind)
+            if kind == CATEGORY:
+                self.codes[name] = {}
+        self.extend(data)
+
+    def __len__(self):
+        return len(self.columns[self.FIELDS[0][0]]) if self.FIELDS else 0
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def __iter__(self):
+        return iter(self.columns)
+
+    def keys(self):
+        return self.columns.keys()
+
+    def extend(self, data):
+        """
+        Add raw api records (e.g. one page of results). If a record
+        is invalid, no records are added.
+
+        :param list data: list of raw records
+        :returns: None
+
+        :raises: KeyError, TypeError, ValueError (invalid record)
+        """
+
+        # columns are extended only after all values are converted,
+        # so an invalid record doesn't leave columns with different lengths
+        columns, new_codes = [], {}
+        for name, kind, path in self.FIELDS:
+            values = data
+            for key in path:
+                values = map(itemgetter(key), values)
+            if kind == FLOAT:
+                values = map(float, values)
+            elif kind == CATEGORY:
+                codes = self.codes[name]
+                added = new_codes[name] = {}
+                values = [codes[value] if value in codes
+                          else added.setdefault(value, len(codes) + len(added))
+                          for value in values]
+            if kind == OBJECT:
+                columns.append((name, list(values)))
+            else:
+                columns.append((name, array(self.columns[name].typecode, values)))
+
+        for name, values in columns:
+            self.columns[name].extend(values)
+        for name, added in new_codes.items():
+            self.codes[name].update(added)
+
+    def categories(self, name):
+        """
+        Values of categorical column (value of code ``n`` is at index ``n``).
+
+        :param str name: column name
+        :returns: list of values
+        :rtype: list
+        """
+
+        return list(self.codes[name])
+
+    def code(self, name, value):
+        """
+        Code of a categorical column value (-1 if value is not in column).
+
+        :param str name: column name
+        :param value: value (e.g. 'USD')
+        :returns: code
+        :rtype: int
+        """
+
+        return self.codes[name].get(value, -1)
+
+    def decode(self, name):
+        """
+        Values of categorical column for each record.
+
+        :param str name: column name
+        :returns: list of values
+        :rtype: list
+        """
+
+        categories = self.categories(name)
+        return [categories[code] for code in self.columns[name]]
+
+    def to_numpy(self):
+        """
+        Convert columns to numpy arrays (requires numpy). Typed arrays
+        are copied (arrays sharing their buffer would prevent ``extend``),
+        other columns are converted to object arrays.
+
+        :returns: dict of numpy arrays by column name
+        :rtype: dict
+        """
+
+        if numpy is None:
+            raise ImportError('to_numpy requires numpy (pip install numpy)')
+        result = {}
+        for name, kind, path in self.FIELDS:
+            column = self.columns[name]
+            if kind == OBJECT:
+                result[name] = numpy.array(column, dtype=object)
+            else:
+                result[name] = numpy.frombuffer(column, dtype=column.typecode).copy()
+        return result
+
+class AdColumns(Columns):
+    """
+    Columnar ads (see ``Columns`` and ``parsers.parse_ad``).
+
+    Columns:
+
+    - uuid (object)
+    - trading_type_id, payment_method_id (int)
+    - trading_type, payment_method, coin_currency_symbol, fiat_currency_symbol,
+      country_code, location_name, created_by_username (category)
+    - current_price, min_trade_size, max_trade_size,
+      min_fiat_limit, max_fiat_limit (float)
+    - is_active, is_available (bool)
+
+    :param list data: list of raw ads (optional)
+    """
+
+    FIELDS = [
+        ('uuid', OBJECT, ('uuid',)),
+        ('trading_type', CATEGORY, ('trading_type', 'action_name')),
+        ('trading_type_id', INT, ('trading_type', 'id')),
+        ('payment_method', CATEGORY, ('payment_method', 'name')),
+        ('payment_method_id', INT, ('payment_method', 'id')),
+        ('coin_currency_symbol', CATEGORY, ('coin_currency', 'symbol')),
+        ('fiat_currency_symbol', CATEGORY, ('fiat_currency', 'symbol')),
+        ('current_price', FLOAT, ('current_price',)),
+        ('min_trade_size', FLOAT, ('min_trade_size',)),
+        ('max_trade_size', FLOAT, ('max_trade_size',)),
+        ('min_fiat_limit', FLOAT, ('min_fiat_limit',)),
+        ('max_fiat_limit', FLOAT, ('max_fiat_limit',)),
+        ('is_active', BOOL, ('is_active',)),
+        ('is_available', BOOL, ('is_available',)),
+        ('country_code', CATEGORY, ('country_code',)),
+        ('location_name', CATEGORY, ('location_name',)),
+        ('created_by_username', CATEGORY, ('created_by', 'username')),
+    ]
+
+class TransactionColumns(Columns):
+    """
+    Columnar transactions (see ``Columns`` and ``parsers.parse_transaction``).
+    Unlike parsed transactions, amount is a float.
+
+    Columns:
+
+    - transaction_type, currency (category)
+    - amount (float)
+    - timestamp (int)
+
+    :param list data: list of raw transactions (optional)
+    """
+
+    FIELDS = [
+        ('transaction_type', CATEGORY, ('transaction_type',)),
+        ('amount', FLOAT, ('amount',)),
+        ('currency', CATEGORY, ('currency', 'symbol')),
+        ('timestamp', INT, ('timestamp',)),
+    ]
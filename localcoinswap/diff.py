@@ -0,0 +1,156 @@
+'''
+Change detection between successive scans of ads.
+'''
+
+ADDED = 'added'
+REMOVED = 'removed'
+CHANGED = 'changed'
+
+class Change:
+    """
+    Change of one ad between scans (see ``AdSnapshot.diff``).
+
+    :ivar str event: ``ADDED``, ``REMOVED`` or ``CHANGED``
+    :ivar str uuid: ad uuid
+    :ivar ad: new ad (last known ad for removed ads)
+    :ivar dict fields: changed fields (``{field: (old value, new value)}``),
+                       empty for added and removed ads
+    """
+
+    __slots__ = ('event', 'uuid', 'ad', 'fields')
+
+    def __init__(self, event, uuid, ad, fields=None):
+        self.event = event
+        self.uuid = uuid
+        self.ad = ad
+        self.fields = fields or {}
+
+    def __eq__(self, other):
+        if not isinstance(other, Change):
+            return NotImplemented
+        return (self.event, self.uuid, self.ad, self.fields) == \
+               (other.event, other.uuid, other.ad, other.fields)
+
+    def __repr__(self):
+        return 'Change({!r}, {!r}, fields={!r})'.format(self.event, self.uuid, self.fields)
+
+class AdSnapshot:
+    """
+    Snapshot of ads keyed by uuid, which is compared with the next scan
+    to get only added, removed and changed ads:
+
+    .. code-block:: python
+
+        snapshot = AdSnapshot()
+        while True:
+            for change in snapshot.diff(client.get_ads(params, get_all=True)['results']):
+                if change.event == CHANGED and 'current_price' in change.fields:
+                    old_price, new_price = change.fields['current_price']
+
+    Values of compared fields (lists as tuples) and their hash are kept for
+    each ad. Ads whose hash changed are changed, others are compared by values
+    (linear time for the whole scan), and single fields are compared only
+    for changed ads.
+
+    :param list ads: parsed ads (dicts or ``records.Ad``) of the first scan (optional)
+    :param list fields: compared fields (default None - all fields)
+    """
+
+    def __init__(self, ads=(), fields=None):
+        self.fields = fields
+        # (content hash, values, ad) by ad uuid
+        self.ads = {}
+        self.diff(ads)
+
+    def __len__(self):
+        return len(self.ads)
+
+    def __contains__(self, uuid):
+        return uuid in self.ads
+
+    def get(self, uuid, default=None):
+        """
+        Ad from the last scan.
+
+        :param str uuid: ad uuid
+        :param default: returned if ad isn't in snapshot (default None)
+        :returns: parsed ad
+        """
+
+        entry = self.ads.get(uuid)
+        return entry[2] if entry else default
+
+    # Values of compared fields (hashable, see 'freeze')
+    def values(self, ad):
+        return tuple(freeze(ad[field]) for field in (self.fields or ad.keys()))
+
+    def diff(self, ads, complete=True):
+        """
+        Compare scan with snapshot and update snapshot.
+
+        :param list ads: parsed ads of the scan
+        :param bool complete: scan includes all ads, so ads missing
+                              in scan were removed (default True)
+        :returns: list of changes (added and changed ads in scan order,
+                  then removed ads)
+        :rtype: list
+        """
+
+        changes = []
+        scanned = {}
+        for ad in ads:
+            uuid = ad['uuid']
+            values = self.values(ad)
+            content_hash = get_content_hash(values)
+            scanned[uuid] = (content_hash, values, ad)
+            previous = self.ads.get(uuid)
+            if previous is None:
+                changes.append(Change(ADDED, uuid, ad))
+            elif previous[0] != content_hash or previous[1] != values:
+                fields = {field: (previous[2][field], ad[field])
+                          for field, old, new
+                          in zip(self.fields or ad.keys(), previous[1], values)
+                          if old != new}
+                if fields:
+                    changes.append(Change(CHANGED, uuid, ad, fields))
+
+        if complete:
+            for uuid, (content_hash, values, ad) in self.ads.items():
+                if uuid not in scanned:
+                    changes.append(Change(REMOVED, uuid, ad))
+            self.ads = scanned
+        else:
+            self.ads.update(scanned)
+        return changes
+
+    def remove(self, uuids):
+        """
+        Remove ads from snapshot (e.g. deleted ads when scans aren't complete).
+
+        :param list uuids: ad uuids
+        :returns: list of changes (removed ads)
+        :rtype: list
+        """
+
+        changes = []
+        for uuid in uuids:
+            entry = self.ads.pop(uuid, None)
+            if entry is not None:
+                changes.append(Change(REMOVED, uuid, entry[2]))
+        return changes
+
+# Hashable field value (lists and dicts are converted to tuples)
+def freeze(value):
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple((key, freeze(item)) for key, item in value.items())
+    return value
+
+# Content hash of field values (None if values aren't hashable,
+# then ads are compared by values only)
+def get_content_hash(values):
+    try:
+        return hash(values)
+    except TypeError:
+        return None
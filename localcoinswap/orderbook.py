@@ -0,0 +1,280 @@
+'''
+Local order book of ads by currency pair, payment method and trading type.
+'''
+
+from bisect import bisect_left, bisect_right
+from itertools import accumulate, groupby
+
+class OrderBook:
+    """
+    In-memory order book built from parsed ads (``client.get_ads``,
+    dicts or ``records.Ad``), with one ``Book`` for each key of
+    (coin currency symbol, fiat currency symbol, payment method, trading type):
+
+    .. code-block:: python
+
+        book = OrderBook(client.get_ads({'limit': 100}, get_all=True)['results'])
+        btc_usd = book.get('BTC', 'USD', 'Local Bank transfer', 'Selling')
+        btc_usd.best_price()
+        btc_usd.fitting(500)   # ads accepting 500 USD, best price first
+
+        # later scans update the book
+        book.update(client.get_ads({'limit': 100})['results'])
+
+    Only active and available ads are kept in the book.
+
+    :param list ads: parsed ads (optional)
+    """
+
+    def __init__(self, ads=()):
+        self.books = {}
+        # book key by ad uuid
+        self.keys = {}
+        self.update(ads)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __contains__(self, uuid):
+        return uuid in self.keys
+
+    @staticmethod
+    def key(ad):
+        """
+        Book key of ad.
+
+        :param dict ad: parsed ad
+        :returns: (coin currency symbol, fiat currency symbol, payment method, trading type)
+        :rtype: tuple
+        """
+
+        return (ad['coin_currency_symbol'],
+                ad['fiat_currency_symbol'],
+                ad['payment_method'],
+                ad['trading_type'])
+
+    def get(self, coin_currency, fiat_currency, payment_method, trading_type):
+        """
+        Book for currency pair, payment method and trading type
+        (empty book if there are no ads).
+
+        :param str coin_currency: coin currency symbol (e.g. 'BTC')
+        :param str fiat_currency: fiat currency symbol (e.g. 'USD')
+        :param str payment_method: payment method name (e.g. 'Cash in person')
+        :param str trading_type: ad trading type ('Buying' or 'Selling')
+        :returns: book
+        :rtype: Book
+        """
+
+        key = (coin_currency, fiat_currency, payment_method, trading_type)
+        return self.books.get(key) or Book(trading_type == 'Buying')
+
+    def update(self, ads):
+        """
+        Add new ads and update changed ads (ads that are no longer
+        active or available are removed).
+
+        :param list ads: parsed ads
+        :returns: None
+        """
+
+        for ad in ads:
+            uuid = ad['uuid']
+            if not (ad['is_active'] and ad['is_available']):
+                self.remove([uuid])
+                continue
+            key = self.key(ad)
+            if self.keys.get(uuid, key) != key:
+                self.remove([uuid])
+            book = self.books.get(key)
+            if book is None:
+                book = self.books[key] = Book(ad['trading_type'] == 'Buying')
+            book.add(ad)
+            self.keys[uuid] = key
+
+    def remove(self, uuids):
+        """
+        Remove ads.
+
+        :param list uuids: ad uuids
+        :returns: None
+        """
+
+        for uuid in uuids:
+            key = self.keys.pop(uuid, None)
+            if key is None:
+                continue
+            book = self.books[key]
+            book.remove(uuid)
+            if not book:
+                del self.books[key]
+
+    def replace(self, ads):
+        """
+        Replace book with ads from a complete scan (ads missing in scan are removed).
+
+        :param list ads: parsed ads
+        :returns: None
+        """
+
+        ads = list(ads)
+        self.remove(set(self.keys) - {ad['uuid'] for ad in ads})
+        self.update(ads)
+
+class Book:
+    """
+    Ads of one order book key (see ``OrderBook``), sorted by price from best
+    to worst: lowest price first for 'Selling' ads (buying from them),
+    highest price first for 'Buying' ads (selling to them).
+
+    Sorted prices, cumulative fiat limits and a segment tree of fiat limits
+    are computed once after changes, so best price and depth are bisect
+    lookups (logarithmic time) and ads accepting a fiat amount are found
+    without checking ranges of ads that can't accept it.
+
+    :param bool descending: highest price is best (default False)
+    """
+
+    def __init__(self, descending=False):
+        self.descending = descending
+        self.ads = {}
+        # (sort keys, ads, cumulative max fiat limits, limits tree) from best price,
+        # None after changes
+        self.index = None
+
+    def __len__(self):
+        return len(self.ads)
+
+    def __iter__(self):
+        return iter(self.get_index()[1])
+
+    def add(self, ad):
+        """
+        Add or update ad.
+
+        :param dict ad: parsed ad
+        :returns: None
+        """
+
+        self.ads[ad['uuid']] = ad
+        self.index = None
+
+    def remove(self, uuid):
+        """
+        Remove ad (if it's in book).
+
+        :param str uuid: ad uuid
+        :returns: None
+        """
+
+        if self.ads.pop(uuid, None) is not None:
+            self.index = None
+
+    # Sort key of price (ascending from best price)
+    def sort_key(self, price):
+        return -price if self.descending else price
+
+    # Index of ads sorted from best price (built after changes)
+    def get_index(self):
+        if self.index is None:
+            ads = sorted(self.ads.values(),
+                         key=lambda ad: self.sort_key(ad['current_price']))
+            self.index = ([self.sort_key(ad['current_price']) for ad in ads],
+                          ads,
+                          list(accumulate(ad['max_fiat_limit'] for ad in ads)),
+                          build_limits_tree(ads))
+        return self.index
+
+    def best_price(self):
+        """
+        Best price (None if book is empty).
+
+        :returns: price
+        :rtype: float
+        """
+
+        ads = self.get_index()[1]
+        return ads[0]['current_price'] if ads else None
+
+    def levels(self):
+        """
+        Price levels from best price.
+
+        :returns: list of (price, list of ads) tuples
+        :rtype: list
+        """
+
+        return [(price, list(ads)) for price, ads
+                in groupby(self.get_index()[1], lambda ad: ad['current_price'])]
+
+    def depth(self, price):
+        """
+        Fiat amount available at price or better (sum of max fiat limits).
+
+        :param float price: price
+        :returns: fiat amount
+        :rtype: float
+        """
+
+        keys, ads, cumulative, tree = self.get_index()
+        index = bisect_right(keys, self.sort_key(price))
+        return cumulative[index - 1] if index else 0.0
+
+    def price_at_amount(self, amount):
+        """
+        Worst price reached when fiat amount is filled from best price
+        (None if book doesn't have enough depth).
+
+        :param float amount: fiat amount
+        :returns: price
+        :rtype: float
+        """
+
+        keys, ads, cumulative, tree = self.get_index()
+        index = bisect_left(cumulative, amount)
+        return ads[index]['current_price'] if index < len(ads) else None
+
+    def fitting(self, amount, limit=None):
+        """
+        Ads accepting fiat amount (``min_fiat_limit <= amount <= max_fiat_limit``),
+        best price first.
+
+        :param float amount: fiat amount
+        :param int limit: max number of ads (default None - all ads)
+        :returns: list of ads
+        :rtype: list
+        """
+
+        keys, ads, cumulative, (mins, maxs) = self.get_index()
+        leaves = len(mins) // 2
+        result = []
+        # depth-first from left (best price), skipping subtrees without fitting ads
+        nodes = [1]
+        while nodes:
+            node = nodes.pop()
+            if mins[node] > amount or maxs[node] < amount:
+                continue
+            if node >= leaves:
+                result.append(ads[node - leaves])
+                if limit is not None and len(result) >= limit:
+                    break
+                continue
+            nodes.append(2 * node + 1)
+            nodes.append(2 * node)
+        return result
+
+# Segment tree of ad fiat limits (min of min limits, max of max limits for
+# each node), node n has children 2n and 2n + 1, leaves are ads
+def build_limits_tree(ads):
+    leaves = 1
+    while leaves < len(ads):
+        leaves *= 2
+    mins = [float('inf')] * (2 * leaves)
+    maxs = [float('-inf')] * (2 * leaves)
+    for i, ad in enumerate(ads):
+        mins[leaves + i] = ad['min_fiat_limit']
+        maxs[leaves + i] = ad['max_fiat_limit']
+    for node in range(leaves - 1, 0, -1):
+        mins[node] = min(mins[2 * node], mins[2 * node + 1])
+        maxs[node] = max(maxs[2 * node], maxs[2 * node + 1])
+    return mins, maxs
@@ -0,0 +1,87 @@
+'''
+Parsing of large result sets in a process pool.
+'''
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+class ParsePool:
+    """
+    Pool of processes used to parse pages requested with ``get_all=True``
+    (``Client(token, parse_pool=ParsePool(4))``), so parsing isn't limited
+    to a single core.
+
+    Pages are sent to workers in chunks of ``chunk_size`` pages. Parsed
+    chunks are returned in the same order as pages, no matter which
+    worker finishes first. At most ``2 * workers`` chunks are queued at
+    once, so requested pages aren't piling up if parsing is slower.
+
+    Parsers must be picklable (e.g. ``parsers.parse_ads``, but not lambdas).
+    Specs registered at runtime (see ``specs.register_spec``) are available
+    in workers only if they were registered before the pool was created
+    and processes are forked (default on Linux).
+
+    :param int workers: number of worker processes (default number of CPUs)
+    :param int chunk_size: number of pages parsed in one task (default 1)
+    :param executor: executor used instead of a process pool
+                     (``concurrent.futures.Executor``, default None)
+    """
+
+    def __init__(self, workers=None, chunk_size=1, executor=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.executor = executor or ProcessPoolExecutor(self.workers)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+
+    def map(self, parser, pages):
+        """
+        Parse pages in pool.
+
+        :param parser: parser of page results (e.g. ``parsers.parse_ads``)
+        :param pages: iterable of page results (raw)
+        :returns: generator of parsed chunks (list of parsed results
+                  of ``chunk_size`` pages), in the same order as pages
+        :rtype: generator
+        """
+
+        pending = deque()
+        chunk = []
+        try:
+            for page in pages:
+                chunk.append(page)
+                if len(chunk) < self.chunk_size:
+                    continue
+                pending.append(self.executor.submit(parse_chunk, parser, chunk))
+                chunk = []
+                if len(pending) >= 2 * self.workers:
+                    yield pending.popleft().result()
+            if chunk:
+                pending.append(self.executor.submit(parse_chunk, parser, chunk))
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def shutdown(self, wait=True):
+        """
+        Shut down worker processes.
+
+        :param bool wait: wait for running tasks (default True)
+        :returns: None
+        """
+
+        self.executor.shutdown(wait)
+
+# Parse chunk of pages (runs in worker process)
+def parse_chunk(parser, pages):
+    results = []
+    for page in pages:
+        results += parser(page)
+    return results
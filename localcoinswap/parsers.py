@@ -1,30 +1,142 @@
 '''
 Parse API responses for relevant data.
+
+Parsers of records (ads, trades, transactions, wallets, ...) are compiled
+from declarative specs (see ``localcoinswap.specs``) registered by name,
+so fields can be added or changed by registering a new spec.
 '''
 
+from .specs import Field, Spec, get_spec, register_spec
+
+# Parsed 'to' of a transaction (username for escrow transactions, otherwise address)
+def get_transaction_to(transaction):
+    if transaction['transaction_type'] in ['contract_escrow',
+                                           'contract_escrow_revert',
+                                           'contract_escrow_release']:
+        return transaction['to_user']['username']
+    return transaction['to_address'] if transaction['to_address'] else ''
+
+WALLET_SPEC = Spec([
+    Field('name', ('currency', 'title')),
+    Field('symbol', ('currency', 'symbol')),
+    Field('id', ('currency', 'id')),
+    Field('coin_amount', ('amount',), float),
+    Field('fiat_amount', ('amount_in_local_currency', 'amount_in_local_currency'), float),
+    Field('fiat_currency', ('amount_in_local_currency', 'local_currency_symbol')),
+    Field('address', ('address', 'address')),
+    Field('payment_id', ('address', 'chip')),
+])
+
+DEPOSIT_ADDRESS_SPEC = Spec([
+    Field('name', ('currency', 'title')),
+    Field('symbol', ('currency', 'symbol')),
+    Field('balance', ('amount',), float),
+    Field('address', ('address', 'address')),
+    Field('payment_id', ('address', 'chip')),
+])
+
+TRANSACTION_SPEC = Spec([
+    Field('transaction_type', ('transaction_type',)),
+    Field('amount', ('amount',)),
+    Field('currency', ('currency', 'symbol')),
+    Field('timestamp', ('timestamp',)),
+    Field('from', ('from_user',), lambda user: user['username'] if user else ''),
+    Field('to', (), get_transaction_to),
+])
+
+AD_SPEC = Spec([
+    Field('uuid', ('uuid',)),
+    Field('trading_type', ('trading_type', 'action_name')),
+    Field('trading_type_id', ('trading_type', 'id')),
+    Field('payment_method', ('payment_method', 'name')),
+    Field('payment_method_id', ('payment_method', 'id')),
+    Field('coin_currency', ('coin_currency', 'title')),
+    Field('coin_currency_symbol', ('coin_currency', 'symbol')),
+    Field('fiat_currency', ('fiat_currency', 'title')),
+    Field('fiat_currency_symbol', ('fiat_currency', 'symbol')),
+    Field('current_price', ('current_price',), float),
+    Field('price_formula', ('price_formula', 'display_formula')),
+    Field('price_formula_type', ('price_formula', 'pricing_type')),
+    Field('photo_id_required', ('photo_id_required',)),
+    Field('sms_required', ('sms_required',)),
+    Field('only_friends', ('only_friends',)),
+    Field('trading_hours', ('trading_hours',)),
+    Field('trading_hours_localized', ('trading_hours_localised',)),
+    Field('is_active', ('is_active',)),
+    Field('is_available', ('is_available',)),
+    Field('minimum_feedback', ('minimum_feedback',)),
+    Field('automatic_cancel_time', ('automatic_cancel_time',)),
+    Field('liquidity_tracking', ('liqudity_tracking',)),
+    Field('location_name', ('location_name',)),
+    Field('country_code', ('country_code',)),
+    Field('trading_conditions', ('trading_conditions',)),
+    Field('enforced_sizes', ('enforced_sizes',)),
+    Field('min_trade_size', ('min_trade_size',), float),
+    Field('max_trade_size', ('max_trade_size',), float),
+    Field('min_fiat_limit', ('min_fiat_limit',), float),
+    Field('max_fiat_limit', ('max_fiat_limit',), float),
+    Field('created_by_username', ('created_by', 'username')),
+    Field('created_by_status', ('created_by', 'activity_status')),
+    Field('created_by_response_time', ('created_by', 'avg_response_time')),
+    Field('created_by_languages', ('created_by', 'languages')),
+    Field('created_by_ratings', ('created_by', 'ratings')),
+    Field('created_by_ratings_percentage', ('created_by', 'ratings_percentage')),
+])
+
+TRADE_SPEC = Spec([
+    Field('id', ('id',)),
+    Field('status', ('status',)),
+    Field('uuid', ('uuid',)),
+    Field('responder', ('contract_responder', 'username')),
+    Field('fiat_amount', ('fiat_amount',), float),
+    Field('coin_amount', ('coin_amount',), float),
+    Field('coin_currency', ('ad', 'coin_currency', 'title')),
+    Field('coin_currency_symbol', ('ad', 'coin_currency', 'symbol')),
+    Field('country_code', ('ad', 'country_code')),
+    Field('location_name', ('ad', 'location_name')),
+    Field('created_by', ('ad', 'created_by', 'username')),
+    Field('fiat_currency', ('fiat_currency', 'title')),
+    Field('fiat_currency_symbol', ('fiat_currency', 'symbol')),
+    Field('payment_method', ('ad', 'payment_method', 'name')),
+    Field('time_of_expiry', ('time_of_expiry',)),
+    Field('ad_uuid', ('ad', 'uuid')),
+])
+
+START_TRADE_SPEC = Spec([
+    Field('ad_uuid', ('ad', 'uuid')),
+    Field('coin_amount', ('coin_amount',)),
+    Field('coin_currency', ('coin_currency', 'title')),
+    Field('coin_currency_symbol', ('coin_currency', 'symbol')),
+    Field('fiat_amount', ('fiat_amount',)),
+    Field('fiat_currency', ('fiat_currency', 'title')),
+    Field('fiat_currency_symbol', ('fiat_currency', 'symbol')),
+    Field('promo_code', ('promo_code',)),
+    Field('status', ('status',)),
+    Field('time_of_expiry', ('time_of_expiry',)),
+    Field('uuid', ('uuid',)),
+])
+
+register_spec('wallet', WALLET_SPEC)
+register_spec('deposit_address', DEPOSIT_ADDRESS_SPEC)
+register_spec('transaction', TRANSACTION_SPEC)
+register_spec('ad', AD_SPEC)
+register_spec('trade', TRADE_SPEC)
+register_spec('start_trade', START_TRADE_SPEC)
+
 def parse_wallet(data):
     """
-    Parses relevant fields from wallets (list of dicts).
+    Parses relevant fields from wallets (list of dicts), see ``WALLET_SPEC``.
 
     :param list data: list of wallet dictionaries
     :returns: parsed list of wallet dictionaries
     :rtype: list
     """
 
-    return [{
-            'name': wallet['currency']['title'],
-            'symbol': wallet['currency']['symbol'],
-            'id': wallet['currency']['id'],
-            'coin_amount': float(wallet['amount']),
-            'fiat_amount': float(wallet['amount_in_local_currency']['amount_in_local_currency']),
-            'fiat_currency': wallet['amount_in_local_currency']['local_currency_symbol'],
-            'address': wallet['address']['address'],
-            'payment_id': wallet['address']['chip']
-            } for wallet in data]
+    return get_spec('wallet').parse_many(data)
 
 def parse_deposit_address(data):
     """
-    Parses relevant fields from deposit address data.
+    Parses relevant fields from deposit address data, see ``DEPOSIT_ADDRESS_SPEC``.
 
     :param data: address info for one currency (address)
     :type data: dict
@@ -32,17 +144,11 @@ def parse_deposit_address(data):
     :rtype: dict
     """
 
-    return {
-        'name': data['currency']['title'],
-        'symbol': data['currency']['symbol'],
-        'balance': float(data['amount']),
-        'address': data['address']['address'],
-        'payment_id': data['address']['chip']
-    }
+    return get_spec('deposit_address').parse(data)
 
 def parse_transaction(transaction):
     """
-    Parsed relevant fields from transaction data.
+    Parsed relevant fields from transaction data, see ``TRANSACTION_SPEC``.
 
     :param transaction: transaction data
     :type transaction: dict
@@ -50,22 +156,7 @@ def parse_transaction(transaction):
     :rtype: dict
     """
 
-    _from = transaction['from_user']['username'] if transaction['from_user'] else ''
-    if transaction['transaction_type'] in ['contract_escrow',
-                                           'contract_escrow_revert',
-                                           'contract_escrow_release']:
-        _to = transaction['to_user']['username']
-    else:
-        _to = transaction['to_address'] if transaction['to_address'] else ''
-
-    return {
-        'transaction_type': transaction['transaction_type'],
-        'amount': transaction['amount'],
-        'currency': transaction['currency']['symbol'],
-        'timestamp': transaction['timestamp'],
-        'from': _from,
-        'to': _to
-    }
+    return get_spec('transaction').parse(transaction)
 
 def parse_transactions(data):
     """
@@ -77,112 +168,77 @@ def parse_transactions(data):
     :rtype: list
     """
 
-    return [parse_transaction(transaction) for transaction in data]
+    return get_spec('transaction').parse_many(data)
 
-def parse_ad(ad):
+def parse_ad(ad, fields=None):
     """
-    Parses relevant fields from ad data.
+    Parses relevant fields from ad data, see ``AD_SPEC``.
+
+    Only selected fields are parsed if ``fields`` are set (e.g.
+    ``['uuid', 'current_price', 'min_fiat_limit', 'max_fiat_limit', 'payment_method']``).
 
     :param ad: data for one ad
     :type ad: dict
+    :param list fields: parsed fields (default None - all fields)
     :returns: parsed ad data
     :rtype: dict
+
+    :raises: LocalcoinswapInvalidParamError (unknown field)
     """
 
-    return {
-        'uuid': ad['uuid'],
-        'trading_type': ad['trading_type']['action_name'],
-        'trading_type_id': ad['trading_type']['id'],
-        'payment_method': ad['payment_method']['name'],
-        'payment_method_id': ad['payment_method']['id'],
-        'coin_currency': ad['coin_currency']['title'],
-        'coin_currency_symbol': ad['coin_currency']['symbol'],
-        'fiat_currency': ad['fiat_currency']['title'],
-        'fiat_currency_symbol': ad['fiat_currency']['symbol'],
-        'current_price': float(ad['current_price']),
-        'price_formula': ad['price_formula']['display_formula'],
-        'price_formula_type': ad['price_formula']['pricing_type'],
-        'photo_id_required': ad['photo_id_required'],
-        'sms_required': ad['sms_required'],
-        'only_friends': ad['only_friends'],
-        'trading_hours': ad['trading_hours'],
-        'trading_hours_localized': ad['trading_hours_localised'],
-        'is_active': ad['is_active'],
-        'is_available': ad['is_available'],
-        'minimum_feedback': ad['minimum_feedback'],
-        'automatic_cancel_time': ad['automatic_cancel_time'],
-        'liquidity_tracking': ad['liqudity_tracking'],
-        'location_name': ad['location_name'],
-        'country_code': ad['country_code'],
-        'trading_conditions': ad['trading_conditions'],
-        'enforced_sizes': ad['enforced_sizes'],
-        'min_trade_size': float(ad['min_trade_size']),
-        'max_trade_size': float(ad['max_trade_size']),
-        'min_fiat_limit': float(ad['min_fiat_limit']),
-        'max_fiat_limit': float(ad['max_fiat_limit']),
-        'created_by_username': ad['created_by']['username'],
-        'created_by_status': ad['created_by']['activity_status'],
-        'created_by_response_time': ad['created_by']['avg_response_time'],
-        'created_by_languages': ad['created_by']['languages'],
-        'created_by_ratings': ad['created_by']['ratings'],
-        'created_by_ratings_percentage': ad['created_by']['ratings_percentage']
-    }
-
-def parse_ads(data):
+    return get_spec('ad').parse(ad, fields)
+
+def parse_ads(data, fields=None):
     """
     Parses multiple ads with ``parse_ad``
 
     :param data: list of ads
     :type data: list
+    :param list fields: parsed fields (default None - all fields)
     :returns: list of parsed ads
     :rtype: list
+
+    :raises: LocalcoinswapInvalidParamError (unknown field)
     """
 
-    return [parse_ad(ad) for ad in data]
+    return get_spec('ad').parse_many(data, fields)
 
-def parse_trade(trade):
+def parse_trade(trade, fields=None):
     """
-    Parses relevant fields from trade data
+    Parses relevant fields from trade data, see ``TRADE_SPEC``.
+
+    Only selected fields are parsed if ``fields`` are set.
 
     :param trade: data for one trade
     :type trade: dict
+    :param list fields: parsed fields (default None - all fields)
     :returns: parsed trade data
     :rtype: dict
+
+    :raises: LocalcoinswapInvalidParamError (unknown field)
     """
 
-    return {
-        'id': trade['id'],
-        'status': trade['status'],
-        'uuid': trade['uuid'],
-        'responder': trade['contract_responder']['username'],
-        'fiat_amount': float(trade['fiat_amount']),
-        'coin_amount': float(trade['coin_amount']),
-        'coin_currency': trade['ad']['coin_currency']['title'],
-        'coin_currency_symbol': trade['ad']['coin_currency']['symbol'],
-        'country_code': trade['ad']['country_code'],
-        'location_name': trade['ad']['location_name'],
-        'created_by': trade['ad']['created_by']['username'],
-        'fiat_currency': trade['fiat_currency']['title'],
-        'fiat_currency_symbol': trade['fiat_currency']['symbol'],
-        'payment_method': trade['ad']['payment_method']['name'],
-        'time_of_expiry': trade['time_of_expiry'],
-        'ad_uuid': trade['ad']['uuid']
-    }
-def parse_trades(data):
+    return get_spec('trade').parse(trade, fields)
+
+def parse_trades(data, fields=None):
     """
     Parses multiple trade dicts with ``parse_trade``
 
     :param data: list of trades
     :type data: list
+    :param list fields: parsed fields (default None - all fields)
     :returns: list of parsed trades
     :rtype: list
+
+    :raises: LocalcoinswapInvalidParamError (unknown field)
     """
 
-    return [parse_trade(trade) for trade in data]
+    return get_spec('trade').parse_many(data, fields)
 
 def parse_start_trade(trade):
     """
-    Parses return of successful ``start_trade`` request (new trade on an ad)
+    Parses return of successful ``start_trade`` request (new trade on an ad),
+    see ``START_TRADE_SPEC``.
 
     :param trade: data for started trade
     :type trade: dict
@@ -190,21 +246,9 @@ def parse_start_trade(trade):
     :rtype: dict
     """
 
-    return {
-        'ad_uuid': trade['ad']['uuid'],
-        'coin_amount': trade['coin_amount'],
-        'coin_currency': trade['coin_currency']['title'],
-        'coin_currency_symbol': trade['coin_currency']['symbol'],
-        'fiat_amount': trade['fiat_amount'],
-        'fiat_currency': trade['fiat_currency']['title'],
-        'fiat_currency_symbol': trade['fiat_currency']['symbol'],
-        'promo_code': trade['promo_code'],
-        'status': trade['status'],
-        'time_of_expiry': trade['time_of_expiry'],
-        'uuid': trade['uuid'],
-    }
-
-def parse_trade_params(data): 
+    return get_spec('start_trade').parse(trade)
+
+def parse_trade_params(data):
     """
     Parses trade params for use in util functions
     (get_currency_id, get_trade_type, etc.). Used on client initialization.
@@ -0,0 +1,198 @@
+'''
+Pool of clients for multiple accounts (API tokens).
+'''
+
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from .client import Client, create_session
+from .exceptions import LocalcoinswapAPIException, LocalcoinswapResponseException
+from .ratelimit import RateLimiter
+
+class ClientPool:
+    """
+    Clients for multiple accounts, which share one session (connection pool)
+    and one copy of trade params, with a rate limiter for each account:
+
+    .. code-block:: python
+
+        with ClientPool({'desk1': 'api_token_1', 'desk2': 'api_token_2'}, rate=5) as pool:
+            wallets = pool.get_wallets()
+            wallets['results']['desk1']   # see Client.get_wallet
+            pool['desk2'].pause_ad(uuid)
+
+    Trade params are requested (or loaded from ``params_cache``) only once,
+    by the first client. Each client gets its own empty copy of
+    ``response_cache`` (see ``ResponseCache.copy``), so cached responses
+    aren't shared between tokens. Operations for all accounts (``map``,
+    ``get_wallets``, ``get_active_trades``) are run concurrently, at most
+    ``workers`` at once.
+
+    :param dict tokens: api tokens by account name (or list of tokens,
+                        used as account names)
+    :param float rate: requests per second for each account
+                       (default None - no limit, see ``ratelimit.RateLimiter``)
+    :param dict rate_limits: requests per second by account name, overrides
+                             ``rate`` for selected accounts (default None)
+    :param int workers: max number of accounts served concurrently (default 8)
+    :param bool get_params: get trade data parameters on startup (default True)
+    :param session: shared requests session (default None - pool creates
+                    a session with ``pool_maxsize`` of at least ``workers``)
+    :param client_options: other ``Client`` options (``retry``, ``params_cache``,
+                           ``response_cache``, ...)
+    """
+
+    def __init__(self, tokens, rate=None, rate_limits=None, workers=8, get_params=True,
+                 session=None, **client_options):
+        if not isinstance(tokens, dict):
+            tokens = {token: token for token in tokens}
+        rates = dict.fromkeys(tokens, rate)
+        rates.update(rate_limits or {})
+        self.workers = workers
+        self.own_session = session is None
+        self.session = session or create_session(pool_maxsize=max(10, workers))
+        self.rate_limiters = {account: RateLimiter(rate)
+                              for account, rate in rates.items() if rate}
+        response_cache = client_options.pop('response_cache', None)
+        self.clients = {account: Client(token,
+                                        get_params=False,
+                                        session=self.session,
+                                        rate_limiter=self.rate_limiters.get(account),
+                                        response_cache=response_cache and response_cache.copy(),
+                                        **client_options)
+                        for account, token in tokens.items()}
+        self.trade_params = None
+        if get_params and self.clients:
+            self.set_trade_params()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __getitem__(self, account):
+        return self.clients[account]
+
+    def __iter__(self):
+        return iter(self.clients)
+
+    def __len__(self):
+        return len(self.clients)
+
+    def close(self):
+        """
+        Close session (if it was created by pool).
+
+        :returns: None
+        """
+
+        if self.own_session:
+            self.session.close()
+
+    def set_trade_params(self):
+        """
+        Retrieve trade params with the first client (see ``Client.set_trade_params``)
+        and set them for all clients.
+
+        :returns: None
+
+        :raises: LocalcoinswapAPIException, LocalcoinswapResponseException
+        """
+
+        client = next(iter(self.clients.values()))
+        client.set_trade_params()
+        # expired cached params are refreshed before they're shared
+        if client.params_refresh is not None:
+            client.params_refresh.join()
+        self.trade_params = client.trade_params
+        for client in self.clients.values():
+            client.trade_params = self.trade_params
+
+    def map(self, function, accounts=None):
+        """
+        Call function with client of each account concurrently. Errors
+        of one account don't stop the others, they're returned by account.
+
+        :param function: callable taking a client (e.g. ``lambda client: client.get_ad(uuid)``)
+        :param list accounts: account names (default None - all accounts)
+        :returns: results and errors by account name
+        :rtype: dict
+
+        .. code-block:: python
+
+            {
+                'results': {
+                    'desk1': result,
+                    ...
+                },
+                'errors': {
+                    'desk2': LocalcoinswapAPIException(...),
+                    ...
+                }
+            }
+
+        :raises: KeyError (unknown account)
+        """
+
+        clients = [(account, self.clients[account])
+                   for account in (self.clients if accounts is None else accounts)]
+
+        def call(client):
+            try:
+                return function(client), None
+            except (LocalcoinswapAPIException,
+                    LocalcoinswapResponseException,
+                    requests.RequestException) as e:
+                return None, e
+
+        result = {'results': {}, 'errors': {}}
+        if not clients:
+            return result
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(clients))) as executor:
+            responses = executor.map(call, [client for account, client in clients])
+            for (account, client), (response, error) in zip(clients, responses):
+                if error is None:
+                    result['results'][account] = response
+                else:
+                    result['errors'][account] = error
+        return result
+
+    def get_wallets(self, raw=False, records=False, accounts=None):
+        """
+        Retrieve wallets of all accounts (see ``Client.get_wallet`` and ``map``).
+
+        :param bool raw: return raw reponses from api or parsed data
+        :param bool records: return ``records.WalletEntry`` records
+                             instead of dicts (default False)
+        :param list accounts: account names (default None - all accounts)
+        :returns: wallets and errors by account name
+        :rtype: dict
+        """
+
+        return self.map(lambda client: client.get_wallet(raw, records), accounts)
+
+    def get_active_trades(self, limit=10, get_all=False, timeout=10, raw=False, records=False,
+                          fields=None, accounts=None):
+        """
+        Retrieve active trades of all accounts (see ``Client.get_active_trades``
+        and ``map``).
+
+        :param int limit: max number of trades in result or number of trades
+                          per page if get_all=True (default 10)
+        :param bool get_all: retrieve all available trades (default False)
+        :param int timeout: request timeout value for high limit values (default 10 seconds)
+        :param bool raw: return raw reponses from api or parsed data
+        :param bool records: return ``records.Trade`` records
+                             instead of dicts (default False)
+        :param list fields: parse only selected fields (see ``parsers.TRADE_SPEC``,
+                            default None - all fields)
+        :param list accounts: account names (default None - all accounts)
+        :returns: trades and errors by account name
+        :rtype: dict
+        """
+
+        return self.map(lambda client: client.get_active_trades(limit, get_all, timeout, raw,
+                                                                records=records, fields=fields),
+                        accounts)
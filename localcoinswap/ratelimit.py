@@ -0,0 +1,85 @@
+'''
+Client-side rate limiting of API requests (token bucket with priorities).
+'''
+
+import threading
+import time
+
+# Request priorities (lower value goes first)
+# trade state changes (accept, confirm, ...) and withdrawals
+PRIORITY_HIGH = 0
+# other requests
+PRIORITY_NORMAL = 1
+# paginated requests (ad scans, transaction history, ...)
+PRIORITY_LOW = 2
+
+class RateLimiter:
+    """
+    Token bucket rate limiter used by client requests
+    (``Client(token, rate_limiter=RateLimiter(5))``).
+
+    Bucket holds up to ``burst`` tokens and is refilled with ``rate`` tokens
+    per second. Each request takes one token or waits until one is available.
+    Waiting requests are served by priority: requests with lower priority
+    wait while requests with higher priority are waiting, so e.g. trade
+    responses (``PRIORITY_HIGH``) aren't stuck behind a long ad scan
+    (``PRIORITY_LOW``).
+
+    One limiter can be shared by several clients (e.g. bots using
+    the same API token).
+
+    :param float rate: requests per second
+    :param int burst: max number of requests sent at once (default rate, min 1)
+    :param clock: function returning current time in seconds
+                  (default ``time.monotonic``)
+    """
+
+    def __init__(self, rate, burst=None, clock=time.monotonic):
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self.clock = clock
+        self.tokens = self.burst
+        self.updated = clock()
+        # number of waiting requests by priority
+        self.waiting = {}
+        self.condition = threading.Condition()
+
+    # Add tokens for time passed since last update
+    def refill(self):
+        now = self.clock()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    # Wait until notified or timeout (seconds) passes, called with condition lock
+    def wait(self, timeout=None):
+        self.condition.wait(timeout)
+
+    # Check if requests with higher priority are waiting
+    def higher_waiting(self, priority):
+        return any(count for p, count in self.waiting.items() if p < priority)
+
+    def acquire(self, priority=PRIORITY_NORMAL):
+        """
+        Take a token (wait until one is available and
+        no requests with higher priority are waiting).
+
+        :param int priority: request priority (default ``PRIORITY_NORMAL``)
+        :returns: None
+        """
+
+        with self.condition:
+            self.waiting[priority] = self.waiting.get(priority, 0) + 1
+            try:
+                while True:
+                    self.refill()
+                    if self.higher_waiting(priority):
+                        # woken up when a higher priority request gets its token
+                        self.wait()
+                    elif self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    else:
+                        self.wait((1 - self.tokens) / self.rate)
+            finally:
+                self.waiting[priority] -= 1
+                self.condition.notify_all()
@@ -0,0 +1,164 @@
+'''
+Compact record types for parsed data (alternative to parsed dicts).
+'''
+
+import keyword
+
+from .parsers import AD_SPEC, TRADE_SPEC, TRANSACTION_SPEC, WALLET_SPEC
+
+class Record:
+    """
+    Base class for records with ``__slots__`` (no per-record ``__dict__``),
+    which use much less memory than parsed dicts when many records are kept
+    (e.g. a cache of ads).
+
+    Records have the same keys as parsed dicts and can be used as read-only
+    mappings (``record['uuid']``, ``record.get('uuid')``, ``record.keys()``,
+    ``dict(record)``, ...) or with attributes (``record.uuid``). Keys that are
+    python keywords have ``_`` appended to attribute name (e.g. ``from_``).
+    Item assignment (``record['uuid'] = ...``) raises ``TypeError``.
+    Records have a fixed set of keys, so convert them to dicts with ``to_dict``
+    before printing them with formatters (which add keys to printed data).
+
+    Records are always parsed with built-in specs (e.g. ``parsers.AD_SPEC``),
+    specs registered with ``specs.register_spec`` don't change records
+    (use parsed dicts for registered specs).
+
+    Subclasses define ``FIELDS`` (tuple of keys) and ``SPEC`` (built-in
+    parser spec, see ``specs.Spec``).
+    """
+
+    __slots__ = ()
+
+    FIELDS = ()
+    SPEC = None
+
+    def __init__(self, **fields):
+        for key in self.FIELDS:
+            setattr(self, self.ATTRIBUTES[key], fields[key])
+
+    # Set attribute names by key for each subclass
+    def __init_subclass__(cls):
+        super().__init_subclass__()
+        cls.ATTRIBUTES = {key: key + '_' if keyword.iskeyword(key) else key
+                          for key in cls.FIELDS}
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Create record from parsed dict.
+
+        :param dict data: parsed data (e.g. from ``parsers.parse_ad``)
+        :returns: record
+        """
+
+        record = cls.__new__(cls)
+        for key, attribute in cls.ATTRIBUTES.items():
+            setattr(record, attribute, data[key])
+        return record
+
+    @classmethod
+    def parse(cls, data):
+        """
+        Parse raw api data into a record.
+
+        :param dict data: raw api data for one record
+        :returns: record
+        """
+
+        return cls.from_dict(cls.SPEC.parse(data))
+
+    @classmethod
+    def parse_many(cls, data):
+        """
+        Parse list of raw api data into records.
+
+        :param list data: list of raw api data
+        :returns: list of records
+        :rtype: list
+        """
+
+        return [cls.from_dict(record) for record in cls.SPEC.parse_many(data)]
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, self.ATTRIBUTES[key])
+        except KeyError:
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        return key in self.ATTRIBUTES
+
+    def __iter__(self):
+        return iter(self.FIELDS)
+
+    def __len__(self):
+        return len(self.FIELDS)
+
+    def __eq__(self, other):
+        if isinstance(other, (Record, dict)):
+            return dict(self) == dict(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return '{}({})'.format(type(self).__name__,
+                               ', '.join('{}={!r}'.format(key, self[key]) for key in self.FIELDS))
+
+    def keys(self):
+        return list(self.FIELDS)
+
+    def values(self):
+        return [self[key] for key in self.FIELDS]
+
+    def items(self):
+        return [(key, self[key]) for key in self.FIELDS]
+
+    def get(self, key, default=None):
+        return self[key] if key in self.ATTRIBUTES else default
+
+    def to_dict(self):
+        """
+        Convert record to dict (same as parsed dict).
+
+        :returns: parsed data
+        :rtype: dict
+        """
+
+        return dict(self.items())
+
+class Ad(Record):
+    """
+    Ad record (see ``parsers.parse_ad``).
+    """
+
+    SPEC = AD_SPEC
+    FIELDS = SPEC.keys()
+    __slots__ = FIELDS
+
+class Trade(Record):
+    """
+    Trade record (see ``parsers.parse_trade``).
+    """
+
+    SPEC = TRADE_SPEC
+    FIELDS = SPEC.keys()
+    __slots__ = FIELDS
+
+class Transaction(Record):
+    """
+    Transaction record (see ``parsers.parse_transaction``),
+    ``from`` key is ``from_`` attribute.
+    """
+
+    SPEC = TRANSACTION_SPEC
+    FIELDS = SPEC.keys()
+    __slots__ = ('transaction_type', 'amount', 'currency', 'timestamp', 'from_', 'to')
+
+class WalletEntry(Record):
+    """
+    Wallet (one currency) record (see ``parsers.parse_wallet``).
+    """
+
+    SPEC = WALLET_SPEC
+    FIELDS = SPEC.keys()
+    __slots__ = FIELDS
@@ -0,0 +1,92 @@
+'''
+Retry policy for failed requests (connection errors, timeouts, 5xx responses).
+'''
+
+import random
+import time
+
+class RetryPolicy:
+    """
+    Retry policy used by client requests (``Client(token, retry=RetryPolicy())``).
+
+    A request is retried after a connection error, a timeout or a response
+    with a retryable status code, but only for idempotent methods (POST is
+    never retried by default and withdrawals are never retried). Requests are
+    retried one by one, so a paginated ``get_all`` request resumes from the
+    failed page.
+
+    Delay before n-th retry is ``backoff_factor * 2 ** (n - 1)`` seconds (up
+    to ``max_backoff``), with full jitter (random delay between 0 and that
+    value) if ``jitter`` is set. ``Retry-After`` header of the response is
+    used instead, if available.
+
+    :param int max_attempts: max number of attempts, including the first one (default 3)
+    :param float backoff_factor: base delay in seconds (default 0.5)
+    :param float max_backoff: max delay in seconds (default 30)
+    :param bool jitter: randomize delays (default True)
+    :param tuple status_codes: retryable response status codes
+                               (default 429, 500, 502, 503, 504)
+    :param tuple methods: retryable request methods
+                          (default get, head, options, put, delete)
+    """
+
+    def __init__(self,
+                 max_attempts=3,
+                 backoff_factor=0.5,
+                 max_backoff=30,
+                 jitter=True,
+                 status_codes=(429, 500, 502, 503, 504),
+                 methods=('get', 'head', 'options', 'put', 'delete')):
+        self.max_attempts = max_attempts
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.status_codes = status_codes
+        self.methods = [method.lower() for method in methods]
+
+    def should_retry(self, method, attempt, response=None):
+        """
+        Check if request should be retried.
+
+        :param str method: request method
+        :param int attempt: number of failed attempts so far
+        :param response: failed response (None for connection errors/timeouts)
+        :returns: True if request should be retried
+        :rtype: bool
+        """
+
+        if attempt >= self.max_attempts or method.lower() not in self.methods:
+            return False
+        return response is None or response.status_code in self.status_codes
+
+    def get_delay(self, attempt, response=None):
+        """
+        Get delay before next attempt.
+
+        :param int attempt: number of failed attempts so far
+        :param response: failed response (None for connection errors/timeouts)
+        :returns: delay in seconds
+        :rtype: float
+        """
+
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after:
+            try:
+                return min(float(retry_after), self.max_backoff)
+            except ValueError:
+                # http-date values are not supported, use backoff instead
+                pass
+
+        delay = min(self.backoff_factor * 2 ** (attempt - 1), self.max_backoff)
+        return random.uniform(0, delay) if self.jitter else delay
+
+    def wait(self, attempt, response=None):
+        """
+        Sleep before next attempt (see ``get_delay``).
+
+        :param int attempt: number of failed attempts so far
+        :param response: failed response (None for connection errors/timeouts)
+        :returns: None
+        """
+
+        time.sleep(self.get_delay(attempt, response))
@@ -0,0 +1,201 @@
+'''
+Declarative parser specs (output key, source path, converter) compiled to parsers.
+'''
+
+import threading
+
+from .exceptions import LocalcoinswapInvalidParamError
+
+class Field:
+    """
+    Parsed field: output key, path of keys in raw record and optional
+    converter of the value (e.g. ``float``).
+
+    .. code-block:: python
+
+        Field('created_by_username', ('created_by', 'username'))
+        Field('current_price', ('current_price',), float)
+        # empty path: converter gets the whole raw record
+        Field('limits', (), lambda ad: '{min_fiat_limit}-{max_fiat_limit}'.format(**ad))
+
+    :param str key: output key
+    :param tuple path: keys (str or int) of value in raw record
+    :param converter: function applied to the value (default None)
+    """
+
+    __slots__ = ('key', 'path', 'converter')
+
+    def __init__(self, key, path, converter=None):
+        if isinstance(path, (str, int)):
+            path = (path,)
+        for part in path:
+            if not isinstance(part, (str, int)):
+                raise LocalcoinswapInvalidParamError('Invalid path key {!r}'.format(part))
+        self.key = key
+        self.path = tuple(path)
+        self.converter = converter
+
+    def __repr__(self):
+        return 'Field({!r}, {!r}, {!r})'.format(self.key, self.path, self.converter)
+
+class Spec:
+    """
+    Parser spec, list of ``Field`` compiled to parser functions.
+
+    Spec is compiled once (for each selection of fields) into generated code
+    with the same dict literal and nested lookups as a hand-written parser,
+    so there is no per-field overhead of calling getters.
+
+    .. code-block:: python
+
+        spec = Spec([Field('uuid', 'uuid'),
+                     Field('price', 'current_price', float),
+                     Field('seller', ('created_by', 'username'))])
+        spec.parse(ad)   # {'uuid': ..., 'price': ..., 'seller': ...}
+        spec.parse_many(ads, fields=['uuid', 'price'])
+
+    :param list fields: list of ``Field``
+    """
+
+    def __init__(self, fields):
+        self.fields = list(fields)
+        self.by_key = {field.key: field for field in self.fields}
+        # compiled (parse, parse_many) functions by selected keys
+        self.compiled = {}
+        self.lock = threading.Lock()
+
+    def __repr__(self):
+        return 'Spec({!r})'.format(self.fields)
+
+    def keys(self):
+        """
+        Output keys of all fields.
+
+        :returns: tuple of keys
+        :rtype: tuple
+        """
+
+        return tuple(self.by_key)
+
+    def extend(self, fields):
+        """
+        New spec with additional fields (fields with existing keys replace them).
+
+        :param list fields: list of ``Field``
+        :returns: new spec
+        :rtype: Spec
+        """
+
+        fields = list(fields)
+        keys = {field.key for field in fields}
+        return Spec([field for field in self.fields if field.key not in keys] + fields)
+
+    def compile(self, fields=None):
+        """
+        Compile parser functions for selected fields (compiled once,
+        then reused).
+
+        :param list fields: selected output keys (default None - all fields)
+        :returns: tuple of parser of one raw record and parser of a list of raw records
+        :rtype: tuple
+
+        :raises: LocalcoinswapInvalidParamError (unknown field)
+        """
+
+        keys = self.keys() if fields is None else tuple(fields)
+        compiled = self.compiled.get(keys)
+        if compiled is None:
+            with self.lock:
+                compiled = self.compiled.get(keys)
+                if compiled is None:
+                    compiled = self.compiled[keys] = compile_fields(self.select(keys))
+        return compiled
+
+    # Fields for output keys
+    def select(self, keys):
+        try:
+            return [self.by_key[key] for key in keys]
+        except KeyError as e:
+            raise LocalcoinswapInvalidParamError('Invalid field \'{}\''.format(e.args[0]))
+
+    def parse(self, data, fields=None):
+        """
+        Parse one raw record.
+
+        :param dict data: raw record
+        :param list fields: selected output keys (default None - all fields)
+        :returns: parsed record
+        :rtype: dict
+        """
+
+        return self.compile(fields)[0](data)
+
+    def parse_many(self, data, fields=None):
+        """
+        Parse list of raw records.
+
+        :param list data: raw records
+        :param list fields: selected output keys (default None - all fields)
+        :returns: list of parsed records
+        :rtype: list
+        """
+
+        return self.compile(fields)[1](data)
+
+# Registered specs by name
+SPECS = {}
+
+def register_spec(name, spec):
+    """
+    Register spec by name. Specs registered with names of built-in specs
+    (``'ad'``, ``'trade'``, ``'transaction'``, ``'wallet'``,
+    ``'deposit_address'``, ``'start_trade'``) replace them in parsers
+    (and client results, except ``records`` which are always parsed with
+    built-in specs, see ``records.Record``):
+
+    .. code-block:: python
+
+        from localcoinswap.parsers import AD_SPEC
+
+        register_spec('ad', AD_SPEC.extend([Field('created_by_id', ('created_by', 'id'))]))
+
+    :param str name: spec name
+    :param Spec spec: spec
+    :returns: None
+    """
+
+    SPECS[name] = spec
+
+def get_spec(name):
+    """
+    Get registered spec.
+
+    :param str name: spec name
+    :returns: spec
+    :rtype: Spec
+
+    :raises: LocalcoinswapInvalidParamError (spec is not registered)
+    """
+
+    try:
+        return SPECS[name]
+    except KeyError:
+        raise LocalcoinswapInvalidParamError('Invalid spec \'{}\''.format(name))
+
+# Generate parser functions (one record, list of records) from fields
+def compile_fields(fields):
+    namespace = {}
+    items = []
+    for i, field in enumerate(fields):
+        expression = 'r' + ''.join('[{!r}]'.format(part) for part in field.path)
+        if field.converter is not None:
+            namespace['c{}'.format(i)] = field.converter
+            expression = 'c{}({})'.format(i, expression)
+        items.append('{!r}: {}'.format(field.key, expression))
+    record = '{{{}}}'.format(', '.join(items))
+    source = ('def parse(r):\n'
+              '    return {0}\n'
+              'def parse_many(records):\n'
+              '    return [{0} for r in records]\n').format(record)
+    exec(compile(source, '<spec>', 'exec'), namespace)
+    return namespace['parse'], namespace['parse_many']
@@ -0,0 +1,177 @@
+'''
+Incremental parsing of paginated json responses (results as they arrive).
+'''
+
+import codecs
+import json
+
+from .exceptions import LocalcoinswapResponseException
+
+WHITESPACE = ' \t\r\n'
+
+class Reader:
+    """
+    Reader of json values from chunks of bytes (e.g. ``response.iter_content()``).
+
+    Values are decoded with ``json.JSONDecoder.raw_decode`` (C decoder) directly
+    from the buffer. A value that isn't complete yet is decoded again when
+    the next chunk arrives, so only values split between chunks are decoded
+    more than once.
+
+    :param chunks: iterable of bytes
+    """
+
+    decoder = json.JSONDecoder()
+
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.text_decoder = codecs.getincrementaldecoder('utf-8')()
+        self.buffer = ''
+        self.pos = 0
+        self.finished = False
+
+    # Read next chunk, returns False if response ended
+    def fill(self):
+        if not self.finished:
+            for chunk in self.chunks:
+                text = self.text_decoder.decode(chunk)
+                if text:
+                    self.buffer += text
+                    return True
+            self.buffer += self.text_decoder.decode(b'', final=True)
+            self.finished = True
+        return False
+
+    # Drop already read text from buffer (if it's at least half of the buffer,
+    # so the rest isn't copied after each value)
+    def compact(self):
+        if self.pos * 2 >= len(self.buffer):
+            self.buffer = self.buffer[self.pos:]
+            self.pos = 0
+
+    def next_char(self):
+        """
+        Read next non-whitespace character.
+
+        :returns: character
+        :rtype: str
+
+        :raises: LocalcoinswapResponseException
+        """
+
+        char = self.peek()
+        self.pos += 1
+        return char
+
+    def peek(self):
+        """
+        Next non-whitespace character (without reading it).
+
+        :returns: character
+        :rtype: str
+
+        :raises: LocalcoinswapResponseException
+        """
+
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                raise LocalcoinswapResponseException('Incomplete json response')
+
+    def expect(self, char):
+        """
+        Read next non-whitespace character, which must be ``char``.
+
+        :param str char: expected character
+        :returns: None
+
+        :raises: LocalcoinswapResponseException
+        """
+
+        found = self.next_char()
+        if found != char:
+            raise LocalcoinswapResponseException(
+                'Invalid json response: expected {!r}, found {!r}'.format(char, found))
+
+    def read_value(self):
+        """
+        Read and decode next json value.
+
+        :returns: decoded value
+
+        :raises: LocalcoinswapResponseException
+        """
+
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except ValueError as e:
+                # incomplete value (or invalid json if response ended)
+                if not self.fill():
+                    raise LocalcoinswapResponseException('Response is not json: {}'.format(e))
+                continue
+            # value at the end of buffer could continue in next chunk (e.g. number)
+            if end == len(self.buffer) and self.fill():
+                continue
+            self.pos = end
+            return value
+
+def iter_results(chunks, page, key='results'):
+    """
+    Iterate over elements of ``results`` array of a json object (api page)
+    while the response is being received. Each element is decoded as soon
+    as all its bytes have arrived, so neither the whole response nor all
+    decoded results are held in memory.
+
+    Other values of the object (``count``, ``next``, ...) are added to ``page``
+    (complete when iteration is finished).
+
+    .. code-block:: python
+
+        page = {}
+        for result in iter_results(response.iter_content(65536), page):
+            ...
+        next_page_url = page['next']
+
+    :param chunks: iterable of bytes (e.g. ``response.iter_content()``)
+    :param dict page: dict for other values of the page
+    :param str key: key of results array (default 'results')
+    :returns: generator of decoded results
+    :rtype: generator
+
+    :raises: LocalcoinswapResponseException
+    """
+
+    reader = Reader(chunks)
+    reader.expect('{')
+    if reader.peek() == '}':
+        return
+    while True:
+        name = reader.read_value()
+        reader.expect(':')
+        if name == key and reader.peek() == '[':
+            reader.expect('[')
+            if reader.peek() == ']':
+                reader.pos += 1
+            else:
+                while True:
+                    yield reader.read_value()
+                    reader.compact()
+                    char = reader.next_char()
+                    if char == ']':
+                        break
+                    if char != ',':
+                        raise LocalcoinswapResponseException(
+                            'Invalid json response: unexpected {!r}'.format(char))
+        else:
+            page[name] = reader.read_value()
+        char = reader.next_char()
+        if char == '}':
+            return
+        if char != ',':
+            raise LocalcoinswapResponseException(
+                'Invalid json response: unexpected {!r}'.format(char))
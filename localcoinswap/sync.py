@@ -0,0 +1,221 @@
+'''
+Incremental sync of wallet transactions into a local SQLite database.
+'''
+
+import sqlite3
+from collections import Counter
+
+from .exceptions import LocalcoinswapResponseException
+from .parsers import parse_transactions
+
+# Number of times pages are requested if history changes during sync
+SYNC_ATTEMPTS = 3
+
+# Stored transaction keys (see 'parsers.parse_transaction') and columns
+KEYS = ('transaction_type', 'amount', 'currency', 'timestamp', 'from', 'to')
+COLUMNS = ', '.join('"{}"'.format(key) for key in KEYS)
+
+class TransactionSync:
+    """
+    Local SQLite copy of wallet transactions (see ``client.get_transactions``).
+
+    ``sync`` requests only transactions that were added since the last sync,
+    so transactions can be queried locally (``query``, ``count``) without
+    requesting the whole history every time:
+
+    .. code-block:: python
+
+        with TransactionSync(client, 'transactions.db') as transactions:
+            transactions.sync()
+            fees = transactions.query(transaction_type='contract_fees', since=1557000000)
+
+    Api returns newest transactions first, so new transactions are at the
+    start of the history. High-water mark is the timestamp of the latest synced
+    transaction: pages (``page_size`` transactions per page) are requested until
+    a transaction older than the high-water mark is reached. Transactions newer
+    than the high-water mark are added, and transactions at the high-water mark
+    only if there are more of them than already synced (transactions have no
+    ids, so identical transactions are counted).
+
+    If api ``count`` changes between pages (history changed during sync),
+    pages are requested again from the first one (up to ``SYNC_ATTEMPTS``
+    times). Api ``count`` is also a sanity check: if synced transactions
+    wouldn't match it, all transactions are synced again.
+
+    Transactions are stored with the same keys as ``parsers.parse_transaction``
+    and indexed by timestamp, currency and transaction type.
+
+    :param client: api client (``client.Client``)
+    :param str path: database file path (default ':memory:')
+    :param int page_size: number of transactions per request (default 100)
+    :param int timeout: request timeout (default 10 seconds)
+    """
+
+    def __init__(self, client, path=':memory:', page_size=100, timeout=10):
+        self.client = client
+        self.page_size = page_size
+        self.timeout = timeout
+        self.connection = sqlite3.connect(path)
+        self.connection.row_factory = sqlite3.Row
+        with self.connection:
+            self.connection.executescript('''
+                CREATE TABLE IF NOT EXISTS transactions (
+                    id INTEGER PRIMARY KEY,
+                    transaction_type TEXT NOT NULL,
+                    amount TEXT NOT NULL,
+                    currency TEXT NOT NULL,
+                    timestamp INTEGER NOT NULL,
+                    "from" TEXT NOT NULL,
+                    "to" TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS transactions_timestamp ON transactions (timestamp);
+                CREATE INDEX IF NOT EXISTS transactions_currency
+                    ON transactions (currency, timestamp);
+                CREATE INDEX IF NOT EXISTS transactions_type
+                    ON transactions (transaction_type, timestamp);
+                CREATE TABLE IF NOT EXISTS sync (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    synced INTEGER NOT NULL,
+                    latest_timestamp INTEGER
+                );
+                INSERT OR IGNORE INTO sync (id, synced) VALUES (1, 0);
+            ''')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """
+        Close database connection.
+
+        :returns: None
+        """
+
+        self.connection.close()
+
+    def high_water_mark(self):
+        """
+        Number of synced transactions and timestamp of the latest one.
+
+        :returns: tuple of count and timestamp (None if nothing is synced)
+        :rtype: tuple
+        """
+
+        row = self.connection.execute('SELECT synced, latest_timestamp FROM sync').fetchone()
+        return row['synced'], row['latest_timestamp']
+
+    def sync(self):
+        """
+        Request new transactions (since last sync) and store them.
+
+        :returns: number of new transactions
+        :rtype: int
+
+        :raises: LocalcoinswapAPIException, LocalcoinswapResponseException
+        """
+
+        synced, latest_timestamp = self.high_water_mark()
+        if latest_timestamp is not None:
+            count, transactions = self.request_transactions(latest_timestamp)
+            new = self.new_transactions(transactions, latest_timestamp)
+            if synced + len(new) == count:
+                self.store(new)
+                return len(new)
+
+        count, transactions = self.request_transactions()
+        self.store(transactions, full=True)
+        return max(len(transactions) - synced, 0)
+
+    # Api count and transactions (newest first) from first page until a transaction
+    # older than since (all transactions if since is None). Pages are requested
+    # again if count changes between pages
+    def request_transactions(self, since=None):
+        for attempt in range(SYNC_ATTEMPTS):
+            url = self.client.create_api_url('wallet/transactions/?limit={}&offset=0'.format(
+                self.page_size))
+            count, transactions = None, []
+            while url:
+                results, url, page_count, total_pages = self.client.request_page(url,
+                                                                                 self.timeout,
+                                                                                 True)
+                if count is not None and page_count != count:
+                    break
+                count = page_count
+                transactions += parse_transactions(results)
+                if since is not None and transactions and transactions[-1]['timestamp'] < since:
+                    return count, [t for t in transactions if t['timestamp'] >= since]
+            else:
+                return count, transactions
+        raise LocalcoinswapResponseException('Transaction history changed during sync')
+
+    # Transactions newer than since, and transactions at since
+    # that are not stored yet (identical transactions are counted)
+    def new_transactions(self, transactions, since):
+        stored = Counter(tuple(row) for row in self.connection.execute(
+            'SELECT {} FROM transactions WHERE timestamp = ?'.format(COLUMNS), (since,)))
+        new = []
+        for transaction in transactions:
+            if transaction['timestamp'] == since:
+                key = tuple(transaction[column] for column in KEYS)
+                if stored[key]:
+                    stored[key] -= 1
+                    continue
+            new.append(transaction)
+        return new
+
+    # Store transactions (newest first), replacing all stored transactions if full=True
+    def store(self, transactions, full=False):
+        with self.connection:
+            if full:
+                self.connection.execute('DELETE FROM transactions')
+            # oldest first, so ids follow history
+            self.connection.executemany(
+                'INSERT INTO transactions ({}) VALUES (?, ?, ?, ?, ?, ?)'.format(COLUMNS),
+                [tuple(t[column] for column in KEYS) for t in reversed(transactions)])
+            self.connection.execute(
+                'UPDATE sync SET synced = (SELECT COUNT(*) FROM transactions), '
+                'latest_timestamp = (SELECT MAX(timestamp) FROM transactions)')
+
+    # WHERE clause and parameters for query filters
+    def where(self, currency, transaction_type, since, until):
+        conditions, params = [], []
+        for condition, value in (('currency = ?', currency),
+                                 ('transaction_type = ?', transaction_type),
+                                 ('timestamp >= ?', since),
+                                 ('timestamp < ?', until)):
+            if value is not None:
+                conditions.append(condition)
+                params.append(value)
+        return ' WHERE ' + ' AND '.join(conditions) if conditions else '', params
+
+    def query(self, currency=None, transaction_type=None, since=None, until=None):
+        """
+        Synced transactions (oldest first) with optional filters.
+
+        :param str currency: currency symbol (e.g. 'BTC')
+        :param str transaction_type: transaction type (e.g. 'contract_fees')
+        :param int since: min timestamp (inclusive)
+        :param int until: max timestamp (exclusive)
+        :returns: list of transactions (see ``client.get_transactions``)
+        :rtype: list
+        """
+
+        where, params = self.where(currency, transaction_type, since, until)
+        rows = self.connection.execute(
+            'SELECT {} FROM transactions{} ORDER BY timestamp, id'.format(COLUMNS, where), params)
+        return [dict(row) for row in rows]
+
+    def count(self, currency=None, transaction_type=None, since=None, until=None):
+        """
+        Number of synced transactions with optional filters (see ``query``).
+
+        :returns: number of transactions
+        :rtype: int
+        """
+
+        where, params = self.where(currency, transaction_type, since, until)
+        return self.connection.execute(
+            'SELECT COUNT(*) FROM transactions{}'.format(where), params).fetchone()[0]
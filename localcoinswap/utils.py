@@ -1,5 +1,118 @@
 from .exceptions import LocalcoinswapInvalidParamError
 
+'''
+Trade params lookup index
+'''
+
+class TradeParamsIndex:
+    """
+    Lookup tables for trade params (ids by id, name, title, symbol, etc.).
+
+    Tables are built once, so converting user input to ids (e.g. crypto
+    currency symbol to id) is a single dict lookup. Names are matched
+    case insensitively, as in util functions below.
+
+    Available params (keys):
+
+    - crypto_currencies (by id, title or symbol)
+    - fiat_currencies (by id, title or symbol)
+    - payment_methods (by id or name)
+    - trade_types (by id, name or action name)
+
+    :param dict trade_params: trade params from client (see
+                              ``client.get_trade_params``)
+    """
+
+    # trade params key: (name used in errors, keys with names to match)
+    LOOKUPS = {
+        'crypto_currencies': ('crypto currency', ('title', 'symbol')),
+        'fiat_currencies': ('fiat currency', ('title', 'symbol')),
+        'payment_methods': ('payment method', ('name',)),
+        'trade_types': ('trade type', ('name', 'action_name')),
+    }
+
+    def __init__(self, trade_params):
+        self.tables = {}
+        for key, (_, names) in self.LOOKUPS.items():
+            if trade_params and key in trade_params:
+                table = {}
+                # first param with a matching id/name wins (same as linear search)
+                for param in trade_params[key]:
+                    table.setdefault(str(param['id']), param['id'])
+                    for name in names:
+                        table.setdefault(param[name].casefold(), param['id'])
+                self.tables[key] = table
+
+    def get_id(self, key, value):
+        """
+        Find id of trade param by id or name.
+
+        :param str key: trade params key (e.g. 'fiat_currencies')
+        :param int/str value: id or name (see above)
+        :returns: id
+        :rtype: int
+
+        :raises: LocalcoinswapInvalidParamError
+
+        """
+
+        # if trade_params are not set up/passed, this fails
+        if key not in self.tables:
+            raise LocalcoinswapInvalidParamError('trade_params are not set up')
+        try:
+            return self.tables[key][str(value).casefold()]
+        except KeyError:
+            raise LocalcoinswapInvalidParamError('Invalid {} \'{}\''.format(self.LOOKUPS[key][0],
+                                                                            value))
+
+    def get_ids(self, key, values):
+        """
+        Find ids of multiple trade params by id or name (see ``get_id``).
+
+        :param str key: trade params key (e.g. 'fiat_currencies')
+        :param list values: list of ids or names
+        :returns: list of ids (same order as values)
+        :rtype: list
+
+        :raises: LocalcoinswapInvalidParamError
+
+        """
+
+        return [self.get_id(key, value) for value in values]
+
+class TradeParams(dict):
+    """
+    Trade params (dict, see ``client.get_trade_params``) with
+    a prebuilt lookup index (``index``, see ``TradeParamsIndex``).
+
+    Client sets its trade params as ``TradeParams``, so util functions
+    below don't have to search trade params lists on every call.
+    Index isn't updated if trade params are modified afterwards.
+
+    :param dict trade_params: trade params from client
+    """
+
+    def __init__(self, trade_params):
+        super().__init__(trade_params)
+        self.index = TradeParamsIndex(self)
+
+# Finds id of trade param by id or name (see ``TradeParamsIndex.get_id``)
+# with prebuilt index of client trade params. Other (e.g. plain dict) trade
+# params are searched linearly, as building an index for one lookup is slower
+def find_id(trade_params, key, value):
+    if isinstance(trade_params, TradeParams):
+        return trade_params.index.get_id(key, value)
+
+    # if trade_params are not set up/passed, this fails
+    if not (trade_params and key in trade_params):
+        raise LocalcoinswapInvalidParamError('trade_params are not set up')
+    error_name, names = TradeParamsIndex.LOOKUPS[key]
+    folded = str(value).casefold()
+    for param in trade_params[key]:
+        if folded == str(param['id']) or any(folded == param[name].casefold() for name in names):
+            return param['id']
+    raise LocalcoinswapInvalidParamError('Invalid {} \'{}\''.format(error_name, value))
+
 '''
 Util functions (various type/name converts)
 '''
@@ -20,13 +133,7 @@ def get_crypto_currency_id(trade_params, currency):
 
     """
 
-    # if trade_params are not set up/passed, this fails
-    if trade_params and 'crypto_currencies' in trade_params:
-        for c in trade_params['crypto_currencies']:
-            if str(currency) == str(c['id']) or str(currency).lower() in [c['title'].lower(), c['symbol'].lower()]:
-                return c['id']
-        raise LocalcoinswapInvalidParamError('Invalid crypto currency \'{}\''.format(currency))
-    raise LocalcoinswapInvalidParamError('trade_params are not set up')
+    return find_id(trade_params, 'crypto_currencies', currency)
 
 def get_fiat_currency_id(trade_params, currency):
     """
@@ -44,13 +151,7 @@ def get_fiat_currency_id(trade_params, currency):
 
     """
 
-    # if trade_params are not set up/passed, this fails
-    if trade_params and 'fiat_currencies' in trade_params:
-        for c in trade_params['fiat_currencies']:
-            if str(currency) == str(c['id']) or str(currency).lower() in [c['title'].lower(), c['symbol'].lower()]:
-                return c['id']
-        raise LocalcoinswapInvalidParamError('Invalid fiat currency \'{}\''.format(currency))
-    raise LocalcoinswapInvalidParamError('trade_params are not set up')
+    return find_id(trade_params, 'fiat_currencies', currency)
 
 def get_payment_method_id(trade_params, method):
     """
@@ -66,12 +167,7 @@ def get_payment_method_id(trade_params, method):
 
     """
 
-    if trade_params and 'payment_methods' in trade_params:
-        for pm in trade_params['payment_methods']:
-            if str(method) == str(pm['id']) or str(method).lower() == pm['name'].lower():
-                return pm['id']
-        raise LocalcoinswapInvalidParamError('Invalid payment method \'{}\''.format(method))
-    raise LocalcoinswapInvalidParamError('trade_params are not set up')
+    return find_id(trade_params, 'payment_methods', method)
 
 def get_trade_type_id(trade_params, trade_type):
     """
@@ -87,9 +183,4 @@ def get_trade_type_id(trade_params, trade_type):
 
     """
 
-    if trade_params and 'trade_types' in trade_params:
-        for t in trade_params['trade_types']:
-            if str(trade_type) == str(t['id']) or str(trade_type).lower() in [t['name'].lower(), t['action_name'].lower()]:
-                return t['id']
-        raise LocalcoinswapInvalidParamError('Invalid trade type \'{}\''.format(trade_type))
-    raise LocalcoinswapInvalidParamError('trade_params are not set up')
+    return find_id(trade_params, 'trade_types', trade_type)
@@ -0,0 +1,183 @@
+'''
+Polling of trade statuses with callbacks on status changes.
+'''
+
+import threading
+import time
+
+import requests
+
+from .exceptions import LocalcoinswapAPIException, LocalcoinswapResponseException
+
+# Errors reported to 'on_error' callbacks instead of stopping the watcher
+API_ERRORS = (LocalcoinswapAPIException, LocalcoinswapResponseException, requests.RequestException)
+
+class TradeWatcher:
+    """
+    Watcher of your trades, which polls active trades and calls
+    ``on_status_change`` callbacks when a trade is started or its status
+    changes (e.g. ACCEPTED, FUND_PAID, FUND_RECEIVED):
+
+    .. code-block:: python
+
+        watcher = TradeWatcher(client)
+
+        @watcher.on_status_change
+        def status_changed(trade, old_status):
+            print(trade['uuid'], old_status, '->', trade['status'])
+
+        watcher.run()   # until watcher.stop() is called (e.g. from a callback)
+
+    Trades are compared by uuid with the previous poll. Trades that are no
+    longer active are requested with ``client.get_trade`` to get their final
+    status (bypassing client ``response_cache``). If that request fails
+    (e.g. trade doesn't exist anymore), the trade is dropped and the error
+    is passed to ``on_error`` callbacks. First poll only records current
+    statuses (no callbacks).
+
+    ``run`` doesn't stop on API errors (e.g. a temporary network error):
+    they're passed to ``on_error`` callbacks and polling continues after
+    the interval (increased as after a poll without changes). Errors raised
+    by callbacks stop ``run``.
+
+    Polling interval adapts to activity: it's reset to ``min_interval``
+    after a change and multiplied by ``backoff`` after each poll without
+    changes (up to ``max_interval``). It's also never longer than half the
+    time left until the nearest ``time_of_expiry`` of an active trade,
+    so trades about to expire are polled more often.
+
+    :param client: api client (``client.Client``)
+    :param float min_interval: min seconds between polls (default 2)
+    :param float max_interval: max seconds between polls (default 60)
+    :param float backoff: interval multiplier after polls without changes (default 2)
+    :param int limit: number of trades per page (default 100)
+    :param int timeout: request timeout (default 10 seconds)
+    """
+
+    def __init__(self, client, min_interval=2, max_interval=60, backoff=2, limit=100,
+                 timeout=10):
+        self.client = client
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.limit = limit
+        self.timeout = timeout
+        self.interval = min_interval
+        self.callbacks = []
+        self.error_callbacks = []
+        # active trades by uuid (None before first poll)
+        self.trades = None
+        self.stopped = threading.Event()
+
+    def on_status_change(self, callback):
+        """
+        Add callback called as ``callback(trade, old_status)`` for each status
+        change (``old_status`` is None for new trades). Can be used as a decorator.
+
+        :param callback: callable
+        :returns: callback
+        """
+
+        self.callbacks.append(callback)
+        return callback
+
+    def on_error(self, callback):
+        """
+        Add callback called as ``callback(uuid, error)`` for API errors
+        (``uuid`` of the trade whose final status request failed, or None
+        if active trades request failed in ``run``). Can be used as a decorator.
+
+        :param callback: callable
+        :returns: callback
+        """
+
+        self.error_callbacks.append(callback)
+        return callback
+
+    def poll(self):
+        """
+        Request active trades, call callbacks for status changes
+        and update polling interval. Errors of final status requests
+        are passed to ``on_error`` callbacks.
+
+        :returns: list of (trade, old status) tuples
+        :rtype: list
+
+        :raises: LocalcoinswapAPIException, LocalcoinswapResponseException
+        """
+
+        active = self.client.get_trades('active', self.limit, True, self.timeout)['results']
+        trades = {trade['uuid']: trade for trade in active}
+        previous, self.trades = self.trades, trades
+        changes, errors = [], []
+        if previous is not None:
+            for uuid, trade in trades.items():
+                old = previous.get(uuid)
+                if old is None or old['status'] != trade['status']:
+                    changes.append((trade, old and old['status']))
+            for uuid, old in previous.items():
+                if uuid not in trades:
+                    try:
+                        trade = self.get_final_trade(uuid)
+                    except API_ERRORS as e:
+                        errors.append((uuid, e))
+                        continue
+                    if trade['status'] != old['status']:
+                        changes.append((trade, old['status']))
+
+        self.update_interval(bool(changes))
+        for uuid, error in errors:
+            self.report_error(uuid, error)
+        for trade, old_status in changes:
+            for callback in self.callbacks:
+                callback(trade, old_status)
+        return changes
+
+    # Trade that is no longer active, requested bypassing client response cache
+    def get_final_trade(self, uuid):
+        self.client.invalidate_cache('contracts/{}/'.format(uuid))
+        return self.client.get_trade(uuid)
+
+    # Call 'on_error' callbacks
+    def report_error(self, uuid, error):
+        for callback in self.error_callbacks:
+            callback(uuid, error)
+
+    # Next polling interval from activity and nearest expiry of active trades
+    def update_interval(self, changed):
+        if changed:
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.interval * self.backoff, self.max_interval)
+        expiries = [trade['time_of_expiry'] for trade in (self.trades or {}).values()
+                    if trade['time_of_expiry'] is not None]
+        if expiries:
+            left = min(expiries) - time.time()
+            if left > 0:
+                self.interval = min(self.interval, max(self.min_interval, left / 2))
+
+    def run(self):
+        """
+        Poll until ``stop`` is called. API errors are passed to ``on_error``
+        callbacks and polling continues.
+
+        :returns: None
+        """
+
+        self.stopped.clear()
+        while not self.stopped.is_set():
+            try:
+                self.poll()
+            except API_ERRORS as e:
+                self.update_interval(False)
+                self.report_error(None, e)
+            self.stopped.wait(self.interval)
+
+    def stop(self):
+        """
+        Stop ``run`` (from a callback or another thread).
+
+        :returns: None
+        """
+
+        self.stopped.set()
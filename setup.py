@@ -10,6 +10,7 @@ setup(
     author='LocalCoinSwap',
     license='MIT',
     install_requires=['requests'],
+    extras_require={'async': ['aiohttp'], 'orjson': ['orjson']},
     classifiers=[
         'Programming Language :: Python :: 3',
         'Operating System :: OS Independent',
@@ -47,3 +47,99 @@ trade_params = {
     ]
 }
 
+
+ad = {
+    'uuid': 'dc01xxxx-xxxx-xxxx-xxxx-xxxxxxxxxxxx',
+    'trading_type': {'id': 1, 'name': 'buy', 'action_name': 'Buying'},
+    'payment_method': {'id': 3, 'name': 'Cash in person'},
+    'coin_currency': {'id': 2, 'title': 'Ethereum', 'symbol': 'ETH'},
+    'fiat_currency': {'id': 10001, 'title': 'United States Dollar', 'symbol': 'USD'},
+    'current_price': '250.5000000000',
+    'price_formula': {'display_formula': '-1', 'pricing_type': 'MARGIN'},
+    'photo_id_required': False,
+    'sms_required': False,
+    'only_friends': False,
+    'trading_hours': 'Mon - Sun: Trading all day<br />',
+    'trading_hours_localised': 'Mon - Sun: Trading all day<br />',
+    'is_active': True,
+    'is_available': True,
+    'minimum_feedback': '0',
+    'automatic_cancel_time': '120',
+    'liqudity_tracking': False,
+    'location_name': 'Toledo',
+    'country_code': 'ES',
+    'trading_conditions': '',
+    'enforced_sizes': '',
+    'min_trade_size': '1.00',
+    'max_trade_size': '1000.00',
+    'min_fiat_limit': '1.00',
+    'max_fiat_limit': '1000.00',
+    'created_by': {
+        'username': 'user1',
+        'activity_status': 'active',
+        'avg_response_time': 507,
+        'languages': [],
+        'ratings': None,
+        'ratings_percentage': None
+    }
+}
+
+trade = {
+    'id': 321,
+    'status': 'CREATED',
+    'uuid': '6a83xxxx-xxxx-xxxx-xxxx-xxxxxxxxxxxx',
+    'contract_responder': {'username': 'user2'},
+    'fiat_amount': '25.00',
+    'coin_amount': '0.1000000000',
+    'fiat_currency': {'id': 10001, 'title': 'United States Dollar', 'symbol': 'USD'},
+    'time_of_expiry': 1557345712,
+    'ad': {
+        'uuid': 'dc01xxxx-xxxx-xxxx-xxxx-xxxxxxxxxxxx',
+        'coin_currency': {'id': 2, 'title': 'Ethereum', 'symbol': 'ETH'},
+        'country_code': 'ES',
+        'location_name': 'Toledo',
+        'created_by': {'username': 'user1'},
+        'payment_method': {'id': 3, 'name': 'Cash in person'}
+    }
+}
+
+transaction = {
+    'transaction_type': 'contract_fees',
+    'amount': '-0.000100000000000000',
+    'currency': {'id': 2, 'title': 'Ethereum', 'symbol': 'ETH'},
+    'timestamp': 1557336630,
+    'from_user': {'username': 'user1'},
+    'to_user': None,
+    'to_address': '0x15e13Exxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx'
+}
+
+wallet = [
+    {
+        'currency': {'id': 1, 'title': 'Bitcoin', 'symbol': 'BTC'},
+        'amount': '0.04321',
+        'amount_in_local_currency': {
+            'amount_in_local_currency': '352.32',
+            'local_currency_symbol': 'USD'
+        },
+        'address': {'address': '1525DXxxxxxxxxxxxxxxxxxxxxxxxxxxxx', 'chip': None}
+    },
+    {
+        'currency': {'id': 2, 'title': 'Ethereum', 'symbol': 'ETH'},
+        'amount': '0.0123',
+        'amount_in_local_currency': {
+            'amount_in_local_currency': '3.08',
+            'local_currency_symbol': 'USD'
+        },
+        'address': {'address': '0xfD6724xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx', 'chip': None}
+    }
+]
+
+# Builds a paginated api response (`count`, `next`, `total_pages`, `results`)
+def page(results, count, total_pages, next_url=None):
+    return {
+        'count': count,
+        'next': next_url,
+        'previous': None,
+        'total_pages': total_pages,
+        'results': results
+    }
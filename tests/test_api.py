@@ -1,9 +1,15 @@
+import threading
+
 import pytest
 import requests_mock
 
-from localcoinswap.client import Client
+from localcoinswap.client import Client, create_session, get_page_urls
 from localcoinswap.exceptions import (LocalcoinswapAPIException,
+                                      LocalcoinswapInvalidParamError,
                                       LocalcoinswapResponseException)
+from localcoinswap.parsers import parse_transactions
+
+from .sample_data import ad, page, trade, trade_params, transaction, wallet
 
 # Set get_params=False, otherwise client will try to set
 # them up and fail the authentication
@@ -49,3 +55,210 @@ def test_response_exception():
                   text='Trade params: 1,2,3',
                   status_code=200)
             client.get_trade_params()
+
+def test_get_page_urls():
+    '''
+    Test remaining page urls are built from api 'next' url.
+    '''
+
+    next_url = client.create_api_url('trade/?limit=2&offset=2&ordering=-popularity')
+    assert get_page_urls(next_url, 7) == [
+        client.create_api_url('trade/?limit=2&offset=2&ordering=-popularity'),
+        client.create_api_url('trade/?limit=2&offset=4&ordering=-popularity'),
+        client.create_api_url('trade/?limit=2&offset=6&ordering=-popularity')
+    ]
+    assert get_page_urls(None, 7) is None
+    assert get_page_urls(client.create_api_url('trade/?page=2'), 7) is None
+
+def test_get_ads_concurrent_pages():
+    '''
+    Test get_all with workers (pages requested concurrently, results in order).
+    '''
+
+    def ads_url(offset):
+        return client.create_api_url('trade/?limit=2&offset={}&ordering=-popularity'.format(offset))
+
+    with requests_mock.mock() as m:
+        m.get(client.create_api_url('trade/?limit=2&ordering=-popularity'),
+              json=page([dict(ad, uuid='0'), dict(ad, uuid='1')], 5, 3, ads_url(2)),
+              complete_qs=True)
+        m.get(ads_url(2),
+              json=page([dict(ad, uuid='2'), dict(ad, uuid='3')], 5, 3, ads_url(4)),
+              complete_qs=True)
+        m.get(ads_url(4), json=page([dict(ad, uuid='4')], 5, 3), complete_qs=True)
+
+        result = client.get_ads({'limit': 2}, get_all=True, workers=3)
+
+    assert result['count'] == 5
+    assert [a['uuid'] for a in result['results']] == ['0', '1', '2', '3', '4']
+
+def test_iter_transactions():
+    '''
+    Test transactions iterator (follows next urls, yields parsed transactions).
+    '''
+
+    def transactions_url(offset):
+        return client.create_api_url('wallet/transactions/?limit=1&offset={}'.format(offset))
+
+    with requests_mock.mock() as m:
+        for offset in range(3):
+            next_url = transactions_url(offset + 1) if offset < 2 else None
+            m.get(transactions_url(offset),
+                  json=page([dict(transaction, timestamp=offset)], 3, 3, next_url),
+                  complete_qs=True)
+
+        transactions = client.iter_transactions(limit=1)
+        assert m.call_count == 0
+        assert next(transactions)['timestamp'] == 0
+        assert [t['timestamp'] for t in transactions] == [1, 2]
+        assert m.call_count == 3
+
+def test_shared_session():
+    '''
+    Test clients sharing a session send their own auth token.
+    '''
+
+    session = create_session(pool_maxsize=20, keep_alive=False)
+    assert session.get_adapter(Client.API_URL)._pool_maxsize == 20
+
+    first = Client('api_token_1', get_params=False, session=session)
+    second = Client('api_token_2', get_params=False, session=session)
+    assert first.session is second.session
+
+    with requests_mock.mock() as m:
+        m.get(first.create_api_url('contracts/321/'), json={})
+        first.request('get', first.create_api_url('contracts/321/'))
+        assert m.last_request.headers['Authorization'] == 'Token api_token_1'
+        assert m.last_request.headers['Connection'] == 'close'
+        second.request('get', second.create_api_url('contracts/321/'))
+        assert m.last_request.headers['Authorization'] == 'Token api_token_2'
+
+def test_json_loads():
+    '''
+    Test custom json decoder gets response bytes.
+    '''
+
+    decoded = []
+
+    def json_loads(content):
+        decoded.append(content)
+        return {'decoded': True}
+
+    json_client = Client('api_token', get_params=False, json_loads=json_loads)
+    with requests_mock.mock() as m:
+        m.get(json_client.create_api_url('contracts/321/'), json={'id': 321})
+        assert json_client.request('get', json_client.create_api_url('contracts/321/')) == {'decoded': True}
+    assert decoded == [b'{"id": 321}']
+
+def test_get_ads_fields():
+    '''
+    Test get_ads with selected fields.
+    '''
+
+    client = Client('api_token', get_params=False)
+    url = client.create_api_url('trade/?limit=20&ordering=-popularity')
+
+    with requests_mock.mock() as m:
+        m.get(url, json=page([ad], 1, 1), complete_qs=True)
+        result = client.get_ads(fields=['uuid', 'current_price'])
+        with pytest.raises(LocalcoinswapInvalidParamError):
+            client.get_ads(records=True, fields=['uuid'])
+
+    assert result['results'] == [{'uuid': ad['uuid'], 'current_price': float(ad['current_price'])}]
+
+def test_get_all_prefetch():
+    '''
+    Test next page is requested in background while current page is parsed.
+    '''
+
+    client = Client('api_token', get_params=False)
+    urls = [client.create_api_url('wallet/transactions/?limit=1&offset={}'.format(offset))
+            for offset in range(3)]
+    last_requested = threading.Event()
+
+    def last_page(request, context):
+        last_requested.set()
+        return page([dict(transaction, timestamp=2)], 3, 3)
+
+    def parser(results):
+        # second page is parsed while last page is requested
+        if results[0]['timestamp'] == 1:
+            assert last_requested.wait(5)
+        return parse_transactions(results)
+
+    with requests_mock.mock() as m:
+        m.get(urls[0], json=page([dict(transaction, timestamp=0)], 3, 3, urls[1]), complete_qs=True)
+        m.get(urls[1], json=page([dict(transaction, timestamp=1)], 3, 3, urls[2]), complete_qs=True)
+        m.get(urls[2], json=last_page, complete_qs=True)
+        result = client.get_paginated(urls[0], 1, parser, True, 10, False)
+
+    assert [t['timestamp'] for t in result['results']] == [0, 1, 2]
+
+def test_bulk_control_ads():
+    '''
+    Test ads are paused concurrently and failures are returned by uuid.
+    '''
+
+    client = Client('api_token', get_params=False)
+    url = client.create_api_url('user-trade/update-delete/{}/')
+
+    with requests_mock.mock() as m:
+        for uuid in ('a', 'b'):
+            m.patch(url.format(uuid), json={'uuid': uuid, 'is_active': False, 'is_available': True})
+        m.patch(url.format('c'), status_code=404, json={'detail': 'Not found.'})
+        result = client.bulk_control_ads('pause', ['a', 'b', 'c', 'a'], workers=2)
+        with pytest.raises(LocalcoinswapInvalidParamError):
+            client.bulk_control_ads('archive', ['a'])
+        assert m.call_count == 3
+
+    assert list(result['results']) == ['a', 'b']
+    assert result['results']['a'] == {'uuid': 'a', 'is_active': False, 'is_available': True}
+    assert isinstance(result['errors']['c'], LocalcoinswapAPIException)
+
+def test_get_deposit_address():
+    '''
+    Test addresses are requested concurrently (or taken from wallet) in currency order.
+    '''
+
+    client = Client('api_token', get_params=False)
+    client.trade_params = trade_params
+
+    with requests_mock.mock() as m:
+        m.get(client.create_api_url('wallet/AJAX/get-wallet-info/1/'), json=wallet[0])
+        m.get(client.create_api_url('wallet/AJAX/get-wallet-info/2/'), json=wallet[1])
+        addresses = client.get_deposit_address(['eth', 'btc', 'eth'], workers=2)
+        assert m.call_count == 2
+
+        m.get(client.create_api_url('wallet/AJAX/get-portfolio-data/'), json=wallet[:1])
+        assert client.get_deposit_address(['eth', 'btc'], from_wallet=True) == addresses[:2]
+        assert m.call_count == 4
+
+    assert [a['symbol'] for a in addresses] == ['ETH', 'BTC', 'ETH']
+    assert addresses[1]['address'] == wallet[0]['address']['address']
+
+def test_get_all_trades_concurrent():
+    '''
+    Test active and inactive trades are requested concurrently and merged.
+    '''
+
+    client = Client('api_token', get_params=False)
+    get_trades = client.get_trades
+    both_requested = threading.Barrier(2, timeout=5)
+
+    # requests_mock sends requests one at a time, so listings wait for each other here
+    def concurrent_get_trades(trade_type, *args):
+        both_requested.wait()
+        return get_trades(trade_type, *args)
+
+    client.get_trades = concurrent_get_trades
+    with requests_mock.mock() as m:
+        m.get(client.create_api_url('contracts/active/?limit=10&offset=0'),
+              json=page([dict(trade, uuid='active')], 1, 1), complete_qs=True)
+        m.get(client.create_api_url('contracts/inactive/?limit=10&offset=0'),
+              json=page([dict(trade, uuid='inactive')], 1, 1), complete_qs=True)
+        result = client.get_all_trades()
+
+    assert result['count'] == 2
+    assert [t['uuid'] for t in result['results']] == ['active', 'inactive']
+    assert result['total_pages'] == {'active': 1, 'inactive': 1}
+    assert result['limit'] == 10
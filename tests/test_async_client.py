@@ -0,0 +1,99 @@
+import asyncio
+
+import pytest
+
+from localcoinswap.async_client import AsyncClient, AsyncResponse
+from localcoinswap.exceptions import (LocalcoinswapAPIException,
+                                      LocalcoinswapResponseException)
+
+from .sample_data import ad, trade, trade_params, wallet, page
+
+# Replaces client.request with a coroutine returning responses by url
+def mock_request(client, responses):
+    calls = []
+
+    async def request(method, url, data={}, timeout=10, non_json_response=False):
+        calls.append((method, url))
+        return responses[url]
+
+    client.request = request
+    return calls
+
+class FakeResponse:
+    status = 400
+    reason = 'Bad Request'
+    charset = None
+    headers = {}
+
+def test_handle_response():
+    '''
+    Test that aiohttp responses raise the same exceptions as in Client.
+    '''
+
+    client = AsyncClient('api_token', get_params=False)
+    response = FakeResponse()
+
+    with pytest.raises(LocalcoinswapAPIException):
+        client.handle_response(AsyncResponse(response, b'{"error": true}'))
+    response.status = 200
+    with pytest.raises(LocalcoinswapResponseException):
+        client.handle_response(AsyncResponse(response, b'Trade params: 1,2,3'))
+    assert client.handle_response(AsyncResponse(response, b'{"id": 1}')) == {'id': 1}
+
+def test_get_ads_get_all():
+    '''
+    Test paginated ads (all pages) are parsed and merged in order.
+    '''
+
+    client = AsyncClient('api_token', get_params=False)
+    first_url = client.create_api_url('trade/?limit=1&ordering=-popularity')
+    second_url = client.create_api_url('trade/?limit=1&offset=1&ordering=-popularity')
+    second_ad = dict(ad, uuid='second')
+    mock_request(client, {
+        first_url: page([ad], 2, 2, second_url),
+        second_url: page([second_ad], 2, 2)
+    })
+
+    result = asyncio.run(client.get_ads({'limit': 1}, get_all=True))
+    assert result['count'] == 2
+    assert [a['uuid'] for a in result['results']] == [ad['uuid'], 'second']
+
+def test_get_all_trades_and_deposit_address():
+    '''
+    Test concurrent requests keep the same result format/order as Client.
+    '''
+
+    client = AsyncClient('api_token', get_params=False)
+    client.trade_params = trade_params
+    mock_request(client, {
+        client.create_api_url('contracts/active/?limit=10&offset=0'): page([trade], 1, 1),
+        client.create_api_url('contracts/inactive/?limit=10&offset=0'): page([], 0, 1),
+        client.create_api_url('wallet/AJAX/get-wallet-info/2/'): wallet[1],
+        client.create_api_url('wallet/AJAX/get-wallet-info/1/'): wallet[0],
+    })
+
+    trades = asyncio.run(client.get_all_trades())
+    assert trades['count'] == 1
+    assert trades['total_pages'] == {'active': 1, 'inactive': 1}
+    assert trades['results'][0]['uuid'] == trade['uuid']
+
+    addresses = asyncio.run(client.get_deposit_address(['eth', 'btc']))
+    assert [a['symbol'] for a in addresses] == ['ETH', 'BTC']
+
+def test_iter_trades():
+    '''
+    Test async trades iterator (follows next urls, yields parsed trades).
+    '''
+
+    client = AsyncClient('api_token', get_params=False)
+    first_url = client.create_api_url('contracts/inactive/?limit=1&offset=0')
+    second_url = client.create_api_url('contracts/inactive/?limit=1&offset=1')
+    mock_request(client, {
+        first_url: page([trade], 2, 2, second_url),
+        second_url: page([dict(trade, uuid='second')], 2, 2)
+    })
+
+    async def collect():
+        return [t['uuid'] async for t in client.iter_trades('inactive', limit=1)]
+
+    assert asyncio.run(collect()) == [trade['uuid'], 'second']
@@ -0,0 +1,157 @@
+import json
+import os
+import threading
+
+import requests_mock
+
+from localcoinswap.cache import ResponseCache, TradeParamsCache
+from localcoinswap.client import Client
+
+from .sample_data import ad, trade, trade_params
+
+def test_trade_params_cache(tmp_path):
+    '''
+    Test trade params are requested once and then loaded from cache.
+    '''
+
+    cache = TradeParamsCache(str(tmp_path / 'trade_params.json'))
+
+    with requests_mock.mock() as m:
+        m.get(Client('api_token', get_params=False).create_api_url('new-trade/'),
+              json=dict(trade_params, other_data=[]))
+
+        client = Client('api_token', params_cache=cache)
+        assert m.call_count == 1
+        assert client.trade_params == trade_params
+
+        client = Client('api_token', params_cache=cache)
+        assert m.call_count == 1
+        assert client.trade_params == trade_params
+        assert client.params_refresh is None
+
+        client.refresh_trade_params()
+        assert m.call_count == 2
+
+def test_trade_params_cache_expired(tmp_path):
+    '''
+    Test expired cache is used and refreshed in background.
+    '''
+
+    cache = TradeParamsCache(str(tmp_path / 'trade_params.json'), ttl=0)
+    cache.save(Client.API_URL, {'trade_types': []})
+
+    with requests_mock.mock() as m:
+        m.get(Client('api_token', get_params=False).create_api_url('new-trade/'),
+              json=trade_params)
+
+        client = Client('api_token', params_cache=cache)
+        client.params_refresh.join()
+        assert client.trade_params == trade_params
+        assert cache.load(Client.API_URL)[0] == trade_params
+
+def test_trade_params_cache_version(tmp_path):
+    '''
+    Test cache from another version or api url is ignored.
+    '''
+
+    cache = TradeParamsCache(str(tmp_path / 'trade_params.json'))
+    assert cache.load(Client.API_URL) == (None, True)
+
+    cache.save('https://localhost', trade_params)
+    assert cache.load(Client.API_URL) == (None, True)
+
+    cache.save(Client.API_URL, trade_params)
+    with open(cache.path) as f:
+        data = json.load(f)
+    with open(cache.path, 'w') as f:
+        json.dump(dict(data, version=0), f)
+    assert cache.load(Client.API_URL) == (None, True)
+
+    for invalid in ([], {'version': cache.VERSION}, dict(data, timestamp=None),
+                    dict(data, trade_params=[])):
+        with open(cache.path, 'w') as f:
+            json.dump(invalid, f)
+        assert cache.load(Client.API_URL) == (None, True)
+
+def test_trade_params_cache_concurrent_save(tmp_path):
+    '''
+    Test cache is saved from multiple threads (without leftover temporary files).
+    '''
+
+    cache = TradeParamsCache(str(tmp_path / 'trade_params.json'))
+    errors = []
+
+    def save():
+        try:
+            for i in range(20):
+                cache.save(Client.API_URL, trade_params)
+        except OSError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=save) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert cache.load(Client.API_URL) == (trade_params, False)
+    assert os.listdir(str(tmp_path)) == ['trade_params.json']
+
+def test_response_cache():
+    '''
+    Test cached responses are reused, revalidated (304) and invalidated.
+    '''
+
+    cache = ResponseCache(ttl=0, ttls={'get_ad': 60})
+    client = Client('api_token', get_params=False, response_cache=cache)
+    ad_url = client.create_api_url('trade/{}'.format(ad['uuid']))
+    trade_url = client.create_api_url('contracts/{}/'.format(trade['uuid']))
+
+    with requests_mock.mock() as m:
+        m.get(ad_url, json=ad)
+        parsed_ad = client.get_ad(ad['uuid'])
+        assert client.get_ad(ad['uuid']) is parsed_ad
+        assert client.get_ad(ad['uuid'], raw=True) == ad
+        assert m.call_count == 1
+
+        m.patch(client.create_api_url('user-trade/update-delete/{}/'.format(ad['uuid'])),
+                json={'uuid': ad['uuid'], 'is_active': False, 'is_available': True})
+        client.pause_ad(ad['uuid'])
+        assert client.get_ad(ad['uuid']) is not parsed_ad
+        assert m.call_count == 3
+
+        # expired (ttl=0) trade is revalidated with etag
+        m.get(trade_url, json=trade, headers={'ETag': '"v1"'})
+        parsed_trade = client.get_trade(trade['uuid'])
+        m.get(trade_url, status_code=304)
+        assert client.get_trade(trade['uuid']) is parsed_trade
+        assert m.last_request.headers['If-None-Match'] == '"v1"'
+
+def test_response_cache_lru():
+    '''
+    Test least recently used responses are removed from full cache.
+    '''
+
+    cache = ResponseCache(max_entries=2)
+    cache.set('a', 'get_ad', 1)
+    cache.set('b', 'get_ad', 2)
+    cache.get('a')
+    cache.set('c', 'get_ad', 3)
+    assert list(cache.entries) == ['a', 'c']
+    cache.invalidate('c')
+    assert list(cache.entries) == ['a']
+
+def test_response_cache_refresh_trade_params():
+    '''
+    Test explicit trade params refresh isn't served from response cache.
+    '''
+
+    client = Client('api_token', get_params=False, response_cache=ResponseCache())
+
+    with requests_mock.mock() as m:
+        m.get(client.create_api_url('new-trade/'), json=trade_params)
+        client.refresh_trade_params()
+        client.refresh_trade_params()
+        assert m.call_count == 2
+        client.get_trade_params()
+        assert m.call_count == 2
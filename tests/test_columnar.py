@@ -0,0 +1,93 @@
+import pytest
+import requests_mock
+
+from localcoinswap.client import Client
+from localcoinswap.columnar import AdColumns, TransactionColumns
+from localcoinswap.exceptions import LocalcoinswapInvalidParamError
+from localcoinswap.parsers import parse_ad
+
+from .sample_data import ad, transaction, page
+
+ads = [ad,
+       dict(ad, uuid='second', current_price='300.25',
+            fiat_currency={'id': 10003, 'title': 'Euro', 'symbol': 'EUR'}),
+       dict(ad, uuid='third', current_price='1')]
+
+def test_ad_columns():
+    '''
+    Test columnar ads (typed arrays, categorical codes) match parsed ads.
+    '''
+
+    columns = AdColumns(ads[:2])
+    columns.extend(ads[2:])
+
+    assert len(columns) == 3
+    assert columns['uuid'] == [ad['uuid'], 'second', 'third']
+    assert columns['current_price'].typecode == 'd'
+    assert list(columns['current_price']) == [parse_ad(a)['current_price'] for a in ads]
+    assert list(columns['fiat_currency_symbol']) == [0, 1, 0]
+    assert columns.categories('fiat_currency_symbol') == ['USD', 'EUR']
+    assert columns.code('fiat_currency_symbol', 'EUR') == 1
+    assert columns.code('fiat_currency_symbol', 'JPY') == -1
+    assert columns.decode('fiat_currency_symbol') == ['USD', 'EUR', 'USD']
+    assert list(columns['is_active']) == [1, 1, 1]
+
+def test_columns_to_numpy():
+    '''
+    Test columns are converted to numpy arrays.
+    '''
+
+    numpy = pytest.importorskip('numpy')
+    transactions = TransactionColumns([transaction, dict(transaction, amount='1.5')])
+    columns = transactions.to_numpy()
+    assert columns['amount'].dtype == numpy.float64
+    assert columns['amount'].sum() == pytest.approx(1.4999)
+    assert list(columns['timestamp']) == [transaction['timestamp']] * 2
+
+    transactions.extend([transaction])
+    assert len(transactions) == 3
+    assert len(columns['amount']) == 2
+
+def test_get_ads_columnar():
+    '''
+    Test get_ads with columnar results (all pages).
+    '''
+
+    client = Client('api_token', get_params=False)
+    first_url = client.create_api_url('trade/?limit=2&ordering=-popularity')
+    second_url = client.create_api_url('trade/?limit=2&offset=2&ordering=-popularity')
+
+    with requests_mock.mock() as m:
+        m.get(first_url, json=page(ads[:2], 3, 2, second_url), complete_qs=True)
+        m.get(second_url, json=page(ads[2:], 3, 2), complete_qs=True)
+        result = client.get_ads({'limit': 2}, get_all=True, columnar=True)
+
+    assert result['count'] == 3
+    assert isinstance(result['results'], AdColumns)
+    assert result['results']['uuid'] == [ad['uuid'], 'second', 'third']
+
+def test_columns_invalid_record():
+    '''
+    Test invalid record doesn't leave columns with different lengths.
+    '''
+
+    columns = AdColumns(ads[:1])
+    for invalid in (dict(ad, uuid='new', current_price=None), {'uuid': 'new'}):
+        with pytest.raises((KeyError, TypeError)):
+            columns.extend([dict(ad, uuid='new',
+                                 fiat_currency={'id': 10003, 'title': 'Euro', 'symbol': 'EUR'}),
+                            invalid])
+        assert {len(column) for column in columns.columns.values()} == {1}
+        assert columns.categories('fiat_currency_symbol') == ['USD']
+
+def test_get_ads_columnar_invalid_options():
+    '''
+    Test columnar results can't be combined with raw, records or fields.
+    '''
+
+    client = Client('api_token', get_params=False)
+    for options in ({'raw': True}, {'records': True}, {'fields': ['uuid']}):
+        with pytest.raises(LocalcoinswapInvalidParamError):
+            client.get_ads(columnar=True, **options)
+    with pytest.raises(LocalcoinswapInvalidParamError):
+        client.get_transactions(columnar=True, records=True)
@@ -0,0 +1,59 @@
+from localcoinswap.diff import ADDED, CHANGED, REMOVED, AdSnapshot, Change
+from localcoinswap.parsers import parse_ad
+from localcoinswap.records import Ad
+
+from .sample_data import ad
+
+def create_ad(uuid, **data):
+    return dict(parse_ad(ad), uuid=uuid, **data)
+
+def test_ad_snapshot_diff():
+    '''
+    Test added, changed and removed ads between scans.
+    '''
+
+    snapshot = AdSnapshot([create_ad('a'), create_ad('b'), create_ad('c')])
+    changed = create_ad('b', current_price=1.5, created_by_languages=['en'])
+    added = create_ad('d')
+
+    changes = snapshot.diff([create_ad('a'), changed, Ad.from_dict(added)])
+    assert changes == [
+        Change(CHANGED, 'b', changed, {'current_price': (parse_ad(ad)['current_price'], 1.5),
+                                       'created_by_languages': ([], ['en'])}),
+        Change(ADDED, 'd', added),
+        Change(REMOVED, 'c', create_ad('c')),
+    ]
+    assert len(snapshot) == 3
+    assert 'c' not in snapshot
+    assert snapshot.get('b') == changed
+
+    assert snapshot.diff([create_ad('a'), changed, added]) == []
+
+def test_ad_snapshot_partial():
+    '''
+    Test partial scans and compared fields.
+    '''
+
+    snapshot = AdSnapshot([create_ad('a'), create_ad('b')], fields=['current_price'])
+
+    changes = snapshot.diff([create_ad('a', current_price=2.0, is_active=False)], complete=False)
+    assert [(c.event, c.uuid, c.fields) for c in changes] == \
+           [(CHANGED, 'a', {'current_price': (parse_ad(ad)['current_price'], 2.0)})]
+    assert 'b' in snapshot
+
+    assert [(c.event, c.uuid) for c in snapshot.remove(['b', 'x'])] == [(REMOVED, 'b')]
+    assert len(snapshot) == 1
+
+def test_ad_snapshot_equal_hash():
+    '''
+    Test ads with equal content hash but different values are changed.
+    '''
+
+    snapshot = AdSnapshot([create_ad('a', payment_method_id=-1)],
+                          fields=['payment_method_id', 'current_price'])
+    assert hash(-1) == hash(-2)
+    changes = snapshot.diff([create_ad('a', payment_method_id=-2)])
+    assert [c.fields for c in changes] == [{'payment_method_id': (-1, -2)}]
+
+    snapshot = AdSnapshot([create_ad('a', created_by_languages=['en'])])
+    assert snapshot.ads['a'][0] is not None
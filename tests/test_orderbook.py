@@ -0,0 +1,56 @@
+from localcoinswap.orderbook import OrderBook
+from localcoinswap.parsers import parse_ad
+from localcoinswap.records import Ad
+
+from .sample_data import ad
+
+def create_ad(uuid, price, min_limit, max_limit, **data):
+    return dict(parse_ad(ad), uuid=uuid, current_price=price,
+                min_fiat_limit=min_limit, max_fiat_limit=max_limit, **data)
+
+def test_order_book():
+    '''
+    Test best price, depth and fitting ads of sorted books.
+    '''
+
+    book = OrderBook([create_ad('a', 102.0, 10, 100),
+                      create_ad('b', 100.0, 50, 500),
+                      create_ad('c', 101.0, 1, 20),
+                      create_ad('d', 99.0, 10, 1000, trading_type='Selling'),
+                      create_ad('e', 98.0, 10, 1000, is_available=False)])
+    key = OrderBook.key(parse_ad(ad))
+    bids = book.get(*key)
+
+    assert len(book) == 4
+    assert len(bids) == 3
+    assert bids.best_price() == 102.0
+    assert [price for price, ads in bids.levels()] == [102.0, 101.0, 100.0]
+    assert bids.depth(101.0) == 120
+    assert bids.depth(103.0) == 0
+    assert bids.price_at_amount(110) == 101.0
+    assert bids.price_at_amount(1000) is None
+    assert [a['uuid'] for a in bids.fitting(60)] == ['a', 'b']
+    assert [a['uuid'] for a in bids.fitting(15, limit=1)] == ['a']
+    assert bids.fitting(5000) == []
+    assert book.get(key[0], key[1], key[2], 'Selling').best_price() == 99.0
+    assert book.get('XMR', 'USD', 'Cash', 'Selling').best_price() is None
+
+def test_order_book_updates():
+    '''
+    Test incremental updates from scans.
+    '''
+
+    book = OrderBook([create_ad('a', 102.0, 10, 100), create_ad('b', 100.0, 50, 500)])
+    key = OrderBook.key(parse_ad(ad))
+
+    book.update([Ad.from_dict(create_ad('b', 103.0, 50, 500)),
+                 create_ad('c', 90.0, 1, 10, payment_method='Cash deposit')])
+    assert book.get(*key).best_price() == 103.0
+    assert len(book.books) == 2
+
+    book.update([create_ad('c', 90.0, 1, 10, is_active=False)])
+    assert 'c' not in book
+    assert len(book.books) == 1
+
+    book.replace([create_ad('a', 95.0, 10, 100)])
+    assert [a['uuid'] for a in book.get(*key)] == ['a']
@@ -0,0 +1,42 @@
+import requests_mock
+
+from localcoinswap.client import Client
+from localcoinswap.parallel import ParsePool
+from localcoinswap.parsers import parse_ads, parse_transactions
+
+from .sample_data import ad, page, transaction
+
+def test_parse_pool_order():
+    '''
+    Test parsed chunks are in the same order as pages.
+    '''
+
+    pages = [[dict(transaction, timestamp=i), dict(transaction, timestamp=i + 0.5)]
+             for i in range(7)]
+
+    with ParsePool(workers=2, chunk_size=2) as pool:
+        chunks = list(pool.map(parse_transactions, iter(pages)))
+
+    assert [len(chunk) for chunk in chunks] == [4, 4, 4, 2]
+    assert [t['timestamp'] for chunk in chunks for t in chunk] == \
+           [t['timestamp'] for p in pages for t in p]
+
+def test_get_ads_parse_pool():
+    '''
+    Test get_all results are parsed in pool.
+    '''
+
+    ads = [dict(ad, uuid=str(i)) for i in range(5)]
+
+    with ParsePool(workers=2) as pool:
+        client = Client('api_token', get_params=False, parse_pool=pool)
+        urls = [client.create_api_url('trade/?limit=2&offset={}&ordering=-popularity'.format(offset))
+                for offset in (0, 2, 4)]
+        with requests_mock.mock() as m:
+            for i, url in enumerate(urls):
+                next_url = urls[i + 1] if i < 2 else None
+                m.get(url, json=page(ads[2 * i:2 * i + 2], 5, 3, next_url), complete_qs=True)
+            result = client.get_ads({'limit': 2, 'offset': 0}, get_all=True)
+            concurrent = client.get_ads({'limit': 2, 'offset': 0}, get_all=True, workers=2)
+
+    assert result == concurrent == {'count': 5, 'results': parse_ads(ads)}
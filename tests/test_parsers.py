@@ -0,0 +1,63 @@
+import pytest
+
+from localcoinswap.exceptions import LocalcoinswapInvalidParamError
+from localcoinswap.parsers import (AD_SPEC,
+                                   TRADE_SPEC,
+                                   parse_ad,
+                                   parse_ads,
+                                   parse_trade,
+                                   parse_trades)
+from localcoinswap.specs import Field, Spec, get_spec, register_spec
+
+from .sample_data import ad, trade
+
+def test_parse_fields():
+    '''
+    Test only selected fields are parsed (with the same values).
+    '''
+
+    fields = ['uuid', 'current_price', 'min_fiat_limit', 'payment_method']
+    parsed = parse_ad(ad)
+    assert parse_ad(ad, fields) == {field: parsed[field] for field in fields}
+    assert parse_ads([ad, ad], fields) == [parse_ad(ad, fields)] * 2
+    assert parse_ad(ad, AD_SPEC.keys()) == parsed
+    assert parse_trades([trade], TRADE_SPEC.keys()) == [parse_trade(trade)]
+    assert parse_trade(trade, ['fiat_amount']) == {'fiat_amount': float(trade['fiat_amount'])}
+
+    with pytest.raises(LocalcoinswapInvalidParamError):
+        parse_ads([ad], ['uuid', 'price'])
+
+def test_spec_compile():
+    '''
+    Test specs are compiled once for selected fields.
+    '''
+
+    spec = Spec([Field('uuid', 'uuid'),
+                 Field('price', 'current_price', float),
+                 Field('seller', ('created_by', 'username')),
+                 Field('limits', (), lambda ad: (ad['min_fiat_limit'], ad['max_fiat_limit']))])
+
+    assert spec.parse(ad) == {'uuid': ad['uuid'],
+                              'price': float(ad['current_price']),
+                              'seller': ad['created_by']['username'],
+                              'limits': (ad['min_fiat_limit'], ad['max_fiat_limit'])}
+    assert spec.parse_many([ad], ['price']) == [{'price': float(ad['current_price'])}]
+    assert spec.compile(['price']) is spec.compile(['price'])
+    with pytest.raises(LocalcoinswapInvalidParamError):
+        Field('uuid', [object()])
+
+def test_register_spec():
+    '''
+    Test registered spec replaces built-in parser.
+    '''
+
+    register_spec('ad', AD_SPEC.extend([Field('country', ('country_code',), str.lower)]))
+    try:
+        parsed = parse_ad(ad)
+    finally:
+        register_spec('ad', AD_SPEC)
+
+    assert parsed['country'] == ad['country_code'].lower()
+    assert get_spec('ad') is AD_SPEC
+    with pytest.raises(LocalcoinswapInvalidParamError):
+        get_spec('missing')
@@ -0,0 +1,82 @@
+import requests_mock
+
+from localcoinswap.cache import ResponseCache
+
+from localcoinswap.client import Client
+from localcoinswap.exceptions import LocalcoinswapAPIException
+from localcoinswap.pool import ClientPool
+
+from .sample_data import page, trade, trade_params, wallet
+
+def test_client_pool():
+    '''
+    Test clients share session and trade params, and have their own rate limiters.
+    '''
+
+    url = Client('api_token', get_params=False).create_api_url
+
+    with requests_mock.mock() as m:
+        m.get(url('new-trade/'), json=trade_params)
+        pool = ClientPool({'desk1': 'api_token_1', 'desk2': 'api_token_2'},
+                          rate=5, rate_limits={'desk2': 10})
+        assert m.call_count == 1
+
+    assert list(pool) == ['desk1', 'desk2']
+    assert pool['desk1'].session is pool['desk2'].session
+    assert pool['desk1'].trade_params is pool['desk2'].trade_params == trade_params
+    assert pool['desk1'].rate_limiter.rate == 5
+    assert pool['desk2'].rate_limiter.rate == 10
+    pool.close()
+
+def test_client_pool_fan_out():
+    '''
+    Test operations for all accounts return results and errors by account.
+    '''
+
+    url = Client('api_token', get_params=False).create_api_url
+
+    def portfolio(request, context):
+        if request.headers['Authorization'] == 'Token api_token_2':
+            context.status_code = 401
+            return {'detail': 'Invalid token.'}
+        return wallet
+
+    with ClientPool(['api_token_1', 'api_token_2', 'api_token_3'], get_params=False,
+                    workers=2) as pool:
+        with requests_mock.mock() as m:
+            m.get(url('wallet/AJAX/get-portfolio-data/'), json=portfolio)
+            m.get(url('contracts/active/?limit=10&offset=0'), json=page([trade], 1, 1),
+                  complete_qs=True)
+            wallets = pool.get_wallets()
+            trades = pool.get_active_trades(accounts=['api_token_3'])
+
+    assert list(wallets['results']) == ['api_token_1', 'api_token_3']
+    assert wallets['results']['api_token_1'][0]['symbol'] == 'BTC'
+    assert isinstance(wallets['errors']['api_token_2'], LocalcoinswapAPIException)
+    assert trades['results']['api_token_3']['results'][0]['uuid'] == trade['uuid']
+
+def test_client_pool_response_cache():
+    '''
+    Test each account has its own response cache with the same settings.
+    '''
+
+    url = Client('api_token', get_params=False).create_api_url
+
+    def portfolio(request, context):
+        if request.headers['Authorization'] == 'Token api_token_2':
+            return [dict(wallet[0], amount='2.0')]
+        return [dict(wallet[0], amount='1.0')]
+
+    cache = ResponseCache(ttl=60, ttls={'get_wallet': 5}, max_entries=10)
+    with ClientPool(['api_token_1', 'api_token_2'], get_params=False,
+                    response_cache=cache) as pool:
+        with requests_mock.mock() as m:
+            m.get(url('wallet/AJAX/get-portfolio-data/'), json=portfolio)
+            assert pool['api_token_1'].get_wallet()[0]['coin_amount'] == 1.0
+            assert pool['api_token_2'].get_wallet()[0]['coin_amount'] == 2.0
+            assert pool['api_token_1'].get_wallet()[0]['coin_amount'] == 1.0
+            assert m.call_count == 2
+
+    assert pool['api_token_1'].response_cache is not pool['api_token_2'].response_cache
+    assert pool['api_token_2'].response_cache.ttls == {'get_wallet': 5}
+    assert pool['api_token_2'].response_cache.max_entries == 10
@@ -0,0 +1,99 @@
+import threading
+import time
+
+import pytest
+import requests_mock
+
+from localcoinswap.client import Client
+from localcoinswap.ratelimit import PRIORITY_HIGH, PRIORITY_LOW, RateLimiter
+
+class FakeClock:
+    '''
+    Clock advanced by tests instead of real time.
+    '''
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class FakeWaitLimiter(RateLimiter):
+    '''
+    Rate limiter which advances fake clock instead of waiting.
+    '''
+
+    def wait(self, timeout=None):
+        self.clock.now += timeout
+
+def test_rate_limiter_burst():
+    '''
+    Test burst requests pass at once, next ones are limited by rate.
+    '''
+
+    clock = FakeClock()
+    limiter = FakeWaitLimiter(20, burst=3, clock=clock)
+    for _ in range(3):
+        limiter.acquire()
+    assert clock.now == 0
+    limiter.acquire()
+    limiter.acquire()
+    assert clock.now == pytest.approx(0.1)
+
+    clock.now += 1
+    for _ in range(3):
+        limiter.acquire()
+    assert clock.now == pytest.approx(1.1)
+
+def test_rate_limiter_priority():
+    '''
+    Test waiting high priority requests go before waiting low priority requests.
+    '''
+
+    clock = FakeClock()
+    limiter = RateLimiter(1, clock=clock)
+    limiter.acquire()
+    order = []
+
+    def acquire(priority):
+        limiter.acquire(priority)
+        order.append(priority)
+
+    def start(priority):
+        thread = threading.Thread(target=acquire, args=(priority,))
+        thread.start()
+        while not limiter.waiting.get(priority):
+            time.sleep(0.001)
+        return thread
+
+    low = start(PRIORITY_LOW)
+    high = start(PRIORITY_HIGH)
+    for thread in (high, low):
+        # one token is available, waiting requests are woken up
+        with limiter.condition:
+            clock.now += 1
+            limiter.condition.notify_all()
+        thread.join()
+    assert order == [PRIORITY_HIGH, PRIORITY_LOW]
+
+def test_client_rate_limiter():
+    '''
+    Test client requests use rate limiter with request priorities.
+    '''
+
+    class RecordingLimiter:
+        def __init__(self):
+            self.priorities = []
+
+        def acquire(self, priority):
+            self.priorities.append(priority)
+
+    limiter = RecordingLimiter()
+    client = Client('api_token', get_params=False, rate_limiter=limiter)
+    with requests_mock.mock() as m:
+        m.patch(client.create_api_url('contracts/status/uuid/'), json={'status': 'ACCEPTED'})
+        m.get(client.create_api_url('contracts/active/?limit=10&offset=0'),
+              json={'count': 0, 'next': None, 'total_pages': 0, 'results': []})
+        client.accept_trade('uuid')
+        client.get_active_trades()
+    assert limiter.priorities == [PRIORITY_HIGH, PRIORITY_LOW]
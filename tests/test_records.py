@@ -0,0 +1,78 @@
+import pickle
+
+import pytest
+import requests_mock
+
+from localcoinswap.client import Client
+from localcoinswap.parsers import AD_SPEC, parse_ad, parse_transaction, parse_wallet
+from localcoinswap.records import Ad, Transaction, WalletEntry
+from localcoinswap.specs import Field, Spec, register_spec
+
+from .sample_data import ad, page, transaction, wallet
+
+def test_record_access():
+    '''
+    Test records have the same keys and values as parsed dicts.
+    '''
+
+    record = Ad.parse(ad)
+    parsed = parse_ad(ad)
+
+    assert not hasattr(record, '__dict__')
+    assert record == parsed
+    assert record.to_dict() == parsed
+    assert dict(record) == parsed
+    assert record.uuid == record['uuid'] == parsed['uuid']
+    assert record.get('missing', 1) == 1
+    assert 'current_price' in record
+    with pytest.raises(KeyError):
+        record['missing']
+    with pytest.raises(AttributeError):
+        record.missing = 1
+
+    with pytest.raises(TypeError):
+        record['is_active'] = False
+    assert pickle.loads(pickle.dumps(record)) == record
+
+def test_record_keyword_keys():
+    '''
+    Test keys that are python keywords (transaction 'from').
+    '''
+
+    record = Transaction.parse(transaction)
+    assert record['from'] == record.from_ == parse_transaction(transaction)['from']
+    assert list(record) == list(parse_transaction(transaction))
+    assert WalletEntry.parse_many(wallet) == parse_wallet(wallet)
+
+def test_record_registered_spec():
+    '''
+    Test records are parsed with built-in specs, not registered ones.
+    '''
+
+    register_spec('ad', AD_SPEC.extend([Field('country', ('country_code',))]))
+    try:
+        extended = Ad.parse(ad)
+        register_spec('ad', Spec(AD_SPEC.fields[:2]))
+        reduced = Ad.parse_many([ad])[0]
+    finally:
+        register_spec('ad', AD_SPEC)
+
+    assert extended == reduced == parse_ad(ad)
+    assert 'country' not in extended
+
+def test_get_ads_records():
+    '''
+    Test records are returned when selected per call.
+    '''
+
+    client = Client('api_token', get_params=False)
+    url = client.create_api_url('trade/?limit=20&ordering=-popularity')
+
+    with requests_mock.mock() as m:
+        m.get(url, json=page([ad], 1, 1), complete_qs=True)
+        assert type(client.get_ads()['results'][0]) is dict
+        result = client.get_ads(records=True)
+        assert list(client.iter_ads(records=True)) == result['results']
+
+    assert isinstance(result['results'][0], Ad)
+    assert result['results'][0] == parse_ad(ad)
@@ -0,0 +1,82 @@
+import pytest
+import requests
+import requests_mock
+
+from localcoinswap.client import Client
+from localcoinswap.exceptions import LocalcoinswapAPIException
+from localcoinswap.retry import RetryPolicy
+
+from .sample_data import transaction, page
+
+client = Client('api_token', get_params=False, retry=RetryPolicy(backoff_factor=0))
+
+def test_retry_get():
+    '''
+    Test GET is retried after 5xx responses and connection errors.
+    '''
+
+    with requests_mock.mock() as m:
+        m.get(client.create_api_url('contracts/321/'), [
+            {'status_code': 503, 'text': 'Service Unavailable'},
+            {'exc': requests.exceptions.ConnectionError},
+            {'status_code': 200, 'json': {'id': 321}}
+        ])
+        assert client.request('get', client.create_api_url('contracts/321/')) == {'id': 321}
+        assert m.call_count == 3
+
+    with pytest.raises(LocalcoinswapAPIException):
+        with requests_mock.mock() as m:
+            m.get(client.create_api_url('contracts/321/'), status_code=502)
+            client.request('get', client.create_api_url('contracts/321/'))
+    assert m.call_count == 3
+
+def test_no_retry_post():
+    '''
+    Test POST (e.g. withdrawal) and non-retryable responses are not retried.
+    '''
+
+    with pytest.raises(LocalcoinswapAPIException):
+        with requests_mock.mock() as m:
+            m.post(client.create_api_url('wallet/withdraw/create/'), status_code=503)
+            client.request('post', client.create_api_url('wallet/withdraw/create/'))
+    assert m.call_count == 1
+
+    with pytest.raises(LocalcoinswapAPIException):
+        with requests_mock.mock() as m:
+            m.get(client.create_api_url('contracts/321/'), status_code=404)
+            client.request('get', client.create_api_url('contracts/321/'))
+    assert m.call_count == 1
+
+def test_retry_resumes_pagination():
+    '''
+    Test get_all pagination retries only the failed page.
+    '''
+
+    def transactions_url(offset):
+        return client.create_api_url('wallet/transactions/?limit=1&offset={}'.format(offset))
+
+    with requests_mock.mock() as m:
+        first = m.get(transactions_url(0),
+                      json=page([transaction], 2, 2, transactions_url(1)),
+                      complete_qs=True)
+        second = m.get(transactions_url(1), [
+            {'status_code': 500, 'text': 'Server Error'},
+            {'status_code': 200, 'json': page([transaction], 2, 2)}
+        ], complete_qs=True)
+
+        assert len(client.get_transactions(limit=1, get_all=True)['results']) == 2
+        assert first.call_count == 1
+        assert second.call_count == 2
+
+def test_retry_delay():
+    '''
+    Test backoff delays (exponential, max backoff, Retry-After header).
+    '''
+
+    policy = RetryPolicy(backoff_factor=1, max_backoff=5, jitter=False)
+    assert [policy.get_delay(attempt) for attempt in range(1, 5)] == [1, 2, 4, 5]
+    assert 0 <= RetryPolicy(backoff_factor=1).get_delay(3) <= 4
+
+    response = requests.Response()
+    response.headers['Retry-After'] = '3'
+    assert policy.get_delay(1, response) == 3
@@ -0,0 +1,79 @@
+import json
+
+import pytest
+import requests_mock
+
+from localcoinswap.client import Client
+from localcoinswap.columnar import TransactionColumns
+from localcoinswap.exceptions import LocalcoinswapInvalidParamError, LocalcoinswapResponseException
+from localcoinswap.parsers import parse_ads, parse_trades, parse_transactions
+from localcoinswap.streaming import iter_results
+
+from .sample_data import ad, page, trade, transaction
+
+def chunks(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+def test_iter_results():
+    '''
+    Test results are decoded from any chunks (split strings, escapes, nesting).
+    '''
+
+    data = page([ad, {'text': 'a "quoted" ]} \\ value', 'nested': [[], {}, [1.5, None]]}, 7, True],
+                3, 1, 'https://localhost/?offset=3')
+    body = json.dumps(data).encode()
+    expected = {key: value for key, value in data.items() if key != 'results'}
+
+    for size in [1, 3, 64, len(body)]:
+        other = {}
+        assert list(iter_results(chunks(body, size), other)) == data['results']
+        assert other == expected
+
+    with pytest.raises(LocalcoinswapResponseException):
+        list(iter_results(chunks(body[:-10], 16), {}))
+    with pytest.raises(LocalcoinswapResponseException):
+        list(iter_results([b'{"results": [1, 2} '], {}))
+
+def test_get_transactions_stream():
+    '''
+    Test streamed pages give the same results.
+    '''
+
+    client = Client('api_token', get_params=False)
+    first_url = client.create_api_url('wallet/transactions/?limit=2&offset=0')
+    second_url = client.create_api_url('wallet/transactions/?limit=2&offset=2')
+    transactions = [dict(transaction, timestamp=timestamp) for timestamp in range(3)]
+
+    with requests_mock.mock() as m:
+        m.get(first_url, json=page(transactions[:2], 3, 2, second_url), complete_qs=True)
+        m.get(second_url, json=page(transactions[2:], 3, 2), complete_qs=True)
+
+        result = client.get_transactions(limit=2, get_all=True, stream=True)
+        assert result == {'count': 3, 'results': parse_transactions(transactions)}
+        assert [t['timestamp'] for t in client.iter_transactions(limit=2, stream=True)] == [0, 1, 2]
+
+        columns = client.get_transactions(limit=2, stream=True, columnar=True)['results']
+        assert isinstance(columns, TransactionColumns)
+        assert list(columns['timestamp']) == [0, 1]
+
+def test_stream_options():
+    '''
+    Test stream can't be used with workers, and my ads and trades can be streamed.
+    '''
+
+    client = Client('api_token', get_params=False)
+    ads_url = client.create_api_url('user-trade/all/?limit=5&offset=0')
+    trades_url = client.create_api_url('contracts/active/?limit=10&offset=0')
+
+    with pytest.raises(LocalcoinswapInvalidParamError):
+        client.get_transactions(get_all=True, workers=2, stream=True)
+
+    with requests_mock.mock() as m:
+        m.get(ads_url, json=page([ad], 1, 1), complete_qs=True)
+        m.get(trades_url, json=page([trade], 1, 1), complete_qs=True)
+
+        assert client.get_my_ads(stream=True)['results'] == parse_ads([ad])
+        assert client.get_my_ads(columnar=True)['results']['uuid'] == [ad['uuid']]
+        assert list(client.iter_my_ads(stream=True)) == parse_ads([ad])
+        assert client.get_active_trades(stream=True)['results'] == parse_trades([trade])
+        assert list(client.iter_trades(stream=True)) == parse_trades([trade])
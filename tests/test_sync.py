@@ -0,0 +1,125 @@
+import pytest
+import requests_mock
+
+from localcoinswap.client import Client
+from localcoinswap.exceptions import LocalcoinswapResponseException
+from localcoinswap.parsers import parse_transactions
+from localcoinswap.sync import TransactionSync
+
+from .sample_data import page, transaction
+
+def mock_history(m, client, transactions, page_size):
+    '''
+    Mock transaction pages (newest first).
+    '''
+
+    for offset in range(0, len(transactions), page_size):
+        url = client.create_api_url('wallet/transactions/?limit={}&offset={}'.format(page_size,
+                                                                                      offset))
+        next_offset = offset + page_size
+        next_url = client.create_api_url('wallet/transactions/?limit={}&offset={}'.format(
+            page_size, next_offset)) if next_offset < len(transactions) else None
+        m.get(url,
+              json=page(transactions[offset:next_offset], len(transactions), 2, next_url),
+              complete_qs=True)
+
+def test_transaction_sync(tmp_path):
+    '''
+    Test only new transactions are requested and stored.
+    '''
+
+    client = Client('api_token', get_params=False)
+    history = [dict(transaction, timestamp=timestamp, currency={'symbol': currency})
+               for timestamp, currency in ((30, 'BTC'), (20, 'ETH'), (10, 'BTC'))]
+    path = str(tmp_path / 'transactions.db')
+
+    with requests_mock.mock() as m:
+        mock_history(m, client, history, 2)
+        with TransactionSync(client, path, page_size=2) as transactions:
+            assert transactions.sync() == 3
+            assert transactions.sync() == 0
+            assert transactions.high_water_mark() == (3, 30)
+        assert m.call_count == 3
+
+        history.insert(0, dict(transaction, timestamp=40, currency={'symbol': 'BTC'}))
+        mock_history(m, client, history, 2)
+        with TransactionSync(client, path, page_size=2) as transactions:
+            assert transactions.sync() == 1
+            assert m.call_count == 5
+            assert transactions.query() == parse_transactions(history[::-1])
+            btc = transactions.query(currency='BTC', since=20)
+            assert [t['timestamp'] for t in btc] == [30, 40]
+            assert transactions.count(currency='BTC', until=40) == 2
+
+def test_transaction_sync_history_changed():
+    '''
+    Test pages are requested again if transactions are added during sync.
+    '''
+
+    client = Client('api_token', get_params=False)
+    history = [dict(transaction, timestamp=timestamp) for timestamp in (50, 40, 30, 20, 10)]
+    url = client.create_api_url('wallet/transactions/')
+    arrivals = [60]
+
+    def transactions_page(request, context):
+        offset = int(request.qs['offset'][0])
+        response = page(history[offset:offset + 2], len(history), 3,
+                        url + '?limit=2&offset={}'.format(offset + 2)
+                        if offset + 2 < len(history) else None)
+        # new transaction arrives after the first page
+        if offset == 0 and arrivals:
+            history.insert(0, dict(transaction, timestamp=arrivals.pop(0)))
+        return response
+
+    with requests_mock.mock() as m:
+        m.get(url, json=transactions_page)
+        with TransactionSync(client, page_size=2) as transactions:
+            assert transactions.sync() == 6
+            assert [t['timestamp'] for t in transactions.query()] == [10, 20, 30, 40, 50, 60]
+            assert m.call_count == 5
+
+            history.insert(0, dict(transaction, timestamp=70))
+            arrivals.extend([80, 90, 100])
+            with pytest.raises(LocalcoinswapResponseException):
+                transactions.sync()
+            assert transactions.high_water_mark() == (6, 60)
+
+def test_transaction_sync_identical_transactions():
+    '''
+    Test identical transactions are all stored, also at the high-water mark.
+    '''
+
+    client = Client('api_token', get_params=False)
+    history = [dict(transaction, timestamp=timestamp) for timestamp in (30, 20, 20, 10)]
+
+    with requests_mock.mock() as m:
+        mock_history(m, client, history, 2)
+        with TransactionSync(client, page_size=2) as transactions:
+            assert transactions.sync() == 4
+            assert transactions.sync() == 0
+            assert m.call_count == 3
+
+            history[:0] = [dict(transaction, timestamp=30),
+                           dict(transaction, timestamp=30, amount='1')]
+            mock_history(m, client, history, 2)
+            assert transactions.sync() == 2
+            assert sorted(t['amount'] for t in transactions.query(since=30)) == sorted(
+                t['amount'] for t in parse_transactions(history[:3]))
+            assert transactions.high_water_mark() == (6, 30)
+
+def test_transaction_sync_removed_transactions():
+    '''
+    Test all transactions are synced again if api count doesn't match.
+    '''
+
+    client = Client('api_token', get_params=False)
+    history = [dict(transaction, timestamp=timestamp) for timestamp in (30, 20, 10)]
+
+    with requests_mock.mock() as m:
+        mock_history(m, client, history, 2)
+        with TransactionSync(client, page_size=2) as transactions:
+            transactions.sync()
+            del history[1]
+            mock_history(m, client, history, 2)
+            assert transactions.sync() == 0
+            assert transactions.query() == parse_transactions(history[::-1])
@@ -1,6 +1,9 @@
 import pytest
 
-from localcoinswap.utils import (get_crypto_currency_id,
+from localcoinswap import utils
+from localcoinswap.utils import (TradeParams,
+                                 TradeParamsIndex,
+                                 get_crypto_currency_id,
                                  get_fiat_currency_id,
                                  get_payment_method_id,
                                  get_trade_type_id)
@@ -77,3 +80,32 @@ def test_get_trade_type_id():
         get_trade_type_id({'currency': {'btc': 1}}, 'Buy')
     with pytest.raises(LocalcoinswapInvalidParamError):
         get_trade_type_id(None, 'sell')
+
+def test_trade_params_index():
+    '''
+    Test utils.TradeParams lookup index (single and multiple values).
+    '''
+
+    indexed_params = TradeParams(trade_params)
+    assert indexed_params == trade_params
+    assert get_fiat_currency_id(indexed_params, 'euro') == 10003
+    assert get_payment_method_id(indexed_params, 'LOCAL BANK TRANSFER') == 1
+    assert indexed_params.index.get_ids('crypto_currencies', ['btc', 2, 'Ethereum']) == [1, 2, 2]
+    assert indexed_params.index.get_ids('trade_types', []) == []
+    with pytest.raises(LocalcoinswapInvalidParamError):
+        indexed_params.index.get_ids('fiat_currencies', ['usd', 'btc'])
+    with pytest.raises(LocalcoinswapInvalidParamError):
+        TradeParams({}).index.get_id('fiat_currencies', 'usd')
+
+def test_plain_trade_params_lookup(monkeypatch):
+    '''
+    Test plain dict trade params are searched without building an index.
+    '''
+
+    indexed_params = TradeParams(trade_params)
+    monkeypatch.setattr(TradeParamsIndex, '__init__', None)
+    for key, (_, names) in TradeParamsIndex.LOOKUPS.items():
+        for param in trade_params[key]:
+            for value in [param['id']] + [param[name].upper() for name in names]:
+                assert (utils.find_id(trade_params, key, value)
+                        == indexed_params.index.get_id(key, value))
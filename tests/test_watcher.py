@@ -0,0 +1,114 @@
+import time
+
+import requests_mock
+
+from localcoinswap.cache import ResponseCache
+from localcoinswap.client import Client
+from localcoinswap.exceptions import LocalcoinswapAPIException
+from localcoinswap.watcher import TradeWatcher
+
+from .sample_data import page, trade
+
+def mock_active(m, client, trades):
+    '''
+    Mock page of active trades.
+    '''
+
+    m.get(client.create_api_url('contracts/active/?limit=100&offset=0'),
+          json=page(trades, len(trades), 1), complete_qs=True)
+
+def test_trade_watcher():
+    '''
+    Test status changes are dispatched and polling interval adapts.
+    '''
+
+    client = Client('api_token', get_params=False)
+    watcher = TradeWatcher(client, min_interval=1, max_interval=8)
+    changes = []
+    watcher.on_status_change(lambda trade, old_status: changes.append(
+        (trade['uuid'], old_status, trade['status'])))
+    far = int(time.time()) + 3600
+
+    with requests_mock.mock() as m:
+        mock_active(m, client, [dict(trade, uuid='a', time_of_expiry=far)])
+        watcher.poll()
+        assert changes == []
+        assert watcher.interval == 2
+
+        watcher.poll()
+        watcher.poll()
+        watcher.poll()
+        assert watcher.interval == 8
+
+        mock_active(m, client, [dict(trade, uuid='a', status='ACCEPTED', time_of_expiry=far),
+                                dict(trade, uuid='b', time_of_expiry=far)])
+        watcher.poll()
+        assert changes == [('a', 'CREATED', 'ACCEPTED'), ('b', None, 'CREATED')]
+        assert watcher.interval == 1
+
+        mock_active(m, client, [dict(trade, uuid='b', time_of_expiry=int(time.time()) + 7)])
+        m.get(client.create_api_url('contracts/a/'), json=dict(trade, uuid='a', status='COMPLETED'))
+        assert watcher.poll() != []
+        assert changes[-1] == ('a', 'ACCEPTED', 'COMPLETED')
+
+        watcher.poll()
+        assert 1 <= watcher.interval <= 3.5
+
+def test_trade_watcher_run():
+    '''
+    Test run stops when stop is called from a callback.
+    '''
+
+    client = Client('api_token', get_params=False)
+    watcher = TradeWatcher(client, min_interval=0, max_interval=0)
+    watcher.on_status_change(lambda trade, old_status: watcher.stop())
+
+    with requests_mock.mock() as m:
+        mock_active(m, client, [])
+        watcher.poll()
+        mock_active(m, client, [trade])
+        watcher.run()
+        assert m.call_count == 2
+
+def test_trade_watcher_errors():
+    '''
+    Test failed final status request drops trade and run continues after errors.
+    '''
+
+    client = Client('api_token', get_params=False, response_cache=ResponseCache())
+    watcher = TradeWatcher(client, min_interval=0, max_interval=0)
+    errors = []
+    watcher.on_error(lambda uuid, error: errors.append((uuid, type(error))))
+    changes = []
+    watcher.on_status_change(lambda trade, old_status: changes.append(trade['status']))
+
+    with requests_mock.mock() as m:
+        m.get(client.create_api_url('contracts/a/'), json=dict(trade, uuid='a'))
+        client.get_trade('a')
+        mock_active(m, client, [dict(trade, uuid='a'), dict(trade, uuid='b')])
+        watcher.poll()
+
+        mock_active(m, client, [])
+        m.get(client.create_api_url('contracts/a/'), json=dict(trade, uuid='a', status='COMPLETED'))
+        m.get(client.create_api_url('contracts/b/'), status_code=404, json={'detail': 'Not found.'})
+        assert [t['uuid'] for t, old_status in watcher.poll()] == ['a']
+        assert changes == ['COMPLETED']
+        assert errors == [('b', LocalcoinswapAPIException)]
+        assert watcher.trades == {}
+        assert watcher.poll() == []
+
+        calls = []
+
+        def active(request, context):
+            calls.append(request)
+            if len(calls) == 1:
+                context.status_code = 500
+                return {}
+            watcher.stop()
+            return page([], 0, 1)
+
+        m.get(client.create_api_url('contracts/active/?limit=100&offset=0'), json=active,
+              complete_qs=True)
+        watcher.run()
+        assert len(calls) == 2
+        assert errors[-1] == (None, LocalcoinswapAPIException)